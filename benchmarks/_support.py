@@ -0,0 +1,102 @@
+"""Shared helpers for the benchmark scripts.
+
+The integration package's ``__init__`` imports Home Assistant, so the
+component is registered here as a bare package and its modules are imported
+directly. HTTP traffic goes either to :class:`StubSession`, which returns
+canned bytes without touching the network, or to the stand-in server used by
+the end-to-end tests.
+"""
+from __future__ import annotations
+
+import importlib
+import json
+import sys
+import types
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+ROOT = Path(__file__).resolve().parent.parent
+PACKAGE = "custom_components.imou_control"
+
+HTTP_DATE = "Tue, 14 Apr 2026 12:00:00 GMT"
+
+
+def import_stand_in() -> types.ModuleType:
+    """Import ``tests/imou_server.py``, the local OpenAPI stand-in server."""
+    if str(ROOT) not in sys.path:
+        sys.path.insert(0, str(ROOT))
+    return importlib.import_module("tests.imou_server")
+
+
+def import_component(module: str) -> types.ModuleType:
+    """Import ``custom_components.imou_control.<module>`` without running ``__init__``."""
+    parent, _, child = PACKAGE.partition(".")
+    if parent not in sys.modules:
+        namespace = types.ModuleType(parent)
+        namespace.__path__ = [str(ROOT / parent)]  # type: ignore[attr-defined]
+        sys.modules[parent] = namespace
+    if PACKAGE not in sys.modules:
+        package = types.ModuleType(PACKAGE)
+        package.__path__ = [str(ROOT / parent / child)]  # type: ignore[attr-defined]
+        sys.modules[PACKAGE] = package
+    return importlib.import_module(f"{PACKAGE}.{module}")
+
+
+class StubResponse:
+    """Enough of ``aiohttp.ClientResponse`` for ``ApiClient`` and ``TokenManager``."""
+
+    status = 200
+
+    def __init__(self, body: bytes) -> None:
+        self._body = body
+        self.headers = {"Date": HTTP_DATE}
+
+    async def __aenter__(self) -> "StubResponse":
+        return self
+
+    async def __aexit__(self, *_exc: Any) -> bool:
+        return False
+
+    def raise_for_status(self) -> None:
+        return None
+
+    async def read(self) -> bytes:
+        return self._body
+
+    async def text(self) -> str:
+        return self._body.decode("utf-8")
+
+
+class StubSession:
+    """``session.post`` that answers every request with ``respond(url, body)``.
+
+    A ``json=`` payload is serialised the way aiohttp does it, so request paths
+    that still use it pay the same cost as they would against a real server.
+    """
+
+    def __init__(self, respond: Callable[[str, Optional[bytes]], bytes]) -> None:
+        self._respond = respond
+        self.requests = 0
+
+    def post(
+        self,
+        url: str,
+        *,
+        data: Optional[bytes] = None,
+        json: Any = None,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: Any = None,
+    ) -> StubResponse:
+        if json is not None:
+            data = _json_dumps(json).encode("utf-8")
+        self.requests += 1
+        return StubResponse(self._respond(url, data))
+
+
+_json_dumps = json.dumps
+
+
+def canned(body: Dict[str, Any]) -> Callable[[str, Optional[bytes]], bytes]:
+    """``respond`` callable that always returns ``body``."""
+    raw = json.dumps(body).encode("utf-8")
+    return lambda _url, _data: raw
@@ -0,0 +1,126 @@
+"""Micro-benchmark of the request/response encoding path.
+
+The "after" column drives the integration code itself, ``ApiClient._do_call``
+and ``TokenManager._fetch_new_token``, against a stub session that answers
+with canned bytes. The "before" column runs the request path those methods
+had before the codec change (``make_system`` + ``json=`` payload,
+``response.text()`` followed by ``json.loads``) against the same stub, so both
+columns carry the same coroutine and session overhead.
+
+    python benchmarks/bench_codec.py [--iterations N]
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import time
+import uuid
+
+from _support import StubSession, canned, import_component
+
+api = import_component("api")
+codec = import_component("codec")
+const = import_component("const")
+token_manager = import_component("token_manager")
+utils = import_component("utils")
+
+BASE_URL = "https://openapi.example.com"
+PTZ_RESPONSE = {"result": {"code": "0", "msg": "Operation is successful.", "data": {}}, "id": "x"}
+TOKEN_RESPONSE = {
+    "result": {
+        "code": "0",
+        "msg": "Operation is successful.",
+        "data": {"accessToken": "At_" + "0" * 40, "expireTime": 259176},
+    },
+    "id": "x",
+}
+PTZ_PARAMS = {**api._PTZ_PARAMS, "deviceId": "ABCDEF123", "h": 0.25, "v": -0.5, "z": 0.0}
+
+
+async def _legacy_post(session: StubSession, path: str, params: dict) -> dict:
+    system, _ts, _nonce = utils.make_system("app-id", "app-secret")
+    payload = {"system": system, "id": str(uuid.uuid4()), "params": params}
+    async with session.post(f"{BASE_URL}{path}", json=payload) as response:
+        response.raise_for_status()
+        text = await response.text()
+    return json.loads(text)
+
+
+def make_legacy():
+    ptz_session = StubSession(canned(PTZ_RESPONSE))
+    token_session = StubSession(canned(TOKEN_RESPONSE))
+
+    async def api_call() -> object:
+        params = dict(PTZ_PARAMS)
+        params["token"] = "At_token"
+        return await _legacy_post(ptz_session, const.PTZ_LOCATION_ENDPOINT, params)
+
+    async def token_call() -> object:
+        return await _legacy_post(token_session, const.TOKEN_ENDPOINT, {})
+
+    return api_call, token_call
+
+
+def make_current(json_codec):
+    client = api.ApiClient(
+        "app-id",
+        "app-secret",
+        BASE_URL,
+        StubSession(canned(PTZ_RESPONSE)),
+        lambda: "At_token",
+        codec=json_codec,
+    )
+    manager = token_manager.TokenManager(
+        "app-id",
+        "app-secret",
+        BASE_URL,
+        StubSession(canned(TOKEN_RESPONSE)),
+        codec=json_codec,
+    )
+
+    async def api_call() -> object:
+        return await client._do_call(
+            const.PTZ_LOCATION_ENDPOINT, PTZ_PARAMS, token_override="At_token"
+        )
+
+    async def token_call() -> object:
+        return await manager._fetch_new_token()
+
+    return api_call, token_call
+
+
+def per_call_us(func, iterations: int) -> float:
+    async def run() -> float:
+        best = float("inf")
+        for _ in range(5):
+            start = time.perf_counter()
+            for _ in range(iterations):
+                await func()
+            best = min(best, time.perf_counter() - start)
+        return best
+
+    return asyncio.run(run()) / iterations * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=20000)
+    args = parser.parse_args()
+
+    legacy_api, legacy_token = make_legacy()
+    api_call, token_call = make_current(codec.DEFAULT_CODEC)
+    rows = [
+        ("ApiClient", legacy_api, api_call),
+        ("TokenManager", legacy_token, token_call),
+    ]
+    print(f"codec: {codec.DEFAULT_CODEC.name}, {args.iterations} iterations (best of 5)")
+    print(f"{'path':<14}{'before (us)':>14}{'after (us)':>14}{'saved':>10}")
+    for name, before, after in rows:
+        b = per_call_us(before, args.iterations)
+        a = per_call_us(after, args.iterations)
+        print(f"{name:<14}{b:>14.2f}{a:>14.2f}{(b - a) / b:>9.0%}")
+
+
+if __name__ == "__main__":
+    main()
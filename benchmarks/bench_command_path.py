@@ -0,0 +1,294 @@
+"""Throughput and latency of the PTZ command path against a local stand-in.
+
+Each case drives the integration code end to end, through real HTTP, signing
+and JSON, against the aiohttp stand-in server from ``tests/imou_server.py``:
+
+* ``set_position``: sequential ``ApiClient.set_position`` calls.
+* ``set_position_x8``: the same call for 8 cameras in parallel.
+* ``retry_on_expiry``: every call hits ``TK1002``, refreshes the token and
+  retries (``_call_with_retry``).
+* ``get_token_contention``: 100 coroutines call ``TokenManager.get_token``
+  right after the token is invalidated; one operation is one such round.
+* ``note_call``: ``ApiUsageTracker.note_call`` across 1000 devices, without
+  HTTP.
+
+For each case it reports ops/s, p50/p99 latency per operation and, from a
+separate pass under ``tracemalloc``:
+
+* ``peak_kib``: peak traced memory over the whole pass;
+* ``allocations_per_op``: blocks allocated by an operation and still alive
+  when it returns, averaged over a sample of operations (client side only);
+* ``allocated_bytes_per_op``: how far traced memory rose above its level at
+  the start of each operation, which includes temporaries freed before the
+  operation returns;
+* ``retained_bytes_per_op``: memory still held per operation after the pass
+  (client side only).
+
+The peak-based numbers include the stand-in server, which runs in the same
+process. ``--json`` saves the results and ``--compare`` flags cases that got
+slower than a saved run.
+
+    python benchmarks/bench_command_path.py [--ops N] [--latency MS]
+        [--json results.json] [--compare baseline.json]
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, List
+
+import aiohttp
+
+from _support import HTTP_DATE, import_component, import_stand_in
+
+api = import_component("api")
+codec = import_component("codec")
+metrics = import_component("metrics")
+token_manager = import_component("token_manager")
+usage = import_component("usage")
+imou_server = import_stand_in()
+
+# slower than the baseline by more than this fraction counts as a regression
+REGRESSION_THRESHOLD = 0.10
+
+Operation = Callable[[int], Awaitable[Any]]
+
+# the stand-in server runs in this process: keep its memory out of the numbers
+_TRACE_DEPTH = 25
+_MEMORY_OPS = 300
+_ALLOCATION_SAMPLE_OPS = 20
+_SERVER_SIDE = (
+    tracemalloc.Filter(False, "*/tests/imou_server.py", all_frames=True),
+    tracemalloc.Filter(False, "*/aiohttp/web_*", all_frames=True),
+    tracemalloc.Filter(False, tracemalloc.__file__),
+)
+
+
+class _NullStore:
+    """``Store`` that keeps nothing, so benchmarks never touch the disk."""
+
+    async def async_load(self) -> None:
+        return None
+
+    def async_delay_save(self, _data_func: Callable[[], Any], _delay: float = 0) -> None:
+        return None
+
+
+def _percentile(samples: List[float], fraction: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(int(fraction * len(ordered)), len(ordered) - 1)]
+
+
+async def _measure(operation: Operation, ops: int) -> Dict[str, float]:
+    latencies: List[float] = []
+    start = time.perf_counter()
+    for index in range(ops):
+        op_start = time.perf_counter()
+        await operation(index)
+        latencies.append(time.perf_counter() - op_start)
+    elapsed = time.perf_counter() - start
+    return {
+        "ops_per_s": round(ops / elapsed, 1),
+        "p50_us": round(_percentile(latencies, 0.50) * 1e6, 1),
+        "p99_us": round(_percentile(latencies, 0.99) * 1e6, 1),
+    }
+
+
+def _target(index: int) -> float:
+    # alternate between two far-apart targets, so no move is deduplicated
+    return 0.5 if index % 2 else -0.5
+
+
+async def _measure_memory(operation: Operation, ops: int) -> Dict[str, float]:
+    tracemalloc.start(_TRACE_DEPTH)
+    try:
+        first_snapshot = tracemalloc.take_snapshot().filter_traces(_SERVER_SIDE)
+        before, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        allocations = 0
+        allocated = 0
+        for index in range(ops):
+            start, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            await operation(index)
+            _, op_peak = tracemalloc.get_traced_memory()
+            # temporaries freed before the end show up in the high-water mark
+            allocated += op_peak - start
+        _, peak = tracemalloc.get_traced_memory()
+        after_snapshot = tracemalloc.take_snapshot().filter_traces(_SERVER_SIDE)
+        # filtering a snapshot is slow: count blocks over a bounded sample,
+        # forgetting the older traces so only the operation's own are left
+        sampled = min(ops, _ALLOCATION_SAMPLE_OPS)
+        for index in range(sampled):
+            tracemalloc.clear_traces()
+            await operation(index)
+            snapshot = tracemalloc.take_snapshot().filter_traces(_SERVER_SIDE)
+            # blocks allocated by the operation and still alive at its end,
+            # including those that replaced older entries in buffers and caches
+            allocations += len(snapshot.traces)
+    finally:
+        tracemalloc.stop()
+    retained = sum(
+        stat.size_diff for stat in after_snapshot.compare_to(first_snapshot, "filename")
+    )
+    return {
+        # includes the server side, as do allocated_bytes_per_op; the other
+        # two fields do not
+        "peak_kib": round((peak - before) / 1024, 1),
+        "allocations_per_op": round(allocations / sampled, 1),
+        "allocated_bytes_per_op": round(allocated / ops, 1),
+        "retained_bytes_per_op": round(retained / ops, 1),
+    }
+
+
+async def _run_case(setup: Callable[[], Awaitable[Operation]], ops: int) -> Dict[str, float]:
+    operation = await setup()
+    # warm-up: connection pool, token, caches and the bounded sample buffers
+    for index in range(min(ops, 200)):
+        await operation(index)
+    result = await _measure(operation, ops)
+    # tracing every frame is slow: a bounded pass is enough for steady state
+    result.update(await _measure_memory(operation, min(ops, _MEMORY_OPS)))
+    return result
+
+
+def _clients(server: Any, session: aiohttp.ClientSession):
+    tracker = usage.ApiUsageTracker(_NullStore(), notify_interval=5.0)
+    api_metrics = metrics.ApiMetrics()
+    manager = token_manager.TokenManager(
+        server.app_id,
+        server.app_secret,
+        server.url,
+        session,
+        usage=tracker,
+        metrics=api_metrics,
+    )
+    client = api.ApiClient(
+        server.app_id,
+        server.app_secret,
+        server.url,
+        session,
+        manager.get_token,
+        manager.refresh_token,
+        usage=tracker,
+        token_generation=lambda: manager.generation,
+        metrics=api_metrics,
+    )
+    return manager, client
+
+
+async def run_benchmarks(ops: int, latency_ms: float) -> Dict[str, Dict[str, float]]:
+    results: Dict[str, Dict[str, float]] = {}
+    server = imou_server.ImouServer(devices=8, latency=latency_ms / 1000)
+    async with server, aiohttp.ClientSession() as session:
+        manager, client = _clients(server, session)
+        cameras = [info["deviceId"] for info in server.devices]
+
+        async def set_position() -> Operation:
+            async def operation(index: int) -> None:
+                await client.set_position(cameras[0], _target(index), 0.0)
+
+            return operation
+
+        async def set_position_x8() -> Operation:
+            async def operation(index: int) -> None:
+                h = _target(index)
+                await asyncio.gather(*(client.set_position(cam, h, 0.5) for cam in cameras))
+
+            return operation
+
+        async def retry_on_expiry() -> Operation:
+            async def operation(index: int) -> None:
+                server.expire_tokens()
+                await client.set_position(cameras[1], _target(index), 0.25)
+
+            return operation
+
+        async def get_token_contention() -> Operation:
+            async def operation(_index: int) -> None:
+                await manager.invalidate()
+                await asyncio.gather(*(manager.get_token() for _ in range(100)))
+
+            return operation
+
+        results["set_position"] = await _run_case(set_position, ops)
+        results["set_position_x8"] = await _run_case(set_position_x8, max(ops // 8, 1))
+        results["retry_on_expiry"] = await _run_case(retry_on_expiry, max(ops // 2, 1))
+        results["get_token_contention"] = await _run_case(get_token_contention, max(ops // 10, 1))
+
+    async def note_call() -> Operation:
+        tracker = usage.ApiUsageTracker(_NullStore(), notify_interval=5.0)
+        devices = [f"CAM{index:05d}" for index in range(1000)]
+
+        async def operation(index: int) -> None:
+            tracker.note_call(HTTP_DATE, api.PTZ_LOCATION_ENDPOINT, devices[index % 1000])
+
+        return operation
+
+    results["note_call"] = await _run_case(note_call, ops * 50)
+    return results
+
+
+def _compare(results: Dict[str, Dict[str, float]], baseline_path: str) -> bool:
+    with open(baseline_path, encoding="utf-8") as handle:
+        baseline = json.load(handle)["results"]
+    regressed = False
+    print(f"\ncompared with {baseline_path}:")
+    for case, current in results.items():
+        previous = baseline.get(case)
+        if not previous:
+            continue
+        change = current["ops_per_s"] / previous["ops_per_s"] - 1
+        flag = "  REGRESSION" if change < -REGRESSION_THRESHOLD else ""
+        regressed |= bool(flag)
+        print(f"{case:<22}{change:>+9.1%}{flag}")
+    return regressed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--ops", type=int, default=2000, help="operations per HTTP case")
+    parser.add_argument("--latency", type=float, default=0.0, help="server latency in ms")
+    parser.add_argument("--json", dest="json_path", help="save the results to this file")
+    parser.add_argument("--compare", help="results file of a previous run")
+    args = parser.parse_args()
+
+    results = asyncio.run(run_benchmarks(args.ops, args.latency))
+
+    print(f"codec: {codec.DEFAULT_CODEC.name}, server latency: {args.latency} ms")
+    print(
+        f"{'case':<22}{'ops/s':>11}{'p50 (us)':>11}{'p99 (us)':>11}"
+        f"{'peak KiB':>10}{'allocs/op':>11}{'alloc B/op':>12}{'kept B/op':>11}"
+    )
+    for case, row in results.items():
+        print(
+            f"{case:<22}{row['ops_per_s']:>11.1f}{row['p50_us']:>11.1f}{row['p99_us']:>11.1f}"
+            f"{row['peak_kib']:>10.1f}{row['allocations_per_op']:>11.1f}"
+            f"{row['allocated_bytes_per_op']:>12.1f}{row['retained_bytes_per_op']:>11.1f}"
+        )
+
+    if args.json_path:
+        payload = {
+            "created": datetime.now(timezone.utc).isoformat(),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "codec": codec.DEFAULT_CODEC.name,
+            "ops": args.ops,
+            "latency_ms": args.latency,
+            "results": results,
+        }
+        with open(args.json_path, "w", encoding="utf-8") as handle:
+            json.dump(payload, handle, indent=2)
+
+    if args.compare and _compare(results, args.compare):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
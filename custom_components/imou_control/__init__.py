@@ -1,27 +1,126 @@
 from __future__ import annotations
+import asyncio
 import logging
+from collections.abc import Awaitable, Callable
+from datetime import timedelta
 import voluptuous as vol
 import homeassistant.helpers.config_validation as cv
-from homeassistant.core import HomeAssistant, ServiceCall
+from homeassistant.core import (
+    Event,
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP
+from homeassistant.exceptions import ConfigEntryNotReady
 from homeassistant.helpers import device_registry as dr
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.helpers.event import async_track_time_interval
 from homeassistant.helpers.storage import Store
+from homeassistant.util.ssl import get_default_context
 
 from .const import (
     DOMAIN,
     CONF_APP_ID,
     CONF_APP_SECRET,
     CONF_URL_BASE,
+    CONF_RATE_LIMIT,
+    CONF_RATE_BURST,
+    CONF_MONTHLY_BUDGET,
+    CONF_RESCAN_INTERVAL,
+    CONF_BULK_CONCURRENCY,
+    CONF_DEDUP_EPSILON,
+    CONF_DEDUP_TTL,
+    CONF_KEEP_WARM,
+    DEFAULT_RATE_LIMIT,
+    DEFAULT_RATE_BURST,
+    DEFAULT_MONTHLY_BUDGET,
+    DEFAULT_RESCAN_INTERVAL,
+    DEFAULT_BULK_CONCURRENCY,
+    DEFAULT_DEDUP_EPSILON,
+    DEFAULT_DEDUP_TTL,
+    DEFAULT_KEEP_WARM,
+    DEFAULT_MOVE_DURATION,
+    MIN_MOVE_DURATION,
+    MAX_MOVE_DURATION,
+    PTZ_OPERATIONS,
+    DEFAULT_TOUR_DWELL,
+    MIN_TOUR_DWELL,
+    DEFAULT_AXIS_SPEEDS,
+    DEVICE_REMOVAL_SCANS,
     EVENT_PRESET_CALLED,
+    PRESETS_SAVE_DELAY,
+    USAGE_NOTIFY_INTERVAL,
+    SIGNAL_DEVICES_ADDED,
 )
 from .token_manager import TokenManager
 from .api import ApiClient
-from .usage import ApiUsageTracker
+from .bulk import run_bulk
+from .command_queue import CommandSuperseded, LatestWinsQueue
+from .connection import ConnectionPool
+from .devices import DEVICE_ADDED, DEVICE_RENAMED, DeviceDirectory, cache_payload
+from .metrics import ApiMetrics
+from .presets import (
+    PRESETS_STORAGE_VERSION,
+    decode_presets,
+    encode_presets,
+    migrate_presets,
+)
+from .rate_limit import PRIORITY_INTERACTIVE, PriorityRateLimiter
+from .route import plan_route, route_time
+from .tour import TourManager, TourStep
+from .usage import HOURLY_SLOTS, ApiUsageTracker
+from .websocket import async_close_setpoint_streams, async_register_websocket_commands
 
 _LOGGER = logging.getLogger(__name__)
 
+PLATFORMS = ["number", "select", "button", "text", "sensor"]
+
+
+class _PresetStore(Store):
+    """Store dos presets com migração do formato v1."""
+
+    async def _async_migrate_func(self, old_major_version, old_minor_version, old_data):
+        return migrate_presets(old_major_version, old_data)
+
+
+# Lista ordenada de presets (nomes ou pares preset/dwell) de rondas e visitas
+TOUR_PRESETS_SCHEMA = {
+    vol.Required("presets"): vol.All(
+        cv.ensure_list,
+        vol.Length(min=1),
+        [
+            vol.Any(
+                cv.string,
+                vol.Schema(
+                    {
+                        vol.Required("preset"): cv.string,
+                        vol.Optional("dwell"): vol.All(
+                            vol.Coerce(float), vol.Range(min=MIN_TOUR_DWELL)
+                        ),
+                    }
+                ),
+            )
+        ],
+    ),
+    vol.Optional("dwell", default=DEFAULT_TOUR_DWELL): vol.All(
+        vol.Coerce(float), vol.Range(min=MIN_TOUR_DWELL)
+    ),
+}
+
+# Velocidade de cada eixo (unidades/s) usada para estimar o deslocamento
+AXIS_SPEED_SCHEMA = {
+    vol.Optional(f"speed_{axis}", default=speed): vol.All(
+        vol.Coerce(float), vol.Range(min=0.001)
+    )
+    for axis, speed in zip("hvz", DEFAULT_AXIS_SPEEDS)
+}
+
 async def async_setup(hass: HomeAssistant, config: dict) -> bool:
+    async_register_websocket_commands(hass)
     return True
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
@@ -29,13 +128,54 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     app_secret = entry.data[CONF_APP_SECRET]
     url_base   = entry.data[CONF_URL_BASE]
 
-    session = async_get_clientsession(hass)
+    # sessão própria: conexões mantidas abertas só para o host da OpenAPI
+    pool = ConnectionPool(
+        url_base,
+        ssl_context=get_default_context(),
+        keep_warm=entry.options.get(CONF_KEEP_WARM, DEFAULT_KEEP_WARM),
+    )
+    entry.async_on_unload(pool.async_close)
+    session = pool.session
+    pool.async_start_keep_warm(
+        lambda coro, name: entry.async_create_background_task(hass, coro, name)
+    )
 
     usage_store = Store(hass, 1, f"{DOMAIN}_usage_{entry.entry_id}")
-    usage = ApiUsageTracker(usage_store)
+    usage = ApiUsageTracker(
+        usage_store,
+        budget=entry.options.get(CONF_MONTHLY_BUDGET, DEFAULT_MONTHLY_BUDGET),
+        notify_interval=USAGE_NOTIFY_INTERVAL,
+    )
     await usage.async_load()
 
-    tm = TokenManager(app_id, app_secret, url_base, session, usage=usage)
+    @callback
+    def _async_flush_usage(_event: Event) -> None:
+        # o HA não descarrega as integrações ao parar; entrega a última atualização
+        usage.async_flush()
+
+    entry.async_on_unload(
+        hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, _async_flush_usage)
+    )
+
+    metrics = ApiMetrics()
+    token_store = Store(hass, 1, f"{DOMAIN}_token_{entry.entry_id}")
+    tm = TokenManager(
+        app_id,
+        app_secret,
+        url_base,
+        session,
+        usage=usage,
+        store=token_store,
+        metrics=metrics,
+    )
+    await tm.async_load()
+    tm.async_start_renewal(
+        lambda coro, name: entry.async_create_background_task(hass, coro, name)
+    )
+    limiter = PriorityRateLimiter(
+        entry.options.get(CONF_RATE_LIMIT, DEFAULT_RATE_LIMIT),
+        entry.options.get(CONF_RATE_BURST, DEFAULT_RATE_BURST),
+    )
     api = ApiClient(
         app_id,
         app_secret,
@@ -44,66 +184,204 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         tm.get_token,
         tm.refresh_token,
         usage=usage,
+        token_generation=lambda: tm.generation,
+        rate_limiter=limiter,
+        dedup_epsilon=entry.options.get(CONF_DEDUP_EPSILON, DEFAULT_DEDUP_EPSILON),
+        dedup_ttl=entry.options.get(CONF_DEDUP_TTL, DEFAULT_DEDUP_TTL),
+        metrics=metrics,
     )
 
     hass.data.setdefault(DOMAIN, {})
-    store = Store(hass, 1, f"{DOMAIN}_presets_{entry.entry_id}")
-    saved = await store.async_load() or {}
+    store = _PresetStore(hass, PRESETS_STORAGE_VERSION, f"{DOMAIN}_presets_{entry.entry_id}")
+    # presets de todas as câmeras conhecidas, inclusive as ainda não carregadas
+    saved = decode_presets(await store.async_load())
     data_entry = hass.data[DOMAIN][entry.entry_id] = {
         "tm": tm,
         "api": api,
         "devices": {},
         "devices_by_name": {},
         "store": store,
+        "presets": saved,
+        "presets_dirty": False,
         "usage": usage,
+        "metrics": metrics,
+        "pool": pool,
+        "commands": LatestWinsQueue(),
+        "limiter": limiter,
     }
+    commands: LatestWinsQueue = data_entry["commands"]
+
+    async def _async_tour_move(device_id: str, preset: str, priority: int) -> None:
+        await _async_call_preset(device_id, preset, priority=priority)
+
+    tours = data_entry["tours"] = TourManager(
+        _async_tour_move,
+        lambda coro, name: entry.async_create_background_task(hass, coro, name),
+    )
 
     registry = dr.async_get(hass)
-    try:
-        devices_info = await api.list_devices()
-    except Exception as err:
-        _LOGGER.error("Não foi possível obter a lista de dispositivos: %s", err)
-        devices_info = []
-    for info in devices_info:
-        device_id = info.get("deviceId")
-        raw_name = info.get("deviceName") or device_id
-        name = f"Imou {raw_name}"
-        data_entry["devices"][device_id] = {
-            "name": name,
-            "presets": saved.get(device_id, {}),
-            "last_preset": None,
-            "coords": {"h": 0.0, "v": 0.0, "z": 0.0},
-            "number_entities": {},
-            "select_entity": None,
-            "preset_name": "",
-        }
-        data_entry["devices_by_name"][name] = device_id
-        data_entry["devices_by_name"][raw_name] = device_id
+    device_cache = Store(hass, 1, f"{DOMAIN}_devices_{entry.entry_id}")
+    signal_devices_added = SIGNAL_DEVICES_ADDED.format(entry.entry_id)
+
+    directory = data_entry["directory"] = DeviceDirectory(
+        data_entry["devices"], data_entry["devices_by_name"], saved
+    )
+
+    @callback
+    def _async_add_device(info: dict) -> str | None:
+        """Registra (ou renomeia) uma câmera; devolve o ID se ela for nova."""
+        device_id, change = directory.apply(info)
+        if change == DEVICE_RENAMED:
+            name = directory.devices[device_id]["name"]
+            _LOGGER.info("Dispositivo %s renomeado para %s", device_id, name)
+            device = registry.async_get_device(identifiers={(DOMAIN, device_id)})
+            if device is not None:
+                registry.async_update_device(device.id, name=name)
+            return None
+        if change != DEVICE_ADDED:
+            return None
+
         registry.async_get_or_create(
             config_entry_id=entry.entry_id,
             identifiers={(DOMAIN, device_id)},
             manufacturer="Imou",
-            name=name,
+            name=directory.devices[device_id]["name"],
         )
+        return device_id
+
+    def _save_device_cache(devices_info: list[dict]) -> None:
+        device_cache.async_delay_save(lambda: cache_payload(devices_info))
+
+    @callback
+    def _async_remove_device(device_id: str) -> None:
+        """Remove uma câmera que deixou de existir na conta."""
+        tours.preempt(device_id)
+        directory.remove(device_id)
+        device = registry.async_get_device(identifiers={(DOMAIN, device_id)})
+        if device is not None:
+            # remove também as entidades number/select/button/text da câmera
+            registry.async_remove_device(device.id)
+
+    rescan_lock = asyncio.Lock()
+
+    async def _async_rescan_devices() -> dict[str, list[str]]:
+        """Compara a lista da nuvem com os dispositivos atuais e aplica a diferença."""
+        async with rescan_lock:
+            devices_info = await api.list_devices()
+            if not devices_info:
+                _LOGGER.debug("Lista de dispositivos indisponível; mantendo a atual")
+                return {"added": [], "removed": []}
 
-    async def _save_presets() -> None:
-        await data_entry["store"].async_save(
-            {did: dev["presets"] for did, dev in data_entry["devices"].items()}
+            new_ids = [
+                device_id
+                for device_id in map(_async_add_device, devices_info)
+                if device_id is not None
+            ]
+            # list_devices só devolve listas completas (ou vazia em caso de
+            # falha); ainda assim uma única ausência não remove a câmera
+            removed_ids = directory.stale_devices(
+                (info.get("deviceId") for info in devices_info), DEVICE_REMOVAL_SCANS
+            )
+            for device_id in removed_ids:
+                _async_remove_device(device_id)
+
+            if new_ids:
+                _LOGGER.info("Novos dispositivos encontrados: %s", ", ".join(new_ids))
+                async_dispatcher_send(hass, signal_devices_added, new_ids)
+            if removed_ids:
+                _LOGGER.info("Dispositivos removidos: %s", ", ".join(removed_ids))
+            _save_device_cache(devices_info)
+            return {"added": new_ids, "removed": removed_ids}
+
+    # stale-while-revalidate: a última lista conhecida monta as entidades já,
+    # e a nuvem é consultada em segundo plano
+    cached_devices = await device_cache.async_load() or []
+    for info in cached_devices:
+        _async_add_device(info)
+
+    async def _async_load_remaining_pages(pages, devices_info: list[dict]) -> None:
+        """Registra as páginas restantes de dispositivos conforme chegam."""
+        try:
+            async for page in pages:
+                devices_info.extend(page)
+                new_ids = [
+                    device_id
+                    for device_id in map(_async_add_device, page)
+                    if device_id is not None
+                ]
+                if new_ids:
+                    async_dispatcher_send(hass, signal_devices_added, new_ids)
+        except Exception as err:
+            _LOGGER.error("Falha ao obter as demais páginas de dispositivos: %s", err)
+            return
+        _save_device_cache(devices_info)
+
+    device_pages = None
+    first_page: list[dict] = []
+    if not cached_devices:
+        # sem cache: só a primeira página segura o setup; as demais chegam em
+        # segundo plano e são adicionadas via dispatcher
+        # prioridade interativa: sem essa lista a integração não tem câmeras,
+        # então ela não pode ser descartada pelo orçamento mensal
+        device_pages = api.iter_device_pages(priority=PRIORITY_INTERACTIVE)
+        try:
+            first_page = await anext(device_pages)
+        except StopAsyncIteration:
+            device_pages = None
+        except Exception as err:
+            hass.data[DOMAIN].pop(entry.entry_id, None)
+            await tm.async_stop()
+            raise ConfigEntryNotReady(
+                f"Não foi possível obter a lista de dispositivos: {err}"
+            ) from err
+        for info in first_page:
+            _async_add_device(info)
+
+    def _presets_data() -> dict:
+        data_entry["presets_dirty"] = False
+        return encode_presets(saved)
+
+    @callback
+    def _save_presets() -> None:
+        """Agenda a gravação dos presets; alterações próximas viram uma escrita só."""
+        data_entry["presets_dirty"] = True
+        store.async_delay_save(_presets_data, PRESETS_SAVE_DELAY)
+
+    await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+
+    if cached_devices:
+        entry.async_create_background_task(
+            hass, _async_rescan_devices(), "imou_control device revalidation"
+        )
+    elif device_pages is not None:
+        entry.async_create_background_task(
+            hass,
+            _async_load_remaining_pages(device_pages, list(first_page)),
+            "imou_control device pagination",
         )
 
-    await hass.config_entries.async_forward_entry_setups(
-        entry,
-        ["number", "select", "button", "text", "sensor"],
-    )
+    bulk_concurrency = entry.options.get(CONF_BULK_CONCURRENCY, DEFAULT_BULK_CONCURRENCY)
+    rescan_interval = entry.options.get(CONF_RESCAN_INTERVAL, DEFAULT_RESCAN_INTERVAL)
+    if rescan_interval:
 
-    def resolve_device_id(device: str) -> str | None:
-        if device in data_entry["devices"]:
-            return device
-        return data_entry["devices_by_name"].get(device)
+        async def _async_periodic_rescan(_now) -> None:
+            await _async_rescan_devices()
 
-    async def srv_set_position(call: ServiceCall):
+        entry.async_on_unload(
+            async_track_time_interval(
+                hass, _async_periodic_rescan, timedelta(minutes=rescan_interval)
+            )
+        )
+
+    resolve_device_id = directory.resolve
+
+    async def srv_set_position(call: ServiceCall) -> ServiceResponse:
         """Handle the ``imou_control.set_position`` service.
 
+        When a response is requested it reports ``status``: ``moved``, or
+        ``superseded`` if a newer command for the camera replaced this one
+        before it was sent.
+
         Parameters:
             call: Service call providing ``device``, ``h``, ``v`` and optional ``z`` values.
 
@@ -121,17 +399,24 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         device_id = resolve_device_id(device)
         if not device_id:
             _LOGGER.warning("Dispositivo %s não encontrado", device)
-            return
+            return {"status": "device_not_found"}
         h = float(call.data["h"])
         v = float(call.data["v"])
         z = float(call.data.get("z", 0.0))
+        tours.preempt(device_id)
         try:
-            ok = await api.set_position(device_id, h, v, z)
+            ok = await commands.submit(
+                device_id, lambda: api.set_position(device_id, h, v, z)
+            )
             if not ok:
                 _LOGGER.warning("set_position retornou False para %s", device_id)
+        except CommandSuperseded:
+            _LOGGER.debug("set_position para %s substituído por comando mais recente", device_id)
+            return {"status": "superseded"}
         except Exception as e:
             _LOGGER.exception("Falha em set_position para %s: %s", device_id, e)
             raise
+        return {"status": "moved"}
 
     hass.services.async_register(
         DOMAIN,
@@ -145,6 +430,90 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
                 vol.Optional("z", default=0.0): vol.Coerce(float),
             }
         ),
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+    async def _async_move(device: str, direction: str, duration: int) -> None:
+        """Envia um movimento contínuo pela fila da câmera (o mais recente vence)."""
+        device_id = resolve_device_id(device)
+        if not device_id:
+            _LOGGER.warning("Dispositivo %s não encontrado", device)
+            return
+        operation = PTZ_OPERATIONS[direction]
+        tours.preempt(device_id)
+        # a câmera sai do preset: o próximo call_preset para ele precisa movê-la
+        directory.forget_preset(device_id)
+        try:
+            await commands.submit(
+                device_id, lambda: api.move_ptz(device_id, operation, duration)
+            )
+        except CommandSuperseded:
+            _LOGGER.debug(
+                "Movimento %s de %s substituído por comando mais recente", direction, device_id
+            )
+        except Exception as e:
+            _LOGGER.exception("Falha no movimento %s de %s: %s", direction, device_id, e)
+            raise
+
+    async def srv_start_move(call: ServiceCall):
+        """Move a camera continuously via ``imou_control.start_move``.
+
+        Repeated calls while a request is in flight are coalesced per camera:
+        only the newest direction is sent once the current request finishes.
+
+        Parameters:
+            call: Service call providing ``device``, ``direction`` and optional ``duration`` (ms).
+
+        Example:
+            ```yaml
+            service: imou_control.start_move
+            data:
+              device: imou_living_room
+              direction: left
+              duration: 500
+            ```
+        """
+        await _async_move(call.data["device"], call.data["direction"], call.data["duration"])
+
+    hass.services.async_register(
+        DOMAIN,
+        "start_move",
+        srv_start_move,
+        schema=vol.Schema(
+            {
+                vol.Required("device"): cv.string,
+                vol.Required("direction"): vol.In(
+                    [direction for direction in PTZ_OPERATIONS if direction != "stop"]
+                ),
+                vol.Optional("duration", default=DEFAULT_MOVE_DURATION): vol.All(
+                    vol.Coerce(int), vol.Range(min=MIN_MOVE_DURATION, max=MAX_MOVE_DURATION)
+                ),
+            }
+        ),
+    )
+
+    async def srv_stop_move(call: ServiceCall):
+        """Stop a continuous move via ``imou_control.stop_move``.
+
+        A pending ``start_move`` for the same camera is discarded.
+
+        Parameters:
+            call: Service call providing ``device``.
+
+        Example:
+            ```yaml
+            service: imou_control.stop_move
+            data:
+              device: imou_living_room
+            ```
+        """
+        await _async_move(call.data["device"], "stop", 0)
+
+    hass.services.async_register(
+        DOMAIN,
+        "stop_move",
+        srv_stop_move,
+        schema=vol.Schema({vol.Required("device"): cv.string}),
     )
 
     async def srv_define_preset(call: ServiceCall):
@@ -182,7 +551,7 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         sel = dev.get("select_entity")
         if sel is not None:
             sel.async_update_presets()
-        await _save_presets()
+        _save_presets()
 
     hass.services.async_register(
         DOMAIN,
@@ -231,7 +600,7 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         sel = dev.get("select_entity")
         if sel is not None:
             sel.async_update_presets()
-        await _save_presets()
+        _save_presets()
 
     hass.services.async_register(
         DOMAIN,
@@ -270,7 +639,7 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         sel = dev.get("select_entity")
         if sel is not None:
             sel.async_update_presets()
-        await _save_presets()
+        _save_presets()
 
     hass.services.async_register(
         DOMAIN,
@@ -284,37 +653,22 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         ),
     )
 
-    async def srv_call_preset(call: ServiceCall):
-        """Trigger a stored preset using ``imou_control.call_preset``.
-
-        Parameters:
-            call: Service call with ``device`` and ``preset`` names to execute.
+    async def _async_call_preset(
+        device_id: str,
+        preset: str,
+        context=None,
+        priority: int = PRIORITY_INTERACTIVE,
+    ) -> str:
+        """Move a câmera para o preset e dispara ``EVENT_PRESET_CALLED``.
 
-        Example:
-            ```yaml
-            service: imou_control.call_preset
-            data:
-              device: imou_living_room
-              preset: entrada
-            ```
+        Devolve ``"moved"``, ``"already_active"`` ou ``"preset_not_found"``;
+        falhas da API (e :class:`CommandSuperseded`) são propagadas.
         """
-        device = call.data["device"]
-        device_id = resolve_device_id(device)
-        if not device_id:
-            _LOGGER.warning("Dispositivo %s não encontrado", device)
-            return
-        preset = call.data["preset"]
-
-        data = hass.data[DOMAIN][entry.entry_id]
-        devices = data["devices"]
-        dev = devices.get(device_id)
-        if not dev:
-            _LOGGER.warning("Dispositivo %s não encontrado", device_id)
-            return
+        dev = data_entry["devices"][device_id]
         coords = dev["presets"].get(preset)
         if coords is None:
             _LOGGER.warning("Preset %s não definido para %s", preset, device_id)
-            return
+            return "preset_not_found"
 
         h, v, z = coords
 
@@ -331,20 +685,60 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         if dev.get("last_preset") == preset:
             _LOGGER.debug("Preset %s já ativo em %s, ignorando", preset, device_id)
             _apply_coords()
-            return
+            return "already_active"
+
+        await commands.submit(
+            device_id,
+            lambda: api.set_position(device_id, h, v, z, priority=priority),
+        )
+        dev["last_preset"] = preset
+        _apply_coords()
+        hass.bus.async_fire(
+            EVENT_PRESET_CALLED,
+            {"device": device_id, "preset": preset},
+            context=context,
+        )
+        return "moved"
+
+    async def srv_call_preset(call: ServiceCall) -> ServiceResponse:
+        """Trigger a stored preset using ``imou_control.call_preset``.
+
+        When a response is requested it reports ``status``: ``moved``,
+        ``already_active``, ``preset_not_found``, ``superseded`` (a newer
+        command for the camera replaced this one) or ``error``.
+
+        Parameters:
+            call: Service call with ``device`` and ``preset`` names to execute.
+
+        Example:
+            ```yaml
+            service: imou_control.call_preset
+            data:
+              device: imou_living_room
+              preset: entrada
+            ```
+        """
+        device = call.data["device"]
+        device_id = resolve_device_id(device)
+        if not device_id:
+            _LOGGER.warning("Dispositivo %s não encontrado", device)
+            return {"status": "device_not_found"}
+        preset = call.data["preset"]
+
+        tours.preempt(device_id)
         try:
-            await api.set_position(device_id, h, v, z)
-            dev["last_preset"] = preset
-            _apply_coords()
-            hass.bus.async_fire(
-                EVENT_PRESET_CALLED,
-                {"device": device_id, "preset": preset},
-                context=call.context,
+            status = await _async_call_preset(device_id, preset, call.context)
+        except CommandSuperseded:
+            _LOGGER.debug(
+                "Preset %s em %s substituído por comando mais recente", preset, device_id
             )
+            return {"status": "superseded"}
         except Exception as e:
             _LOGGER.exception(
                 "Falha ao acionar preset %s em %s: %s", preset, device_id, e
             )
+            return {"status": "error", "error": str(e)}
+        return {"status": status}
 
     hass.services.async_register(
         DOMAIN,
@@ -356,11 +750,408 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
                 vol.Required("preset"): cv.string,
             }
         ),
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+    def _resolve_tour_steps(device_id: str, call: ServiceCall) -> list[TourStep] | None:
+        dev = data_entry["devices"][device_id]
+        default_dwell = call.data["dwell"]
+        steps = []
+        for item in call.data["presets"]:
+            if isinstance(item, dict):
+                preset, dwell = item["preset"], item.get("dwell", default_dwell)
+            else:
+                preset, dwell = item, default_dwell
+            if preset not in dev["presets"]:
+                _LOGGER.warning("Preset %s não definido para %s", preset, device_id)
+                return None
+            steps.append(TourStep(preset, float(dwell)))
+        return steps
+
+    def _plan_steps(
+        device_id: str, steps: list[TourStep], call: ServiceCall
+    ) -> tuple[list[TourStep], float, float] | None:
+        """Reordena ``steps`` para minimizar o deslocamento da câmera.
+
+        Devolve os passos na nova ordem e o tempo estimado de deslocamento
+        (s) na ordem planejada e na ordem informada, ou ``None`` se algum
+        preset se repete (a rota visita cada preset uma única vez).
+        """
+        seen: set[str] = set()
+        for step in steps:
+            if step.preset in seen:
+                _LOGGER.warning(
+                    "Preset %s repetido; a rota otimizada visita cada preset uma vez",
+                    step.preset,
+                )
+                return None
+            seen.add(step.preset)
+
+        dev = data_entry["devices"][device_id]
+        coords = dev["coords"]
+        start = (coords["h"], coords["v"], coords.get("z", 0.0))
+        speeds = (call.data["speed_h"], call.data["speed_v"], call.data["speed_z"])
+        points = {step.preset: tuple(dev["presets"][step.preset]) for step in steps}
+        dwell = {step.preset: step.dwell for step in steps}
+        order = plan_route(start, points, speeds)
+        return (
+            [TourStep(preset, dwell[preset]) for preset in order],
+            route_time(start, order, points, speeds),
+            route_time(start, list(points), points, speeds),
+        )
+
+    async def srv_start_tour(call: ServiceCall):
+        """Start a preset patrol with ``imou_control.start_tour``.
+
+        Parameters:
+            call: Service call with ``device``, the ordered ``presets`` (names or
+                ``preset``/``dwell`` pairs), the default ``dwell`` in seconds and
+                ``repeat``.
+
+        Example:
+            ```yaml
+            service: imou_control.start_tour
+            data:
+              device: imou_living_room
+              presets:
+                - entrada
+                - preset: varanda
+                  dwell: 30
+              dwell: 15
+            ```
+        """
+        device = call.data["device"]
+        device_id = resolve_device_id(device)
+        if not device_id:
+            _LOGGER.warning("Dispositivo %s não encontrado", device)
+            return
+        steps = _resolve_tour_steps(device_id, call)
+        if not steps:
+            return
+        if call.data["optimize"]:
+            plan = _plan_steps(device_id, steps, call)
+            if plan is None:
+                return
+            steps = plan[0]
+        tours.start(device_id, steps, repeat=call.data["repeat"])
+
+    hass.services.async_register(
+        DOMAIN,
+        "start_tour",
+        srv_start_tour,
+        schema=vol.Schema(
+            {
+                vol.Required("device"): cv.string,
+                **TOUR_PRESETS_SCHEMA,
+                vol.Optional("repeat", default=True): cv.boolean,
+                vol.Optional("optimize", default=False): cv.boolean,
+                **AXIS_SPEED_SCHEMA,
+            }
+        ),
     )
 
+    async def srv_visit_presets(call: ServiceCall) -> ServiceResponse:
+        """Visit presets in travel-optimised order via ``imou_control.visit_presets``.
+
+        The route is planned from the camera's last known position, then run
+        once as a non-repeating tour at interactive priority, so its moves are
+        neither deferred by the monthly budget nor preempted by background
+        calls. The response reports the planned order and the estimated
+        travel time saved against the given order.
+
+        Example:
+            ```yaml
+            service: imou_control.visit_presets
+            data:
+              device: imou_living_room
+              presets: [entrada, varanda, garagem, portao]
+              dwell: 5
+            ```
+        """
+        device = call.data["device"]
+        device_id = resolve_device_id(device)
+        if not device_id:
+            _LOGGER.warning("Dispositivo %s não encontrado", device)
+            return {}
+        steps = _resolve_tour_steps(device_id, call)
+        if not steps:
+            return {}
+        plan = _plan_steps(device_id, steps, call)
+        if plan is None:
+            return {}
+        planned_steps, planned, given = plan
+        tours.start(
+            device_id, planned_steps, repeat=False, priority=PRIORITY_INTERACTIVE
+        )
+        return {
+            "order": [step.preset for step in planned_steps],
+            "estimated_travel_s": round(planned, 2),
+            "given_order_travel_s": round(given, 2),
+            "estimated_time_saved_s": round(given - planned, 2),
+        }
+
+    hass.services.async_register(
+        DOMAIN,
+        "visit_presets",
+        srv_visit_presets,
+        schema=vol.Schema(
+            {
+                vol.Required("device"): cv.string,
+                **TOUR_PRESETS_SCHEMA,
+                **AXIS_SPEED_SCHEMA,
+            }
+        ),
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+    async def srv_control_tour(call: ServiceCall):
+        """Pause, resume or stop a patrol (``pause_tour``/``resume_tour``/``stop_tour``).
+
+        Example:
+            ```yaml
+            service: imou_control.pause_tour
+            data:
+              device: imou_living_room
+            ```
+        """
+        device = call.data["device"]
+        device_id = resolve_device_id(device)
+        if not device_id:
+            _LOGGER.warning("Dispositivo %s não encontrado", device)
+            return
+        if call.service == "pause_tour":
+            found = tours.pause(device_id)
+        elif call.service == "resume_tour":
+            found = tours.resume(device_id)
+        else:
+            found = await tours.stop(device_id)
+        if not found:
+            _LOGGER.debug("Nenhuma ronda ativa em %s", device_id)
+
+    for service in ("pause_tour", "resume_tour", "stop_tour"):
+        hass.services.async_register(
+            DOMAIN,
+            service,
+            srv_control_tour,
+            schema=vol.Schema({vol.Required("device"): cv.string}),
+        )
+
+    async def _async_run_bulk(
+        items: list[dict],
+        runner: Callable[[str, dict], Awaitable[str]],
+        limit: int,
+    ) -> ServiceResponse:
+        return {
+            "results": await run_bulk(
+                items, resolve_device_id, runner, limit, on_device=tours.preempt
+            )
+        }
+
+    async def srv_call_presets_bulk(call: ServiceCall) -> ServiceResponse:
+        """Call presets on several cameras at once via ``imou_control.call_presets_bulk``.
+
+        Parameters:
+            call: Service call with ``items`` (``device``/``preset`` pairs) and an
+                optional ``max_concurrency``.
+
+        Example:
+            ```yaml
+            service: imou_control.call_presets_bulk
+            data:
+              items:
+                - device: imou_living_room
+                  preset: porta
+                - device: imou_garage
+                  preset: porta
+            ```
+        """
+
+        async def _runner(device_id: str, item: dict) -> str:
+            return await _async_call_preset(device_id, item["preset"], call.context)
+
+        return await _async_run_bulk(
+            call.data["items"],
+            _runner,
+            call.data.get("max_concurrency", bulk_concurrency),
+        )
+
+    hass.services.async_register(
+        DOMAIN,
+        "call_presets_bulk",
+        srv_call_presets_bulk,
+        schema=vol.Schema(
+            {
+                vol.Required("items"): vol.All(
+                    cv.ensure_list,
+                    [
+                        vol.Schema(
+                            {
+                                vol.Required("device"): cv.string,
+                                vol.Required("preset"): cv.string,
+                            }
+                        )
+                    ],
+                ),
+                vol.Optional("max_concurrency"): vol.All(
+                    vol.Coerce(int), vol.Range(min=1)
+                ),
+            }
+        ),
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+    async def srv_set_positions_bulk(call: ServiceCall) -> ServiceResponse:
+        """Move several cameras at once via ``imou_control.set_positions_bulk``.
+
+        Parameters:
+            call: Service call with ``items`` (``device`` plus ``h``/``v``/``z``)
+                and an optional ``max_concurrency``.
+
+        Example:
+            ```yaml
+            service: imou_control.set_positions_bulk
+            data:
+              items:
+                - device: imou_living_room
+                  h: 0.1
+                  v: -0.2
+                - device: imou_garage
+                  h: -0.5
+                  v: 0.0
+            ```
+        """
+
+        async def _runner(device_id: str, item: dict) -> str:
+            h, v, z = item["h"], item["v"], item.get("z", 0.0)
+            await commands.submit(
+                device_id, lambda: api.set_position(device_id, h, v, z)
+            )
+            return "moved"
+
+        return await _async_run_bulk(
+            call.data["items"],
+            _runner,
+            call.data.get("max_concurrency", bulk_concurrency),
+        )
+
+    hass.services.async_register(
+        DOMAIN,
+        "set_positions_bulk",
+        srv_set_positions_bulk,
+        schema=vol.Schema(
+            {
+                vol.Required("items"): vol.All(
+                    cv.ensure_list,
+                    [
+                        vol.Schema(
+                            {
+                                vol.Required("device"): cv.string,
+                                vol.Required("h"): vol.Coerce(float),
+                                vol.Required("v"): vol.Coerce(float),
+                                vol.Optional("z", default=0.0): vol.Coerce(float),
+                            }
+                        )
+                    ],
+                ),
+                vol.Optional("max_concurrency"): vol.All(
+                    vol.Coerce(int), vol.Range(min=1)
+                ),
+            }
+        ),
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+    async def srv_rescan_devices(call: ServiceCall) -> ServiceResponse:
+        """Re-read the device list via ``imou_control.rescan_devices``.
+
+        Only cameras that appeared or disappeared have their entities and
+        device-registry entries added or removed.
+
+        Example:
+            ```yaml
+            service: imou_control.rescan_devices
+            ```
+        """
+        return await _async_rescan_devices()
+
+    hass.services.async_register(
+        DOMAIN,
+        "rescan_devices",
+        srv_rescan_devices,
+        schema=vol.Schema({}),
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+    async def srv_get_usage(call: ServiceCall) -> ServiceResponse:
+        """Return the API usage breakdown via ``imou_control.get_usage``.
+
+        Parameters:
+            call: Service call with an optional ``hours`` window (1-720) for
+                the hourly counts.
+
+        Example:
+            ```yaml
+            service: imou_control.get_usage
+            data:
+              hours: 48
+            response_variable: usage
+            ```
+        """
+        devices = data_entry["devices"]
+        return {
+            "period": usage.period,
+            "count": usage.count,
+            "skipped": usage.skipped,
+            "by_endpoint": usage.by_endpoint,
+            "by_device": [
+                {
+                    "device_id": device_id,
+                    "name": devices[device_id]["name"] if device_id in devices else None,
+                    "calls": calls,
+                }
+                for device_id, calls in sorted(
+                    usage.by_device.items(), key=lambda item: item[1], reverse=True
+                )
+            ],
+            "hourly": [
+                {"hour": hour.isoformat(), "calls": calls}
+                for hour, calls in usage.hourly(call.data["hours"])
+            ],
+        }
+
+    hass.services.async_register(
+        DOMAIN,
+        "get_usage",
+        srv_get_usage,
+        schema=vol.Schema(
+            {
+                vol.Optional("hours", default=24): vol.All(
+                    vol.Coerce(int), vol.Range(min=1, max=HOURLY_SLOTS)
+                ),
+            }
+        ),
+        supports_response=SupportsResponse.ONLY,
+    )
+
+    entry.async_on_unload(entry.add_update_listener(_async_update_listener))
+
     return True
 
+async def _async_update_listener(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Recarrega a integração quando as opções mudam."""
+    await hass.config_entries.async_reload(entry.entry_id)
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
-    await hass.config_entries.async_unload_platforms(entry, ["number", "select", "button", "text"])
-    hass.data[DOMAIN].pop(entry.entry_id, None)
+    # última atualização dos sensores de uso antes de removê-los
+    hass.data[DOMAIN][entry.entry_id]["usage"].async_flush()
+    # assinaturas de alvos usam a API desta entrada, que vai ser parada
+    async_close_setpoint_streams(hass, entry.entry_id)
+    await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
+    data = hass.data[DOMAIN].pop(entry.entry_id, None)
+    if data is not None:
+        await data["tours"].async_stop_all()
+        if data["presets_dirty"]:
+            # grava já o que async_delay_save ainda não escreveu
+            await data["store"].async_save(encode_presets(data["presets"]))
+        await data["tm"].async_stop()
     return True
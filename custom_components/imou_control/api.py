@@ -2,20 +2,41 @@ from __future__ import annotations
 
 import asyncio
 import inspect
-import json
 import logging
-import uuid
-from typing import Any, Awaitable, Callable, Dict, List, Optional, Union
+import time
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple, Union
 
 import aiohttp
 
-from .const import PTZ_LOCATION_ENDPOINT, DEVICE_LIST_ENDPOINT
+from .const import (
+    PTZ_LOCATION_ENDPOINT,
+    PTZ_MOVE_ENDPOINT,
+    DEVICE_LIST_ENDPOINT,
+    DEVICE_PAGE_SIZE,
+    DEFAULT_BREAKER_THRESHOLD,
+    DEFAULT_BREAKER_RESET,
+    DEFAULT_DEDUP_EPSILON,
+    DEFAULT_DEDUP_TTL,
+    DEFAULT_REQUEST_TIMEOUT,
+)
+from .codec import DEFAULT_CODEC, JSON_CONTENT_TYPE, JsonCodec
+from .metrics import ApiMetrics
+from .rate_limit import PRIORITY_BACKGROUND, PRIORITY_INTERACTIVE, PriorityRateLimiter
+from .resilience import CircuitBreaker, RetryPolicy, TransientApiError
 from .usage import ApiUsageTracker
-from .utils import make_system
+from .utils import SystemSigner
 
 # Códigos de erro que indicam token inválido/expirado
 _RETRY_TOKEN_CODES = {"TK1002"}
 
+# Endpoints que podem ser repetidos com segurança após falhas passageiras
+# (controlMovePTZ não: repetir um movimento relativo desloca a câmera de novo)
+_IDEMPOTENT_ENDPOINTS = {PTZ_LOCATION_ENDPOINT, DEVICE_LIST_ENDPOINT}
+
+# Campos fixos de 'params' de cada método
+_PTZ_PARAMS = {"channelId": "0"}
+_DEVICE_LIST_PARAMS = {"type": "bindAndShare", "needApInfo": "false"}
+
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -23,6 +44,20 @@ _LOGGER = logging.getLogger(__name__)
 TokenCallable = Callable[[], Union[str, Awaitable[str]]]
 
 
+def _result_error(data: Dict[str, Any]) -> Optional[str]:
+    """Código de erro da resposta (``None`` quando a chamada deu certo)."""
+    result = data.get("result") or {}
+    code = str(result.get("code", "0"))
+    return None if code == "0" else f"code={code}"
+
+
+class QuotaBudgetExceeded(RuntimeError):
+    """Chamada de segundo plano não enviada para preservar a cota mensal.
+
+    A chamada não é reagendada: quem a fez tenta de novo na próxima execução.
+    """
+
+
 class ApiClient:
     def __init__(
         self,
@@ -33,6 +68,16 @@ class ApiClient:
         token_getter: TokenCallable,
         token_refresher: Optional[TokenCallable] = None,
         usage: ApiUsageTracker | None = None,
+        token_generation: Optional[Callable[[], int]] = None,
+        rate_limiter: Optional[PriorityRateLimiter] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        breaker_threshold: int = DEFAULT_BREAKER_THRESHOLD,
+        breaker_reset: float = DEFAULT_BREAKER_RESET,
+        codec: JsonCodec = DEFAULT_CODEC,
+        dedup_epsilon: float = DEFAULT_DEDUP_EPSILON,
+        dedup_ttl: float = DEFAULT_DEDUP_TTL,
+        metrics: Optional[ApiMetrics] = None,
+        request_timeout: float = DEFAULT_REQUEST_TIMEOUT,
     ):
         self.app_id = app_id
         self.app_secret = app_secret
@@ -40,14 +85,28 @@ class ApiClient:
         self._session = session
         self._get_token = token_getter
         self._refresh_token = token_refresher
-        self._timeout = aiohttp.ClientTimeout(total=10)
+        self._token_generation = token_generation
+        self._timeout = aiohttp.ClientTimeout(total=request_timeout)
         self._usage = usage
+        self._rate_limiter = rate_limiter
+        self._retry_policy = retry_policy or RetryPolicy()
+        self._breaker_threshold = breaker_threshold
+        self._breaker_reset = breaker_reset
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._codec = codec
+        self._sign = SystemSigner(app_id, app_secret)
+        self._dedup_epsilon = dedup_epsilon
+        self._dedup_ttl = dedup_ttl
+        # último alvo enviado com sucesso por dispositivo: (h, v, z, monotonic)
+        self._last_sent: Dict[str, Tuple[float, float, float, float]] = {}
+        self._skipped_moves: Dict[str, int] = {}
+        self._metrics = metrics
 
     def _url(self, path: str) -> str:
         return f"{self.base_url}{path}"
 
-    async def _resolve_token(self, func: TokenCallable) -> str:
-        token = func()
+    async def _resolve_token(self, func: Callable[..., Any], *args: Any) -> str:
+        token = func(*args)
         if inspect.isawaitable(token):
             return await token
         return token
@@ -65,7 +124,7 @@ class ApiClient:
         Retorna o JSON (dict) da resposta já convertido.
         """
         # novo bloco 'system' a cada tentativa
-        system, _ts, _nonce = make_system(self.app_id, self.app_secret)
+        system, _ts, nonce = self._sign()
 
         # injeta token dentro de params quando necessário (padrão dos métodos Imou)
         if include_token:
@@ -74,50 +133,171 @@ class ApiClient:
                 if token_override is not None
                 else await self._resolve_token(self._get_token)
             )
-            params = dict(params)  # cópia
-            params["token"] = token
+            params = {**params, "token": token}  # cópia
 
-        payload: Dict[str, Any] = {
-            "system": system,
-            "id": str(uuid.uuid4()),
-            "params": params,
-        }
+        # o nonce (uuid4, único por requisição) também serve de id
+        body = self._codec.dumps({"system": system, "id": nonce, "params": params})
 
+        if self._metrics is None:
+            return await self._post(path, body, params.get("deviceId"))
+        start = time.monotonic()
+        try:
+            data = await self._post(path, body, params.get("deviceId"))
+        except Exception as err:
+            self._metrics.record(path, time.monotonic() - start, str(err))
+            raise
+        self._metrics.record(path, time.monotonic() - start, _result_error(data))
+        return data
+
+    async def _post(
+        self, path: str, body: bytes, device_id: Optional[str]
+    ) -> Dict[str, Any]:
+        """POST de ``body`` em ``path``; devolve o JSON da resposta."""
         try:
             async with self._session.post(
-                self._url(path), json=payload, timeout=self._timeout
+                self._url(path),
+                data=body,
+                headers=JSON_CONTENT_TYPE,
+                timeout=self._timeout,
             ) as response:
                 if self._usage is not None:
-                    self._usage.note_call(response.headers.get("Date"))
+                    self._usage.note_call(response.headers.get("Date"), path, device_id)
                 response.raise_for_status()
-                text = await response.text()
+                raw = await response.read()
+        # falhas passageiras são registradas em _send, depois da última tentativa
         except asyncio.TimeoutError as err:
-            _LOGGER.error("Timeout ao chamar %s: %s", path, err)
-            raise RuntimeError(f"Timeout ao chamar {path}") from err
+            _LOGGER.debug("Timeout ao chamar %s: %s", path, err)
+            raise TransientApiError(f"Timeout ao chamar {path}") from err
+        except aiohttp.ClientResponseError as err:
+            if err.status >= 500 or err.status == 429:
+                _LOGGER.debug("Erro HTTP %s ao chamar %s: %s", err.status, path, err)
+                raise TransientApiError(f"Erro HTTP {err.status} ao chamar {path}") from err
+            _LOGGER.error("Erro HTTP %s ao chamar %s: %s", err.status, path, err)
+            raise RuntimeError(f"Erro HTTP {err.status} ao chamar {path}") from err
         except aiohttp.ClientError as err:
-            _LOGGER.error("Erro de cliente ao chamar %s: %s", path, err)
-            raise RuntimeError(f"Erro de cliente ao chamar {path}") from err
+            _LOGGER.debug("Erro de cliente ao chamar %s: %s", path, err)
+            raise TransientApiError(f"Erro de cliente ao chamar {path}") from err
 
-        if not text:
+        if not raw:
             return {}
 
         try:
-            return json.loads(text)
-        except json.JSONDecodeError as err:
+            return self._codec.loads(raw)
+        except ValueError as err:
             _LOGGER.error("Resposta inválida ao chamar %s: %s", path, err)
             raise RuntimeError(f"Resposta inválida ao chamar {path}") from err
 
+    async def _throttle(self, priority: int, device_id: Optional[str]) -> None:
+        if self._rate_limiter is not None:
+            await self._rate_limiter.acquire(priority, device_id)
+
+    def breaker(self, path: str) -> CircuitBreaker:
+        """Disjuntor do endpoint ``path`` (criado sob demanda)."""
+        breaker = self._breakers.get(path)
+        if breaker is None:
+            breaker = self._breakers[path] = CircuitBreaker(
+                self._breaker_threshold, self._breaker_reset
+            )
+        return breaker
+
+    async def _send(
+        self,
+        path: str,
+        params: Dict[str, Any],
+        include_token: bool,
+        token_override: Optional[str],
+        priority: int,
+        device_id: Optional[str],
+    ) -> Dict[str, Any]:
+        """
+        Envia a chamada passando pelo disjuntor do endpoint e pelo limitador.
+        Falhas passageiras em endpoints idempotentes são repetidas com backoff
+        exponencial e jitter.
+        """
+        breaker = self.breaker(path)
+        attempts = self._retry_policy.attempts if path in _IDEMPOTENT_ENDPOINTS else 1
+        attempt = 0
+        while True:
+            breaker.before_call()
+            recorded = False
+            try:
+                await self._throttle(priority, device_id)
+                data = await self._do_call(
+                    path,
+                    params,
+                    include_token=include_token,
+                    token_override=token_override,
+                )
+            except TransientApiError as err:
+                was_open = breaker.state == breaker.OPEN
+                breaker.record_failure()
+                recorded = True
+                attempt += 1
+                if breaker.state == breaker.OPEN and not was_open:
+                    _LOGGER.error(
+                        "Circuito de %s aberto após %d falhas seguidas: %s",
+                        path,
+                        breaker.failures,
+                        err,
+                    )
+                if attempt >= max(attempts, 1):
+                    _LOGGER.error(
+                        "Falha em %s após %d tentativa(s): %s", path, attempt, err
+                    )
+                    raise
+            else:
+                # a nuvem respondeu: mesmo códigos de erro contam como sucesso
+                breaker.record_success()
+                recorded = True
+                return data
+            finally:
+                if not recorded:
+                    breaker.release()
+
+            delay = self._retry_policy.delay(attempt - 1)
+            _LOGGER.debug(
+                "Falha passageira em %s; tentativa %d/%d em %.2fs",
+                path,
+                attempt + 1,
+                attempts,
+                delay,
+            )
+            await asyncio.sleep(delay)
+
     async def _call_with_retry(
         self,
         path: str,
         params: Dict[str, Any],
         include_token: bool = True,
+        *,
+        priority: int = PRIORITY_BACKGROUND,
+        device_id: Optional[str] = None,
     ) -> Dict[str, Any]:
         """
         Chama o endpoint e, se retornar TK1002, renova o token e tenta de novo (1x).
+        Cada tentativa passa antes pelo limitador de taxa, na faixa ``priority``.
+        Chamadas de segundo plano são descartadas quando a cota mensal está no fim.
         """
+        if self._usage is not None and self._usage.should_defer(
+            essential=priority == PRIORITY_INTERACTIVE
+        ):
+            raise QuotaBudgetExceeded(
+                f"Chamada a {path} não enviada: orçamento mensal quase esgotado"
+            )
+
+        # token e geração lidos juntos (sem await entre eles): se outra corrotina
+        # já renovou, o refresh devolve o token novo sem outra ida a
+        # /openapi/accessToken; se o próprio get_token() buscou um token novo,
+        # a geração já é a dele e o refresh não devolve o token recusado
+        token: Optional[str] = None
+        generation: Optional[int] = None
+        if include_token:
+            token = await self._resolve_token(self._get_token)
+            if self._token_generation is not None:
+                generation = self._token_generation()
+
         # 1ª tentativa
-        data = await self._do_call(path, params, include_token=include_token)
+        data = await self._send(path, params, include_token, token, priority, device_id)
         result = data.get("result") or {}
         code = str(result.get("code", "0"))
         if code == "0" or not include_token:
@@ -125,12 +305,12 @@ class ApiClient:
 
         # Se for erro de token, renova e repete 1x
         if code in _RETRY_TOKEN_CODES and self._refresh_token is not None:
-            new_token = await self._resolve_token(self._refresh_token)
-            data = await self._do_call(
-                path,
-                params,
-                include_token=include_token,
-                token_override=new_token,
+            if generation is None:
+                new_token = await self._resolve_token(self._refresh_token)
+            else:
+                new_token = await self._resolve_token(self._refresh_token, generation)
+            data = await self._send(
+                path, params, include_token, new_token, priority, device_id
             )
             result = data.get("result") or {}
             code = str(result.get("code", "0"))
@@ -145,35 +325,164 @@ class ApiClient:
     #  Métodos Públicos
     # =======================
 
-    async def set_position(self, device_id: str, h: float, v: float, z: float = 0.0) -> bool:
+    @property
+    def breakers(self) -> Dict[str, Dict[str, Any]]:
+        """Estado e falhas seguidas do disjuntor de cada endpoint já chamado."""
+        return {
+            path: {"state": breaker.state, "failures": breaker.failures}
+            for path, breaker in self._breakers.items()
+        }
+
+    @property
+    def skipped_moves(self) -> Dict[str, int]:
+        """Movimentos descartados por repetirem o último alvo, por dispositivo."""
+        return dict(self._skipped_moves)
+
+    @property
+    def last_sent(self) -> Dict[str, Tuple[float, float, float]]:
+        """Último alvo ainda considerado válido, por dispositivo."""
+        now = time.monotonic()
+        return {
+            device_id: (h, v, z)
+            for device_id, (h, v, z, sent_at) in self._last_sent.items()
+            if now - sent_at < self._dedup_ttl
+        }
+
+    def forget_position(self, device_id: str) -> None:
+        """Descarta o último alvo (a câmera foi movida por outro caminho)."""
+        self._last_sent.pop(device_id, None)
+
+    def _is_duplicate_move(self, device_id: str, h: float, v: float, z: float) -> bool:
+        last = self._last_sent.get(device_id)
+        if last is None or time.monotonic() - last[3] >= self._dedup_ttl:
+            return False
+        eps = self._dedup_epsilon
+        return abs(h - last[0]) <= eps and abs(v - last[1]) <= eps and abs(z - last[2]) <= eps
+
+    async def set_position(
+        self,
+        device_id: str,
+        h: float,
+        v: float,
+        z: float = 0.0,
+        *,
+        priority: int = PRIORITY_INTERACTIVE,
+    ) -> bool:
         """
         PTZ absoluto via /openapi/controlLocationPTZ com retry automático para TK1002.
+        Alvos a menos de ``dedup_epsilon`` do último enviado (dentro de
+        ``dedup_ttl`` segundos) não geram chamada.
         """
+        h, v, z = float(h), float(v), float(z)
+        if self._is_duplicate_move(device_id, h, v, z):
+            self._skipped_moves[device_id] = self._skipped_moves.get(device_id, 0) + 1
+            if self._usage is not None:
+                self._usage.note_skipped()
+            _LOGGER.debug("Posição de %s já enviada; ignorando movimento", device_id)
+            return True
+
         params = {
+            **_PTZ_PARAMS,
             "deviceId": device_id,
-            "channelId": "0",
-            "h": float(h),
-            "v": float(v),
-            "z": float(z),
+            "h": h,
+            "v": v,
+            "z": z,
         }
-        data = await self._call_with_retry(PTZ_LOCATION_ENDPOINT, params, include_token=True)
+        # posição desconhecida até a chamada terminar com sucesso
+        self._last_sent.pop(device_id, None)
+        data = await self._call_with_retry(
+            PTZ_LOCATION_ENDPOINT,
+            params,
+            include_token=True,
+            priority=priority,
+            device_id=device_id,
+        )
+        self._last_sent[device_id] = (h, v, z, time.monotonic())
         # sucesso já garantido por _call_with_retry (code == "0")
         return True
 
-    async def list_devices(self) -> List[Dict[str, Any]]:
-        """Obtém a lista de dispositivos vinculados à conta Imou."""
+    async def move_ptz(
+        self,
+        device_id: str,
+        operation: int,
+        duration: int,
+        *,
+        priority: int = PRIORITY_INTERACTIVE,
+    ) -> bool:
+        """
+        PTZ contínuo via /openapi/controlMovePTZ: ``operation`` 0–9 move ou dá
+        zoom por ``duration`` ms e 10 para. Falhas passageiras não são
+        repetidas (só o TK1002, recusado antes de mover).
+        """
+        # a posição muda (ou pode ter mudado, se a chamada falhar no caminho)
+        self.forget_position(device_id)
         params = {
-            "bindId": "-1",
-            "limit": 128,
-            "type": "bindAndShare",
-            "needApInfo": "false",
+            **_PTZ_PARAMS,
+            "deviceId": device_id,
+            "operation": str(operation),
+            "duration": int(duration),
         }
+        await self._call_with_retry(
+            PTZ_MOVE_ENDPOINT,
+            params,
+            include_token=True,
+            priority=priority,
+            device_id=device_id,
+        )
+        return True
+
+    async def iter_device_pages(
+        self,
+        page_size: int = DEVICE_PAGE_SIZE,
+        *,
+        priority: int = PRIORITY_BACKGROUND,
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Percorre deviceOpenList página a página, seguindo o cursor ``bindId``.
+
+        Cada página é entregue assim que chega; erros de API e cursores
+        inválidos são propagados.
+        """
+        bind_id = "-1"
+        seen_cursors = {bind_id}
+        while True:
+            params = {**_DEVICE_LIST_PARAMS, "bindId": bind_id, "limit": page_size}
+            data = await self._call_with_retry(
+                DEVICE_LIST_ENDPOINT,
+                params,
+                include_token=True,
+                priority=priority,
+            )
+            devices = self._extract_devices(data)
+            if devices:
+                yield devices
+
+            # página incompleta: não há mais dispositivos
+            if len(devices) < page_size:
+                return
+
+            # sem cursor válido a lista ficaria incompleta: falha em vez de
+            # devolver só parte das câmeras como se fosse a lista toda
+            cursor = devices[-1].get("bindId")
+            if cursor is None or str(cursor) in seen_cursors:
+                raise RuntimeError(
+                    "Cursor bindId ausente ou repetido ao paginar dispositivos"
+                )
+            bind_id = str(cursor)
+            seen_cursors.add(bind_id)
+
+    async def list_devices(self) -> List[Dict[str, Any]]:
+        """Obtém a lista completa de dispositivos vinculados à conta Imou."""
+        devices: List[Dict[str, Any]] = []
         try:
-            data = await self._call_with_retry(DEVICE_LIST_ENDPOINT, params, include_token=True)
+            async for page in self.iter_device_pages():
+                devices.extend(page)
         except Exception as err:
             _LOGGER.error("Falha ao listar dispositivos: %s", err)
             return []
+        return devices
 
+    @staticmethod
+    def _extract_devices(data: Dict[str, Any]) -> List[Dict[str, Any]]:
         result = data.get("result") or {}
         devices = (
             (result.get("data") or {}).get("deviceList")
@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional
+
+from .command_queue import CommandSuperseded
+
+_LOGGER = logging.getLogger(__name__)
+
+# Status que contam como sucesso na resposta dos serviços em lote
+SUCCESS_STATUSES = frozenset({"moved", "already_active"})
+
+BulkRunner = Callable[[str, Dict[str, Any]], Awaitable[str]]
+
+
+async def run_bulk(
+    items: Iterable[Dict[str, Any]],
+    resolve: Callable[[str], Optional[str]],
+    runner: BulkRunner,
+    limit: int,
+    on_device: Optional[Callable[[str], Any]] = None,
+) -> List[Dict[str, Any]]:
+    """Executa ``runner(device_id, item)`` para cada item, no máximo ``limit`` em paralelo.
+
+    ``resolve`` converte o ``device`` do item em ID e ``on_device`` é chamado
+    antes de enfileirar cada câmera (ex.: para interromper a ronda). Devolve um
+    resultado por item, na mesma ordem, com ``status``, ``success`` e
+    ``latency_ms`` (tempo da chamada, sem a espera pela vaga).
+    """
+    semaphore = asyncio.Semaphore(max(limit, 1))
+
+    async def _run(item: Dict[str, Any]) -> Dict[str, Any]:
+        result: Dict[str, Any] = {"device": item["device"], "success": False}
+        device_id = resolve(item["device"])
+        if not device_id:
+            _LOGGER.warning("Dispositivo %s não encontrado", item["device"])
+            result["status"] = "device_not_found"
+            return result
+        if on_device is not None:
+            on_device(device_id)
+        async with semaphore:
+            start = time.monotonic()
+            try:
+                status = await runner(device_id, item)
+            except CommandSuperseded:
+                status = "superseded"
+            except Exception as err:
+                _LOGGER.warning("Falha em comando em lote para %s: %s", device_id, err)
+                status = "error"
+                result["error"] = str(err)
+            result["latency_ms"] = round((time.monotonic() - start) * 1000, 1)
+        result["device_id"] = device_id
+        result["status"] = status
+        result["success"] = status in SUCCESS_STATUSES
+        return result
+
+    return list(await asyncio.gather(*(_run(item) for item in items)))
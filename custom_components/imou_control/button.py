@@ -1,16 +1,16 @@
 from __future__ import annotations
 
 from homeassistant.components.button import ButtonEntity
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity import DeviceInfo
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 
-from .const import DOMAIN
+from .const import DOMAIN, SIGNAL_DEVICES_ADDED
 
 
 class ImouMoveButton(ButtonEntity):
-    def __init__(self, hass: HomeAssistant, api, device_id: str, data: dict):
+    def __init__(self, hass: HomeAssistant, device_id: str, data: dict):
         self._hass = hass
-        self._api = api
         self._device_id = device_id
         self._data = data
         self._attr_should_poll = False
@@ -27,8 +27,12 @@ class ImouMoveButton(ButtonEntity):
         h = self._data["coords"]["h"]
         v = self._data["coords"]["v"]
         z = self._data["coords"].get("z", 0.0)
-        await self._hass.async_add_executor_job(
-            self._api.set_position, self._device_id, h, v, z
+        await self._hass.services.async_call(
+            DOMAIN,
+            "set_position",
+            {"device": self._device_id, "h": h, "v": v, "z": z},
+            blocking=True,
+            context=self._context,
         )
 
 
@@ -61,9 +65,19 @@ class ImouSavePresetButton(ButtonEntity):
 
 async def async_setup_entry(hass: HomeAssistant, entry, async_add_entities):
     data = hass.data[DOMAIN][entry.entry_id]
-    api = data["api"]
-    entities = []
-    for device_id, dev in data["devices"].items():
-        entities.append(ImouMoveButton(hass, api, device_id, dev))
-        entities.append(ImouSavePresetButton(hass, device_id, dev))
-    async_add_entities(entities)
+
+    @callback
+    def _async_add_devices(device_ids: list[str]) -> None:
+        entities = []
+        for device_id in device_ids:
+            dev = data["devices"][device_id]
+            entities.append(ImouMoveButton(hass, device_id, dev))
+            entities.append(ImouSavePresetButton(hass, device_id, dev))
+        async_add_entities(entities)
+
+    _async_add_devices(list(data["devices"]))
+    entry.async_on_unload(
+        async_dispatcher_connect(
+            hass, SIGNAL_DEVICES_ADDED.format(entry.entry_id), _async_add_devices
+        )
+    )
@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass
+from typing import Any, Callable, Union
+
+try:  # orjson acompanha o Home Assistant; fora dele cai no json da stdlib
+    import orjson
+except ImportError:  # pragma: no cover - depende do ambiente
+    orjson = None  # type: ignore[assignment]
+
+JSON_CONTENT_TYPE = {"Content-Type": "application/json"}
+
+
+@dataclass(frozen=True)
+class JsonCodec:
+    """Par de funções usado para (de)serializar os corpos da OpenAPI em bytes.
+
+    ``loads`` deve levantar ``ValueError`` (ou subclasse) para JSON inválido.
+    """
+
+    name: str
+    dumps: Callable[[Any], bytes]
+    loads: Callable[[Union[bytes, str]], Any]
+
+
+def _std_dumps(obj: Any) -> bytes:
+    return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+
+STDLIB_CODEC = JsonCodec("json", _std_dumps, json.loads)
+
+if orjson is not None:
+    ORJSON_CODEC: JsonCodec | None = JsonCodec("orjson", orjson.dumps, orjson.loads)
+else:  # pragma: no cover - depende do ambiente
+    ORJSON_CODEC = None
+
+DEFAULT_CODEC = ORJSON_CODEC or STDLIB_CODEC
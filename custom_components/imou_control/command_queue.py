@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections import defaultdict
+from typing import Awaitable, Callable, Dict, Set, TypeVar
+
+_LOGGER = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class CommandSuperseded(RuntimeError):
+    """Comando pendente descartado porque um mais recente chegou para o mesmo dispositivo."""
+
+
+class LatestWinsQueue:
+    """Fila por dispositivo que mantém apenas o comando pendente mais recente.
+
+    Enquanto uma requisição está em andamento para um dispositivo, novos
+    comandos aguardam; se outro comando chegar antes da vez deles, o anterior é
+    descartado e seu chamador recebe :class:`CommandSuperseded`.
+    """
+
+    def __init__(self) -> None:
+        self._busy: Set[str] = set()
+        self._waiting: Dict[str, asyncio.Future[None]] = {}
+        self._dropped: Dict[str, int] = defaultdict(int)
+
+    @property
+    def in_flight(self) -> Set[str]:
+        """Dispositivos com uma requisição em andamento."""
+        return set(self._busy)
+
+    @property
+    def dropped(self) -> Dict[str, int]:
+        """Quantidade de comandos descartados por dispositivo."""
+        return dict(self._dropped)
+
+    @property
+    def total_dropped(self) -> int:
+        return sum(self._dropped.values())
+
+    async def submit(self, key: str, factory: Callable[[], Awaitable[T]]) -> T:
+        """Executa ``factory()`` quando for a vez deste comando em ``key``.
+
+        Levanta :class:`CommandSuperseded` se um comando mais novo para o mesmo
+        dispositivo substituir este antes de ser enviado.
+        """
+        if key in self._busy:
+            await self._wait_turn(key)
+        else:
+            self._busy.add(key)
+
+        try:
+            return await factory()
+        finally:
+            self._release(key)
+
+    async def _wait_turn(self, key: str) -> None:
+        turn: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        previous = self._waiting.get(key)
+        if previous is not None and not previous.done():
+            self._dropped[key] += 1
+            previous.set_exception(
+                CommandSuperseded(f"Comando para {key} substituído por um mais recente")
+            )
+            _LOGGER.debug(
+                "Comando pendente para %s descartado (%d descartados)",
+                key,
+                self._dropped[key],
+            )
+        self._waiting[key] = turn
+
+        try:
+            await turn
+        except asyncio.CancelledError:
+            if turn.done() and not turn.cancelled() and turn.exception() is None:
+                # a vez já tinha sido concedida: repassa para o próximo
+                self._release(key)
+            elif self._waiting.get(key) is turn:
+                del self._waiting[key]
+            raise
+
+    def _release(self, key: str) -> None:
+        turn = self._waiting.pop(key, None)
+        if turn is None or turn.done():
+            self._busy.discard(key)
+            return
+        # a posse do dispositivo passa direto para o comando mais recente
+        turn.set_result(None)
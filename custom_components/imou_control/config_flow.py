@@ -6,7 +6,28 @@ from homeassistant import config_entries
 from homeassistant.core import callback
 from homeassistant.helpers import config_validation as cv
 
-from .const import DOMAIN, CONF_APP_ID, CONF_APP_SECRET, CONF_URL_BASE
+from .const import (
+    DOMAIN,
+    CONF_APP_ID,
+    CONF_APP_SECRET,
+    CONF_URL_BASE,
+    CONF_RATE_LIMIT,
+    CONF_RATE_BURST,
+    CONF_MONTHLY_BUDGET,
+    CONF_RESCAN_INTERVAL,
+    CONF_BULK_CONCURRENCY,
+    CONF_DEDUP_EPSILON,
+    CONF_DEDUP_TTL,
+    CONF_KEEP_WARM,
+    DEFAULT_RATE_LIMIT,
+    DEFAULT_RATE_BURST,
+    DEFAULT_MONTHLY_BUDGET,
+    DEFAULT_RESCAN_INTERVAL,
+    DEFAULT_BULK_CONCURRENCY,
+    DEFAULT_DEDUP_EPSILON,
+    DEFAULT_DEDUP_TTL,
+    DEFAULT_KEEP_WARM,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -21,6 +42,11 @@ class ImouControlConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     """Fluxo mínimo e robusto para Imou Control."""
     VERSION = 1
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(config_entry: config_entries.ConfigEntry):
+        return ImouControlOptionsFlow()
+
     async def async_step_user(self, user_input: Dict[str, Any] | None = None):
         try:
             # Permite apenas 1 entrada
@@ -48,3 +74,48 @@ class ImouControlConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 data_schema=DATA_SCHEMA,
                 errors={"base": "unexpected_error"},
             )
+
+
+class ImouControlOptionsFlow(config_entries.OptionsFlow):
+    """Ajustes de desempenho da integração."""
+
+    async def async_step_init(self, user_input: Dict[str, Any] | None = None):
+        if user_input is not None:
+            return self.async_create_entry(title="", data=user_input)
+
+        options = self.config_entry.options
+        schema = vol.Schema({
+            vol.Required(
+                CONF_RATE_LIMIT,
+                default=options.get(CONF_RATE_LIMIT, DEFAULT_RATE_LIMIT),
+            ): vol.All(vol.Coerce(float), vol.Range(min=0)),
+            vol.Required(
+                CONF_RATE_BURST,
+                default=options.get(CONF_RATE_BURST, DEFAULT_RATE_BURST),
+            ): vol.All(vol.Coerce(int), vol.Range(min=1)),
+            vol.Required(
+                CONF_MONTHLY_BUDGET,
+                default=options.get(CONF_MONTHLY_BUDGET, DEFAULT_MONTHLY_BUDGET),
+            ): vol.All(vol.Coerce(int), vol.Range(min=0)),
+            vol.Required(
+                CONF_RESCAN_INTERVAL,
+                default=options.get(CONF_RESCAN_INTERVAL, DEFAULT_RESCAN_INTERVAL),
+            ): vol.All(vol.Coerce(int), vol.Range(min=0)),
+            vol.Required(
+                CONF_BULK_CONCURRENCY,
+                default=options.get(CONF_BULK_CONCURRENCY, DEFAULT_BULK_CONCURRENCY),
+            ): vol.All(vol.Coerce(int), vol.Range(min=1)),
+            vol.Required(
+                CONF_DEDUP_EPSILON,
+                default=options.get(CONF_DEDUP_EPSILON, DEFAULT_DEDUP_EPSILON),
+            ): vol.All(vol.Coerce(float), vol.Range(min=0, max=1)),
+            vol.Required(
+                CONF_DEDUP_TTL,
+                default=options.get(CONF_DEDUP_TTL, DEFAULT_DEDUP_TTL),
+            ): vol.All(vol.Coerce(float), vol.Range(min=0)),
+            vol.Required(
+                CONF_KEEP_WARM,
+                default=options.get(CONF_KEEP_WARM, DEFAULT_KEEP_WARM),
+            ): vol.All(vol.Coerce(int), vol.Range(min=0)),
+        })
+        return self.async_show_form(step_id="init", data_schema=schema)
@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import ssl
+import time
+from types import SimpleNamespace
+from typing import Any, Dict, Optional
+
+import aiohttp
+
+from .const import (
+    DEFAULT_CONNECTIONS_PER_HOST,
+    DEFAULT_KEEPALIVE_TIMEOUT,
+    DEFAULT_KEEP_WARM,
+    DNS_CACHE_TTL,
+)
+from .utils import TaskFactory
+
+_LOGGER = logging.getLogger(__name__)
+
+# a conexão precisa ficar aberta um pouco além do intervalo do keep-warm
+_KEEP_WARM_MARGIN = 15.0
+
+
+class ConnectionPool:
+    """Sessão aiohttp própria para o host da OpenAPI.
+
+    O ``TCPConnector`` mantém as conexões abertas (keep-alive) e guarda o DNS
+    em cache, então comandos seguidos não pagam um novo handshake TCP/TLS.
+    Com ``keep_warm`` > 0, uma requisição HEAD à raiz do host (fora da
+    OpenAPI, não conta na cota) é feita quando a conexão fica ociosa por esse
+    tempo. As contagens de conexões novas e reaproveitadas vêm de um
+    ``TraceConfig``.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        *,
+        ssl_context: Optional[ssl.SSLContext] = None,
+        limit_per_host: int = DEFAULT_CONNECTIONS_PER_HOST,
+        keepalive_timeout: float = DEFAULT_KEEPALIVE_TIMEOUT,
+        keep_warm: float = DEFAULT_KEEP_WARM,
+    ) -> None:
+        self._base_url = base_url.rstrip("/")
+        self._ssl_context = ssl_context
+        self._limit_per_host = limit_per_host
+        self._keep_warm = keep_warm
+        if keep_warm > 0:
+            keepalive_timeout = max(keepalive_timeout, keep_warm + _KEEP_WARM_MARGIN)
+        self._keepalive_timeout = keepalive_timeout
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._warm_task: Optional[asyncio.Task[None]] = None
+        self._last_request = 0.0
+        self._created = 0
+        self._reused = 0
+        self._requests = 0
+        self._warm_probes = 0
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        """Sessão do pool, criada no primeiro uso."""
+        if self._session is None:
+            trace = aiohttp.TraceConfig()
+            trace.on_connection_create_end.append(self._on_connection_created)
+            trace.on_connection_reuseconn.append(self._on_connection_reused)
+            trace.on_request_end.append(self._on_request_done)
+            trace.on_request_exception.append(self._on_request_done)
+            connector = aiohttp.TCPConnector(
+                limit_per_host=self._limit_per_host,
+                keepalive_timeout=self._keepalive_timeout,
+                ttl_dns_cache=DNS_CACHE_TTL,
+                ssl=self._ssl_context if self._ssl_context is not None else True,
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector, trace_configs=[trace]
+            )
+        return self._session
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        """Conexões abertas e reaproveitadas desde a criação do pool."""
+        connections = self._created + self._reused
+        return {
+            "requests": self._requests,
+            "connections_created": self._created,
+            "connections_reused": self._reused,
+            "reuse_ratio": round(self._reused / connections, 3) if connections else None,
+            "keep_warm_interval": self._keep_warm,
+            "keep_warm_probes": self._warm_probes,
+        }
+
+    def async_start_keep_warm(self, create_task: Optional[TaskFactory] = None) -> None:
+        """Inicia o keep-warm, se configurado (``create_task`` como no TokenManager)."""
+        if self._keep_warm <= 0:
+            return
+        if self._warm_task is not None and not self._warm_task.done():
+            return
+        name = "imou_control keep-warm"
+        if create_task is None:
+            self._warm_task = asyncio.get_running_loop().create_task(
+                self._keep_warm_loop(), name=name
+            )
+        else:
+            self._warm_task = create_task(self._keep_warm_loop(), name)
+
+    async def async_close(self) -> None:
+        """Para o keep-warm e fecha a sessão com todas as conexões."""
+        task, self._warm_task = self._warm_task, None
+        if task is not None and not task.done():
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        session, self._session = self._session, None
+        if session is not None:
+            await session.close()
+
+    async def _keep_warm_loop(self) -> None:
+        while True:
+            idle = time.monotonic() - self._last_request
+            if idle < self._keep_warm:
+                await asyncio.sleep(self._keep_warm - idle)
+                continue
+            self._warm_probes += 1
+            try:
+                async with self.session.head(
+                    f"{self._base_url}/",
+                    allow_redirects=False,
+                    timeout=aiohttp.ClientTimeout(total=10),
+                ):
+                    pass
+            except (aiohttp.ClientError, asyncio.TimeoutError) as err:
+                _LOGGER.debug("Keep-warm de %s falhou: %s", self._base_url, err)
+                # não insiste no mesmo instante se o host estiver fora do ar
+                self._last_request = time.monotonic()
+
+    async def _on_connection_created(
+        self, _session: aiohttp.ClientSession, _ctx: SimpleNamespace, _params: Any
+    ) -> None:
+        self._created += 1
+
+    async def _on_connection_reused(
+        self, _session: aiohttp.ClientSession, _ctx: SimpleNamespace, _params: Any
+    ) -> None:
+        self._reused += 1
+
+    async def _on_request_done(
+        self, _session: aiohttp.ClientSession, _ctx: SimpleNamespace, _params: Any
+    ) -> None:
+        self._requests += 1
+        self._last_request = time.monotonic()
@@ -5,10 +5,105 @@ CONF_APP_ID = "app_id"
 CONF_APP_SECRET = "app_secret"
 CONF_URL_BASE = "url_base"
 
+# Opções ajustáveis após a configuração (options flow)
+CONF_RATE_LIMIT = "rate_limit"
+CONF_RATE_BURST = "rate_burst"
+CONF_MONTHLY_BUDGET = "monthly_budget"
+CONF_RESCAN_INTERVAL = "rescan_interval"
+CONF_BULK_CONCURRENCY = "bulk_concurrency"
+CONF_DEDUP_EPSILON = "dedup_epsilon"
+CONF_DEDUP_TTL = "dedup_ttl"
+CONF_KEEP_WARM = "keep_warm"
+
 # Endpoints padrão da Open API (relativos ao url_base)
 TOKEN_ENDPOINT = "/openapi/accessToken"
 PTZ_LOCATION_ENDPOINT = "/openapi/controlLocationPTZ"
 DEVICE_LIST_ENDPOINT = "/openapi/deviceOpenList"
+PTZ_MOVE_ENDPOINT = "/openapi/controlMovePTZ"
+
+# Valores de 'operation' de controlMovePTZ (movimento contínuo) por direção
+PTZ_OPERATIONS = {
+    "up": 0,
+    "down": 1,
+    "left": 2,
+    "right": 3,
+    "up_left": 4,
+    "down_left": 5,
+    "up_right": 6,
+    "down_right": 7,
+    "zoom_in": 8,
+    "zoom_out": 9,
+    "stop": 10,
+}
+
+# Duração (ms) de cada movimento contínuo: padrão e limites aceitos pelos serviços
+DEFAULT_MOVE_DURATION = 500
+MIN_MOVE_DURATION = 100
+MAX_MOVE_DURATION = 10000
+
+# Tamanho máximo de página aceito por deviceOpenList
+DEVICE_PAGE_SIZE = 128
+
+# Tempo máximo (s) de cada requisição à OpenAPI
+DEFAULT_REQUEST_TIMEOUT = 10.0
+
+# Conexões com o host da OpenAPI: máximo simultâneo, tempo (s) que uma conexão
+# ociosa fica aberta e validade (s) do cache de DNS
+DEFAULT_CONNECTIONS_PER_HOST = 10
+DEFAULT_KEEPALIVE_TIMEOUT = 60.0
+DNS_CACHE_TTL = 300
+
+# Intervalo (s) da requisição que mantém uma conexão aberta quando ociosa (0 = desativado)
+DEFAULT_KEEP_WARM = 0
+
+# Renovação antecipada do token (segundos antes de expirar + variação aleatória)
+DEFAULT_TOKEN_RENEW_LEAD = 300.0
+DEFAULT_TOKEN_RENEW_JITTER = 60.0
+
+# Limite de requisições à OpenAPI (requisições/s e rajada máxima)
+DEFAULT_RATE_LIMIT = 5.0
+DEFAULT_RATE_BURST = 10
+
+# Disjuntor por endpoint: falhas seguidas até abrir e segundos até a chamada de prova
+DEFAULT_BREAKER_THRESHOLD = 5
+DEFAULT_BREAKER_RESET = 30.0
+
+# Orçamento mensal de chamadas (0 = sem limite)
+DEFAULT_MONTHLY_BUDGET = 0
+
+# Intervalo (minutos) da nova leitura periódica da lista de dispositivos (0 = desativado)
+DEFAULT_RESCAN_INTERVAL = 0
+
+# Leituras completas seguidas sem a câmera antes de removê-la do HA
+DEVICE_REMOVAL_SCANS = 2
+
+# Câmeras acionadas em paralelo pelos serviços em lote
+DEFAULT_BULK_CONCURRENCY = 4
+
+# Movimentos a menos de epsilon do último alvo enviado são ignorados; após o TTL (s)
+# o alvo é considerado desatualizado (a câmera pode ter sido movida fora do HA)
+DEFAULT_DEDUP_EPSILON = 0.005
+DEFAULT_DEDUP_TTL = 300.0
+
+# Intervalo mínimo (s) entre atualizações dos sensores de uso da API
+USAGE_NOTIFY_INTERVAL = 5.0
+
+# Atraso (s) para agrupar gravações de presets numa única escrita
+PRESETS_SAVE_DELAY = 10.0
+
+# Tempo padrão (s) em cada preset de uma ronda e o mínimo aceito
+DEFAULT_TOUR_DWELL = 10.0
+MIN_TOUR_DWELL = 1.0
+
+# Espera (s) após um passo de ronda com falha, dobrando a cada falha seguida
+TOUR_RETRY_DELAY = 30.0
+TOUR_MAX_RETRY_DELAY = 300.0
+
+# Velocidade aproximada dos eixos h/v/z (unidades normalizadas por segundo)
+DEFAULT_AXIS_SPEEDS = (0.6, 1.0, 0.3)
 
 # Nome do evento disparado quando um preset é chamado
 EVENT_PRESET_CALLED = "imou_control_preset_called"
+
+# Sinal (dispatcher) com os IDs de câmeras adicionadas após o setup; formatado com o entry_id
+SIGNAL_DEVICES_ADDED = "imou_control_devices_added_{}"
@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# Resultado de DeviceDirectory.apply
+DEVICE_ADDED = "added"
+DEVICE_RENAMED = "renamed"
+
+
+def device_names(info: Dict[str, Any]) -> Tuple[str, str]:
+    """Nome exibido ("Imou <nome>") e nome original de uma entrada de deviceOpenList."""
+    raw_name = info.get("deviceName") or info["deviceId"]
+    return f"Imou {raw_name}", raw_name
+
+
+def cache_payload(devices_info: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Campos de cada câmera guardados no cache da lista de dispositivos."""
+    return [
+        {"deviceId": info.get("deviceId"), "deviceName": info.get("deviceName")}
+        for info in devices_info
+        if info.get("deviceId")
+    ]
+
+
+class DeviceDirectory:
+    """Câmeras conhecidas da conta, indexadas por ID e por nome.
+
+    ``devices`` e ``by_name`` são os mesmos dicionários usados pelas
+    plataformas e serviços; ``presets`` guarda os presets de todas as câmeras
+    (inclusive as ainda não carregadas) e é compartilhado com cada entrada.
+    """
+
+    def __init__(
+        self,
+        devices: Dict[str, Dict[str, Any]],
+        by_name: Dict[str, str],
+        presets: Dict[str, Dict[str, Any]],
+    ) -> None:
+        self.devices = devices
+        self.by_name = by_name
+        self._presets = presets
+        # leituras completas seguidas em que a câmera não apareceu
+        self._missing: Dict[str, int] = {}
+
+    def resolve(self, device: str) -> Optional[str]:
+        """ID da câmera a partir do ID, do nome exibido ou do nome original."""
+        if device in self.devices:
+            return device
+        return self.by_name.get(device)
+
+    def apply(self, info: Dict[str, Any]) -> Tuple[Optional[str], Optional[str]]:
+        """Registra ou renomeia uma câmera.
+
+        Devolve ``(device_id, DEVICE_ADDED | DEVICE_RENAMED | None)``; o ID é
+        ``None`` para entradas sem ``deviceId``.
+        """
+        device_id = info.get("deviceId")
+        if not device_id:
+            return None, None
+        name, raw_name = device_names(info)
+
+        dev = self.devices.get(device_id)
+        if dev is not None:
+            if dev["name"] == name:
+                return device_id, None
+            self._drop_names(device_id)
+            dev["name"] = name
+            self._index(device_id, name, raw_name)
+            return device_id, DEVICE_RENAMED
+
+        self.devices[device_id] = {
+            "name": name,
+            "presets": self._presets.setdefault(device_id, {}),
+            "last_preset": None,
+            "coords": {"h": 0.0, "v": 0.0, "z": 0.0},
+            "number_entities": {},
+            "select_entity": None,
+            "preset_name": "",
+        }
+        self._index(device_id, name, raw_name)
+        return device_id, DEVICE_ADDED
+
+    def forget_preset(self, device_id: str) -> bool:
+        """Esquece o preset ativo: a câmera saiu dele por outro comando.
+
+        Assim o próximo ``call_preset`` para esse preset volta a mover a
+        câmera, e o seletor deixa de mostrá-lo. Devolve se havia um.
+        """
+        dev = self.devices.get(device_id)
+        if dev is None or dev["last_preset"] is None:
+            return False
+        dev["last_preset"] = None
+        select = dev["select_entity"]
+        if select is not None:
+            select.async_write_ha_state()
+        return True
+
+    def stale_devices(self, listed_ids: Iterable[str], scans: int) -> List[str]:
+        """Câmeras ausentes de ``scans`` leituras completas seguidas da lista.
+
+        ``listed_ids`` deve vir de uma lista completa da nuvem. Uma câmera que
+        volta a aparecer zera a contagem.
+        """
+        listed = set(listed_ids)
+        stale: List[str] = []
+        for device_id in self.devices:
+            if device_id in listed:
+                self._missing.pop(device_id, None)
+                continue
+            misses = self._missing[device_id] = self._missing.get(device_id, 0) + 1
+            if misses >= scans:
+                stale.append(device_id)
+        return stale
+
+    def remove(self, device_id: str) -> bool:
+        """Esquece a câmera; os presets dela continuam guardados."""
+        self._missing.pop(device_id, None)
+        if self.devices.pop(device_id, None) is None:
+            return False
+        self._drop_names(device_id)
+        return True
+
+    def _index(self, device_id: str, name: str, raw_name: str) -> None:
+        self.by_name[name] = device_id
+        self.by_name[raw_name] = device_id
+
+    def _drop_names(self, device_id: str) -> None:
+        for key in [k for k, v in self.by_name.items() if v == device_id]:
+            self.by_name.pop(key)
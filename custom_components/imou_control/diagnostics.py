@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import json
+from datetime import datetime, timezone
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import CONF_APP_ID, CONF_APP_SECRET, DOMAIN
+from .metrics import Sample
+from .presets import encode_presets
+from .rate_limit import PRIORITY_BACKGROUND, PRIORITY_INTERACTIVE
+
+TO_REDACT = {CONF_APP_ID, CONF_APP_SECRET}
+
+_PRIORITY_NAMES = {PRIORITY_INTERACTIVE: "interactive", PRIORITY_BACKGROUND: "background"}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Estado do caminho de comandos para investigar lentidão.
+
+    O token e as credenciais nunca aparecem: só o prazo e as renovações.
+    """
+    data = hass.data[DOMAIN][entry.entry_id]
+    tm = data["tm"]
+    api = data["api"]
+    usage = data["usage"]
+    metrics = data["metrics"]
+    limiter = data["limiter"]
+    commands = data["commands"]
+    presets = data["presets"]
+
+    expires_in = tm.expires_in
+    return {
+        "entry": {
+            "data": async_redact_data(dict(entry.data), TO_REDACT),
+            "options": dict(entry.options),
+        },
+        "token": {
+            "valid": expires_in is not None and expires_in > 0,
+            "expires_in": None if expires_in is None else round(expires_in),
+            "refresh_count": tm.generation,
+        },
+        "usage": {
+            "period": usage.period,
+            "count": usage.count,
+            "skipped": usage.skipped,
+            "budget": usage.budget,
+            "projected": usage.projected(),
+            "by_endpoint": usage.by_endpoint,
+            "by_device": usage.by_device,
+        },
+        "latency": {
+            "endpoints": metrics.summary(),
+            "recent": [_sample(s) for s in metrics.recent],
+            "recent_errors": [_sample(s) for s in metrics.recent_errors],
+        },
+        "requests": {
+            "in_flight": sorted(commands.in_flight),
+            "superseded": commands.dropped,
+            "rate_limit_waiting": {
+                _PRIORITY_NAMES.get(priority, str(priority)): count
+                for priority, count in limiter.waiting.items()
+            },
+            "rate_limit_preempted": limiter.preempted,
+            "breakers": api.breakers,
+        },
+        "connections": data["pool"].stats,
+        "positions": {
+            "last_sent": {
+                device_id: {"h": h, "v": v, "z": z}
+                for device_id, (h, v, z) in api.last_sent.items()
+            },
+            "skipped_moves": api.skipped_moves,
+        },
+        "tours": data["tours"].status(),
+        "stores": {
+            "devices": len(data["devices"]),
+            "presets": sum(len(device_presets) for device_presets in presets.values()),
+            "presets_bytes": len(json.dumps(encode_presets(presets))),
+            "presets_dirty": data["presets_dirty"],
+        },
+    }
+
+
+def _sample(sample: Sample) -> dict[str, Any]:
+    return {
+        "at": datetime.fromtimestamp(sample.at, timezone.utc).isoformat(),
+        "endpoint": sample.endpoint,
+        "latency_ms": round(sample.latency_ms, 1),
+        "error": sample.error,
+    }
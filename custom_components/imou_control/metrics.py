@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+import math
+import time
+from array import array
+from collections import deque
+from typing import Any, Deque, Dict, List, NamedTuple, Optional
+
+# Limites superiores dos baldes, em ms: 4 por oitava, de 1 ms a ~65 s. Um
+# balde extra, depois do último limite, recebe as chamadas mais lentas.
+_BUCKETS_PER_OCTAVE = 4
+BUCKET_BOUNDS_MS = tuple(2 ** (i / _BUCKETS_PER_OCTAVE) for i in range(16 * 4 + 1))
+
+# Amostras (e erros) mais recentes guardadas para o diagnóstico
+RECENT_SAMPLES = 50
+
+
+class LatencyHistogram:
+    """Latências de um endpoint em baldes fixos de escala logarítmica.
+
+    Registrar uma amostra custa um ``log2`` e um incremento; os percentis são
+    o limite superior do balde (erro de até ~19%).
+    """
+
+    __slots__ = ("_counts", "count", "errors", "max_ms")
+
+    def __init__(self) -> None:
+        self._counts = array("I", bytes(4 * (len(BUCKET_BOUNDS_MS) + 1)))
+        self.count = 0
+        self.errors = 0
+        self.max_ms = 0.0
+
+    def record(self, latency_ms: float, error: bool = False) -> None:
+        if latency_ms <= BUCKET_BOUNDS_MS[0]:
+            index = 0
+        else:
+            index = min(
+                math.ceil(math.log2(latency_ms) * _BUCKETS_PER_OCTAVE),
+                len(BUCKET_BOUNDS_MS),
+            )
+        self._counts[index] += 1
+        self.count += 1
+        if error:
+            self.errors += 1
+        if latency_ms > self.max_ms:
+            self.max_ms = latency_ms
+
+    def percentile(self, fraction: float) -> Optional[float]:
+        """Latência (ms) abaixo da qual fica ``fraction`` das amostras."""
+        if not self.count:
+            return None
+        target = max(math.ceil(fraction * self.count), 1)
+        seen = 0
+        for index, bucket in enumerate(self._counts):
+            seen += bucket
+            if seen >= target:
+                if index < len(BUCKET_BOUNDS_MS):
+                    return min(BUCKET_BOUNDS_MS[index], self.max_ms)
+                return self.max_ms
+        return self.max_ms
+
+    @property
+    def error_rate(self) -> Optional[float]:
+        """Fração das chamadas que falharam (``None`` sem amostras)."""
+        if not self.count:
+            return None
+        return self.errors / self.count
+
+
+class Sample(NamedTuple):
+    """Uma chamada à OpenAPI: quando terminou, quanto levou e o erro, se houve."""
+
+    at: float
+    endpoint: str
+    latency_ms: float
+    error: Optional[str]
+
+
+class ApiMetrics:
+    """Histogramas de latência por endpoint e as últimas chamadas/erros.
+
+    Os números valem desde o carregamento da integração e não são persistidos.
+    """
+
+    def __init__(self, recent: int = RECENT_SAMPLES) -> None:
+        self._histograms: Dict[str, LatencyHistogram] = {}
+        self._recent: Deque[Sample] = deque(maxlen=recent)
+        self._errors: Deque[Sample] = deque(maxlen=recent)
+
+    def record(self, endpoint: str, seconds: float, error: Optional[str] = None) -> None:
+        """Registra uma chamada de ``seconds`` segundos; ``error`` descreve a falha."""
+        latency_ms = seconds * 1000
+        histogram = self._histograms.get(endpoint)
+        if histogram is None:
+            histogram = self._histograms[endpoint] = LatencyHistogram()
+        histogram.record(latency_ms, error is not None)
+
+        sample = Sample(time.time(), endpoint, latency_ms, error)
+        self._recent.append(sample)
+        if error is not None:
+            self._errors.append(sample)
+
+    def histogram(self, endpoint: str) -> Optional[LatencyHistogram]:
+        return self._histograms.get(endpoint)
+
+    @property
+    def recent(self) -> List[Sample]:
+        """Últimas chamadas, da mais antiga para a mais nova."""
+        return list(self._recent)
+
+    @property
+    def recent_errors(self) -> List[Sample]:
+        """Últimas chamadas que falharam, da mais antiga para a mais nova."""
+        return list(self._errors)
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        """Contagem, erros e p50/p95/p99 (ms) de cada endpoint."""
+        return {
+            endpoint: {
+                "count": histogram.count,
+                "errors": histogram.errors,
+                "p50_ms": _round_ms(histogram.percentile(0.50)),
+                "p95_ms": _round_ms(histogram.percentile(0.95)),
+                "p99_ms": _round_ms(histogram.percentile(0.99)),
+                "max_ms": round(histogram.max_ms, 1),
+            }
+            for endpoint, histogram in self._histograms.items()
+        }
+
+
+def _round_ms(value: Optional[float]) -> Optional[float]:
+    return None if value is None else round(value, 1)
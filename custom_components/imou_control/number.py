@@ -1,10 +1,11 @@
 from __future__ import annotations
 
 from homeassistant.components.number import NumberEntity, NumberMode
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity import DeviceInfo
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 
-from .const import DOMAIN
+from .const import DOMAIN, SIGNAL_DEVICES_ADDED
 
 class ImouAxisNumber(NumberEntity):
     def __init__(self, hass: HomeAssistant, device_id: str, axis: str, data: dict):
@@ -40,12 +41,23 @@ class ImouAxisNumber(NumberEntity):
 
 async def async_setup_entry(hass: HomeAssistant, entry, async_add_entities):
     data = hass.data[DOMAIN][entry.entry_id]
-    entities = []
-    for device_id, dev in data["devices"].items():
-        number_h = ImouAxisNumber(hass, device_id, "h", dev)
-        number_v = ImouAxisNumber(hass, device_id, "v", dev)
-        dev["number_entities"]["h"] = number_h
-        dev["number_entities"]["v"] = number_v
-        entities.append(number_h)
-        entities.append(number_v)
-    async_add_entities(entities)
+
+    @callback
+    def _async_add_devices(device_ids: list[str]) -> None:
+        entities = []
+        for device_id in device_ids:
+            dev = data["devices"][device_id]
+            number_h = ImouAxisNumber(hass, device_id, "h", dev)
+            number_v = ImouAxisNumber(hass, device_id, "v", dev)
+            dev["number_entities"]["h"] = number_h
+            dev["number_entities"]["v"] = number_v
+            entities.append(number_h)
+            entities.append(number_v)
+        async_add_entities(entities)
+
+    _async_add_devices(list(data["devices"]))
+    entry.async_on_unload(
+        async_dispatcher_connect(
+            hass, SIGNAL_DEVICES_ADDED.format(entry.entry_id), _async_add_devices
+        )
+    )
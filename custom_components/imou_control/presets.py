@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+from typing import Any, Dict, Mapping, Sequence, Tuple
+
+Coords = Tuple[float, float, float]
+DevicePresets = Dict[str, Dict[str, Coords]]
+
+# v1: {device_id: {nome: [h, v, z]}}
+# v2: {"devices": {device_id: [[nome, h, v, z], ...]}}
+PRESETS_STORAGE_VERSION = 2
+
+
+def encode_presets(presets: Mapping[str, Mapping[str, Sequence[float]]]) -> Dict[str, Any]:
+    """Serializa os presets no formato compacto (uma lista por câmera).
+
+    Câmeras sem presets são omitidas.
+    """
+    return {
+        "devices": {
+            device_id: [
+                [name, float(coords[0]), float(coords[1]), float(coords[2])]
+                for name, coords in device_presets.items()
+            ]
+            for device_id, device_presets in presets.items()
+            if device_presets
+        }
+    }
+
+
+def decode_presets(data: Mapping[str, Any] | None) -> DevicePresets:
+    """Lê o formato compacto de volta para ``{device_id: {nome: (h, v, z)}}``."""
+    if not data:
+        return {}
+    return {
+        device_id: {row[0]: (row[1], row[2], row[3]) for row in rows}
+        for device_id, rows in data.get("devices", {}).items()
+    }
+
+
+def migrate_presets(old_major_version: int, old_data: Any) -> Dict[str, Any]:
+    """Converte dados de versões anteriores para o formato atual."""
+    if old_major_version == 1:
+        return encode_presets(
+            {
+                device_id: {
+                    name: (coords[0], coords[1], coords[2] if len(coords) > 2 else 0.0)
+                    for name, coords in device_presets.items()
+                }
+                for device_id, device_presets in (old_data or {}).items()
+            }
+        )
+    raise NotImplementedError(
+        f"Versão {old_major_version} do armazenamento de presets não suportada"
+    )
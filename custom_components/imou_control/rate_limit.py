@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import deque
+from typing import Deque, Dict, Optional, Tuple
+
+# Faixas de prioridade: comandos do usuário (serviços, botões, select) passam
+# à frente das chamadas de segundo plano (lista de dispositivos, polling).
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BACKGROUND = 1
+
+_Waiter = Tuple["asyncio.Future[None]", Optional[str]]
+
+
+class RequestPreempted(RuntimeError):
+    """Chamada de baixa prioridade cancelada por um comando interativo do mesmo dispositivo."""
+
+
+class PriorityRateLimiter:
+    """Token bucket com faixas de prioridade para as chamadas à OpenAPI.
+
+    ``rate`` é o número de requisições por segundo e ``burst`` a quantidade
+    máxima acumulada. ``rate <= 0`` desativa o limite.
+    """
+
+    def __init__(self, rate: float, burst: int) -> None:
+        self._rate = float(rate)
+        self._burst = max(int(burst), 1)
+        self._tokens = float(self._burst)
+        self._updated = time.monotonic()
+        self._lanes: Dict[int, Deque[_Waiter]] = {
+            PRIORITY_INTERACTIVE: deque(),
+            PRIORITY_BACKGROUND: deque(),
+        }
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._preempted = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self._rate > 0
+
+    @property
+    def preempted(self) -> int:
+        """Quantidade de chamadas de segundo plano canceladas por preempção."""
+        return self._preempted
+
+    @property
+    def waiting(self) -> Dict[int, int]:
+        return {
+            priority: sum(1 for fut, _ in lane if not fut.done())
+            for priority, lane in self._lanes.items()
+        }
+
+    async def acquire(
+        self, priority: int = PRIORITY_BACKGROUND, key: Optional[str] = None
+    ) -> None:
+        """Aguarda uma vaga para enviar uma requisição.
+
+        Um pedido interativo para ``key`` cancela, com :class:`RequestPreempted`,
+        os pedidos de segundo plano que ainda aguardam para o mesmo ``key``.
+        """
+        if not self.enabled:
+            return
+
+        if priority == PRIORITY_INTERACTIVE and key is not None:
+            self._preempt(key)
+
+        self._refill()
+        if self._tokens >= 1 and not self._has_waiters():
+            self._tokens -= 1
+            return
+
+        fut: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        self._lanes.setdefault(priority, deque()).append((fut, key))
+        if self._timer is None:
+            self._dispatch()
+        await fut
+
+    def _preempt(self, key: str) -> None:
+        for priority, lane in self._lanes.items():
+            if priority == PRIORITY_INTERACTIVE:
+                continue
+            for fut, waiter_key in lane:
+                if waiter_key == key and not fut.done():
+                    self._preempted += 1
+                    fut.set_exception(
+                        RequestPreempted(f"Chamada para {key} preterida por comando interativo")
+                    )
+
+    def _has_waiters(self) -> bool:
+        return any(not fut.done() for lane in self._lanes.values() for fut, _ in lane)
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        elapsed = now - self._updated
+        self._updated = now
+        self._tokens = min(float(self._burst), self._tokens + elapsed * self._rate)
+
+    def _next_waiter(self) -> Optional[asyncio.Future[None]]:
+        for priority in sorted(self._lanes):
+            lane = self._lanes[priority]
+            while lane:
+                fut, _key = lane.popleft()
+                if not fut.done():
+                    return fut
+        return None
+
+    def _dispatch(self) -> None:
+        self._timer = None
+        self._refill()
+        while self._tokens >= 1:
+            fut = self._next_waiter()
+            if fut is None:
+                return
+            self._tokens -= 1
+            fut.set_result(None)
+
+        if self._has_waiters() and self._timer is None:
+            delay = (1 - self._tokens) / self._rate
+            self._timer = asyncio.get_running_loop().call_later(delay, self._dispatch)
@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import random
+import time
+from dataclasses import dataclass
+
+
+class TransientApiError(RuntimeError):
+    """Falha passageira (timeout, erro de conexão, 5xx/429) que pode ser repetida."""
+
+
+class CircuitOpenError(RuntimeError):
+    """Endpoint com circuito aberto: a chamada falha de imediato sem ir à nuvem."""
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """Backoff exponencial com jitter completo para endpoints idempotentes."""
+
+    attempts: int = 3
+    base_delay: float = 0.5
+    max_delay: float = 5.0
+
+    def delay(self, attempt: int) -> float:
+        """Espera antes da tentativa ``attempt + 1`` (``attempt`` começa em 0)."""
+        cap = min(self.max_delay, self.base_delay * (2 ** attempt))
+        return random.uniform(0.0, cap)
+
+
+class CircuitBreaker:
+    """Disjuntor por endpoint.
+
+    Após ``failure_threshold`` falhas passageiras seguidas o circuito abre e as
+    chamadas falham na hora. Passado ``reset_timeout`` segundos, uma única
+    chamada de teste (half-open) é liberada: se der certo o circuito fecha, se
+    falhar volta a abrir.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0) -> None:
+        self._failure_threshold = max(int(failure_threshold), 1)
+        self._reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at = 0.0
+        self._state = self.CLOSED
+        self._probe_in_flight = False
+
+    @property
+    def state(self) -> str:
+        return self._state
+
+    @property
+    def failures(self) -> int:
+        return self._failures
+
+    def before_call(self) -> None:
+        """Levanta :class:`CircuitOpenError` se a chamada não deve ser feita agora."""
+        if self._state == self.CLOSED:
+            return
+        if self._state == self.OPEN:
+            remaining = self._opened_at + self._reset_timeout - time.monotonic()
+            if remaining > 0:
+                raise CircuitOpenError(
+                    f"Circuito aberto; nova tentativa em {remaining:.0f}s"
+                )
+            self._state = self.HALF_OPEN
+        if self._probe_in_flight:
+            raise CircuitOpenError("Circuito em teste; aguardando a chamada de prova")
+        self._probe_in_flight = True
+
+    def record_success(self) -> None:
+        self._failures = 0
+        self._state = self.CLOSED
+        self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        self._failures += 1
+        self._probe_in_flight = False
+        if self._state == self.HALF_OPEN or self._failures >= self._failure_threshold:
+            self._state = self.OPEN
+            self._opened_at = time.monotonic()
+
+    def release(self) -> None:
+        """Libera a chamada de prova sem resultado (ex.: cancelada)."""
+        self._probe_in_flight = False
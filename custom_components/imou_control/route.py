@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+from typing import Dict, List, Sequence, Tuple
+
+Coords = Tuple[float, float, float]
+AxisSpeeds = Tuple[float, float, float]
+
+
+def travel_time(a: Coords, b: Coords, speeds: AxisSpeeds) -> float:
+    """Tempo estimado (s) entre duas posições PTZ.
+
+    Os eixos se movem ao mesmo tempo, então o mais lento define a duração.
+    """
+    return max(abs(b[axis] - a[axis]) / speeds[axis] for axis in range(3))
+
+
+def route_time(
+    start: Coords, stops: Sequence[str], points: Dict[str, Coords], speeds: AxisSpeeds
+) -> float:
+    """Tempo total de deslocamento visitando ``stops`` na ordem dada."""
+    total = 0.0
+    current = start
+    for name in stops:
+        total += travel_time(current, points[name], speeds)
+        current = points[name]
+    return total
+
+
+def plan_route(
+    start: Coords, points: Dict[str, Coords], speeds: AxisSpeeds
+) -> List[str]:
+    """Ordena os presets para minimizar o deslocamento total a partir de ``start``.
+
+    A ordem de ``points`` é a ordem informada pelo usuário. A solução inicial
+    é a mais barata entre essa ordem e a do vizinho mais próximo, melhorada
+    com 2-opt (caminho aberto: o ponto de partida é fixo e não há volta ao
+    início). Como o 2-opt só aceita melhorias, o resultado nunca é pior que a
+    ordem informada.
+    """
+    if any(speed <= 0 for speed in speeds):
+        raise ValueError("As velocidades dos eixos devem ser positivas")
+
+    def cost(a: Coords, b: Coords) -> float:
+        return travel_time(a, b, speeds)
+
+    remaining = dict(points)
+    route: List[str] = []
+    current = start
+    while remaining:
+        name = min(remaining, key=lambda n: cost(current, remaining[n]))
+        route.append(name)
+        current = remaining.pop(name)
+
+    given = list(points)
+    if route_time(start, given, points, speeds) < route_time(start, route, points, speeds):
+        route = given
+
+    n = len(route)
+    improved = True
+    while improved:
+        improved = False
+        for i in range(n - 1):
+            prev = start if i == 0 else points[route[i - 1]]
+            for j in range(i + 1, n):
+                after = points[route[j + 1]] if j + 1 < n else None
+                before_cost = cost(prev, points[route[i]])
+                after_cost = cost(prev, points[route[j]])
+                if after is not None:
+                    before_cost += cost(points[route[j]], after)
+                    after_cost += cost(points[route[i]], after)
+                if after_cost < before_cost - 1e-9:
+                    route[i : j + 1] = reversed(route[i : j + 1])
+                    improved = True
+    return route
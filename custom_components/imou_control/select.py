@@ -1,10 +1,11 @@
 from __future__ import annotations
 
 from homeassistant.components.select import SelectEntity
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity import DeviceInfo
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 
-from .const import DOMAIN
+from .const import DOMAIN, SIGNAL_DEVICES_ADDED
 
 class ImouPresetSelect(SelectEntity):
     def __init__(self, hass: HomeAssistant, api, device_id: str, data: dict):
@@ -44,9 +45,20 @@ class ImouPresetSelect(SelectEntity):
 async def async_setup_entry(hass: HomeAssistant, entry, async_add_entities):
     data = hass.data[DOMAIN][entry.entry_id]
     api = data["api"]
-    entities = []
-    for device_id, dev in data["devices"].items():
-        ent = ImouPresetSelect(hass, api, device_id, dev)
-        dev["select_entity"] = ent
-        entities.append(ent)
-    async_add_entities(entities)
+
+    @callback
+    def _async_add_devices(device_ids: list[str]) -> None:
+        entities = []
+        for device_id in device_ids:
+            dev = data["devices"][device_id]
+            ent = ImouPresetSelect(hass, api, device_id, dev)
+            dev["select_entity"] = ent
+            entities.append(ent)
+        async_add_entities(entities)
+
+    _async_add_devices(list(data["devices"]))
+    entry.async_on_unload(
+        async_dispatcher_connect(
+            hass, SIGNAL_DEVICES_ADDED.format(entry.entry_id), _async_add_devices
+        )
+    )
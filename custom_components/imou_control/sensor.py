@@ -2,23 +2,37 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Callable
-
-from homeassistant.components.sensor import SensorEntity, SensorStateClass
+from typing import Any, Callable
+
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntity,
+    SensorStateClass,
+)
+from homeassistant.const import PERCENTAGE, EntityCategory, UnitOfTime
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity import DeviceInfo
 
-from .const import DOMAIN
+from .command_queue import LatestWinsQueue
+from .const import DOMAIN, PTZ_LOCATION_ENDPOINT, TOKEN_ENDPOINT
+from .metrics import ApiMetrics
 from .usage import ApiUsageTracker
 
+# Endpoints com sensores de latência, com o prefixo das translation keys
+_LATENCY_ENDPOINTS = ((PTZ_LOCATION_ENDPOINT, "ptz"), (TOKEN_ENDPOINT, "token"))
+_PERCENTILES = (("p50", 0.50), ("p95", 0.95), ("p99", 0.99))
+
 
 @dataclass
 class _UsageData:
     tracker: ApiUsageTracker
     entry_id: str
+    commands: LatestWinsQueue | None = None
 
 
 class ImouApiUsageSensor(SensorEntity):
+    # os detalhamentos mudam a cada chamada; ficam fora do histórico
+    _unrecorded_attributes = frozenset({"calls_by_endpoint", "calls_by_device"})
     _attr_has_entity_name = True
     _attr_translation_key = "api_usage"
     _attr_icon = "mdi:counter"
@@ -28,6 +42,7 @@ class ImouApiUsageSensor(SensorEntity):
     def __init__(self, data: _UsageData) -> None:
         self._tracker = data.tracker
         self._entry_id = data.entry_id
+        self._commands = data.commands
         self._remove_listener: Callable[[], None] | None = None
         self._attr_unique_id = f"{self._entry_id}_api_usage"
         self._attr_device_info = DeviceInfo(
@@ -52,8 +67,8 @@ class ImouApiUsageSensor(SensorEntity):
         return self._tracker.count
 
     @property
-    def extra_state_attributes(self) -> dict[str, str | None]:
-        attrs: dict[str, str | None] = {}
+    def extra_state_attributes(self) -> dict[str, Any]:
+        attrs: dict[str, Any] = {}
         period = self._tracker.period
         if period is not None:
             attrs["period"] = period
@@ -66,6 +81,14 @@ class ImouApiUsageSensor(SensorEntity):
         if last_call:
             attrs["last_call"] = self._format_dt(last_call)
 
+        if self._commands is not None:
+            attrs["superseded_commands"] = self._commands.total_dropped
+
+        attrs["skipped_moves"] = self._tracker.skipped
+        attrs["calls_by_endpoint"] = self._tracker.by_endpoint
+        attrs["calls_by_device"] = self._tracker.by_device
+        attrs["calls_last_24h"] = sum(calls for _, calls in self._tracker.hourly(24))
+
         return attrs
 
     @staticmethod
@@ -73,7 +96,134 @@ class ImouApiUsageSensor(SensorEntity):
         return value.isoformat()
 
 
+class ImouApiUsageProjectionSensor(SensorEntity):
+    _attr_has_entity_name = True
+    _attr_translation_key = "api_usage_projection"
+    _attr_icon = "mdi:chart-timeline-variant"
+    _attr_native_unit_of_measurement = None
+    _attr_state_class = SensorStateClass.MEASUREMENT
+
+    def __init__(self, data: _UsageData) -> None:
+        self._tracker = data.tracker
+        self._entry_id = data.entry_id
+        self._remove_listener: Callable[[], None] | None = None
+        self._attr_unique_id = f"{self._entry_id}_api_usage_projection"
+        self._attr_device_info = DeviceInfo(
+            identifiers={(DOMAIN, f"account_{self._entry_id}")},
+            manufacturer="Imou",
+            name="Imou Account",
+        )
+
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+        self._remove_listener = self._tracker.async_add_listener(self.async_write_ha_state)
+        self.async_write_ha_state()
+
+    async def async_will_remove_from_hass(self) -> None:
+        if self._remove_listener is not None:
+            self._remove_listener()
+            self._remove_listener = None
+        await super().async_will_remove_from_hass()
+
+    @property
+    def native_value(self) -> int:
+        return self._tracker.projected()
+
+    @property
+    def extra_state_attributes(self) -> dict[str, int | bool | None]:
+        budget = self._tracker.budget
+        attrs: dict[str, int | bool | None] = {"budget": budget}
+        if budget:
+            attrs["remaining"] = max(budget - self._tracker.count, 0)
+            attrs["skipping_background_calls"] = self._tracker.should_defer(essential=False)
+        return attrs
+
+
+class _ApiMetricSensor(SensorEntity):
+    """Base dos sensores de latência/erros de um endpoint.
+
+    Os valores mudam a cada chamada; o HA os lê por polling (30 s) em vez de
+    gravar o estado a cada requisição.
+    """
+
+    _attr_has_entity_name = True
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_state_class = SensorStateClass.MEASUREMENT
+
+    def __init__(self, metrics: ApiMetrics, entry_id: str, endpoint: str, key: str) -> None:
+        self._metrics = metrics
+        self._endpoint = endpoint
+        self._attr_translation_key = key
+        self._attr_unique_id = f"{entry_id}_{key}"
+        self._attr_device_info = DeviceInfo(
+            identifiers={(DOMAIN, f"account_{entry_id}")},
+            manufacturer="Imou",
+            name="Imou Account",
+        )
+
+    @property
+    def extra_state_attributes(self) -> dict[str, int]:
+        histogram = self._metrics.histogram(self._endpoint)
+        if histogram is None:
+            return {"calls": 0, "errors": 0}
+        return {"calls": histogram.count, "errors": histogram.errors}
+
+
+class ImouApiLatencySensor(_ApiMetricSensor):
+    _attr_icon = "mdi:timer-outline"
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_native_unit_of_measurement = UnitOfTime.MILLISECONDS
+    _attr_suggested_display_precision = 0
+
+    def __init__(
+        self,
+        metrics: ApiMetrics,
+        entry_id: str,
+        endpoint: str,
+        prefix: str,
+        name: str,
+        fraction: float,
+    ) -> None:
+        super().__init__(metrics, entry_id, endpoint, f"{prefix}_latency_{name}")
+        self._fraction = fraction
+
+    @property
+    def native_value(self) -> float | None:
+        histogram = self._metrics.histogram(self._endpoint)
+        if histogram is None:
+            return None
+        value = histogram.percentile(self._fraction)
+        return None if value is None else round(value, 1)
+
+
+class ImouApiErrorRateSensor(_ApiMetricSensor):
+    _attr_icon = "mdi:alert-circle-outline"
+    _attr_native_unit_of_measurement = PERCENTAGE
+    _attr_suggested_display_precision = 1
+
+    def __init__(self, metrics: ApiMetrics, entry_id: str, endpoint: str, prefix: str) -> None:
+        super().__init__(metrics, entry_id, endpoint, f"{prefix}_error_rate")
+
+    @property
+    def native_value(self) -> float | None:
+        histogram = self._metrics.histogram(self._endpoint)
+        rate = None if histogram is None else histogram.error_rate
+        return None if rate is None else round(rate * 100, 2)
+
+
 async def async_setup_entry(hass: HomeAssistant, entry, async_add_entities) -> None:
     data = hass.data[DOMAIN][entry.entry_id]
     tracker: ApiUsageTracker = data["usage"]
-    async_add_entities([ImouApiUsageSensor(_UsageData(tracker, entry.entry_id))])
+    usage_data = _UsageData(tracker, entry.entry_id, data["commands"])
+    metrics: ApiMetrics = data["metrics"]
+    entities: list[SensorEntity] = [
+        ImouApiUsageSensor(usage_data),
+        ImouApiUsageProjectionSensor(usage_data),
+    ]
+    for endpoint, prefix in _LATENCY_ENDPOINTS:
+        entities.extend(
+            ImouApiLatencySensor(metrics, entry.entry_id, endpoint, prefix, name, fraction)
+            for name, fraction in _PERCENTILES
+        )
+        entities.append(ImouApiErrorRateSensor(metrics, entry.entry_id, endpoint, prefix))
+    async_add_entities(entities)
@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+from .command_queue import CommandSuperseded
+from .utils import TaskFactory
+
+_LOGGER = logging.getLogger(__name__)
+
+ApplySetpoint = Callable[[float, float, float], Awaitable[Any]]
+
+
+class SetpointStream:
+    """Sequência de alvos (h, v, z) de uma câmera com no máximo um envio por vez.
+
+    Enquanto um alvo está sendo aplicado, os que chegam só substituem o
+    pendente; ao terminar, apenas o mais recente é enviado. Cada alvo aplicado
+    é confirmado por ``send`` com a latência desde a chegada e quantos alvos
+    foram descartados até ali.
+    """
+
+    def __init__(
+        self,
+        apply: ApplySetpoint,
+        send: Callable[[Dict[str, Any]], None],
+        create_task: Optional[TaskFactory] = None,
+    ) -> None:
+        self._apply = apply
+        self._send = send
+        self._create_task = create_task
+        # (h, v, z, monotonic da chegada)
+        self._pending: Optional[Tuple[float, float, float, float]] = None
+        self._task: Optional[asyncio.Task[None]] = None
+        self._closed = False
+        self.dropped = 0
+
+    def push(self, h: float, v: float, z: float = 0.0) -> None:
+        """Recebe um novo alvo; descarta o pendente, se houver."""
+        if self._closed:
+            return
+        if self._pending is not None:
+            self.dropped += 1
+        self._pending = (h, v, z, time.monotonic())
+        if self._task is None or self._task.done():
+            name = "imou_control setpoints"
+            if self._create_task is None:
+                self._task = asyncio.get_running_loop().create_task(self._run(), name=name)
+            else:
+                self._task = self._create_task(self._run(), name)
+
+    def close(self) -> None:
+        """Para de enviar e de confirmar; o alvo em andamento termina sozinho."""
+        self._closed = True
+        self._pending = None
+
+    async def _run(self) -> None:
+        while self._pending is not None and not self._closed:
+            h, v, z, received = self._pending
+            self._pending = None
+            result: Dict[str, Any] = {"h": h, "v": v, "z": z}
+            try:
+                await self._apply(h, v, z)
+            except CommandSuperseded:
+                # outro comando (serviço, botão) para a mesma câmera passou à frente
+                result["status"] = "superseded"
+            except Exception as err:
+                _LOGGER.warning("Falha ao aplicar alvo (%s, %s, %s): %s", h, v, z, err)
+                result["status"] = "error"
+                result["error"] = str(err)
+            else:
+                result["status"] = "applied"
+            if self._closed:
+                return
+            result["latency_ms"] = round((time.monotonic() - received) * 1000, 1)
+            result["dropped"] = self.dropped
+            self._send(result)
+
+
+class SetpointStreams:
+    """Fluxos abertos, por assinatura, com a entrada (conta) que os atende.
+
+    Cada fluxo usa a API, a fila e as rondas de uma entrada; ao descarregá-la
+    (inclusive ao mudar as opções), :meth:`close_entry` encerra os fluxos
+    dela e chama ``end`` de cada um para avisar o cliente.
+    """
+
+    def __init__(self) -> None:
+        self._streams: Dict[Hashable, Tuple[str, SetpointStream, Callable[[], None]]] = {}
+
+    def __len__(self) -> int:
+        return len(self._streams)
+
+    def add(
+        self, key: Hashable, entry_id: str, stream: SetpointStream, end: Callable[[], None]
+    ) -> None:
+        self.discard(key)
+        self._streams[key] = (entry_id, stream, end)
+
+    def get(self, key: Hashable) -> Optional[SetpointStream]:
+        found = self._streams.get(key)
+        return None if found is None else found[1]
+
+    def discard(self, key: Hashable) -> None:
+        """Fecha o fluxo porque o cliente cancelou a assinatura."""
+        found = self._streams.pop(key, None)
+        if found is not None:
+            found[1].close()
+
+    def close_entry(self, entry_id: str) -> int:
+        """Fecha os fluxos da entrada e avisa os clientes; devolve quantos eram."""
+        keys = [key for key, (owner, _, _) in self._streams.items() if owner == entry_id]
+        for key in keys:
+            _, stream, end = self._streams.pop(key)
+            stream.close()
+            end()
+        return len(keys)
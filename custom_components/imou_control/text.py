@@ -1,10 +1,11 @@
 from __future__ import annotations
 
 from homeassistant.components.text import TextEntity, TextMode
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity import DeviceInfo
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 
-from .const import DOMAIN
+from .const import DOMAIN, SIGNAL_DEVICES_ADDED
 
 
 class ImouPresetText(TextEntity):
@@ -34,7 +35,17 @@ class ImouPresetText(TextEntity):
 
 async def async_setup_entry(hass: HomeAssistant, entry, async_add_entities):
     data = hass.data[DOMAIN][entry.entry_id]
-    entities = []
-    for device_id, dev in data["devices"].items():
-        entities.append(ImouPresetText(hass, device_id, dev))
-    async_add_entities(entities)
+
+    @callback
+    def _async_add_devices(device_ids: list[str]) -> None:
+        entities = []
+        for device_id in device_ids:
+            entities.append(ImouPresetText(hass, device_id, data["devices"][device_id]))
+        async_add_entities(entities)
+
+    _async_add_devices(list(data["devices"]))
+    entry.async_on_unload(
+        async_dispatcher_connect(
+            hass, SIGNAL_DEVICES_ADDED.format(entry.entry_id), _async_add_devices
+        )
+    )
@@ -1,21 +1,32 @@
 from __future__ import annotations
 
 import asyncio
-import json
 import logging
+import random
 import time
-import uuid
-from typing import Any, Dict, Optional, Tuple
+from typing import TYPE_CHECKING, Any, Dict, Optional, Tuple
 
 import aiohttp
 
-from .const import TOKEN_ENDPOINT
+from .const import (
+    DEFAULT_REQUEST_TIMEOUT,
+    DEFAULT_TOKEN_RENEW_JITTER,
+    DEFAULT_TOKEN_RENEW_LEAD,
+    TOKEN_ENDPOINT,
+)
+from .codec import DEFAULT_CODEC, JSON_CONTENT_TYPE, JsonCodec
+from .metrics import ApiMetrics
 from .usage import ApiUsageTracker
-from .utils import make_system
+from .utils import SystemSigner, TaskFactory
 
+if TYPE_CHECKING:
+    from homeassistant.helpers.storage import Store
 
 _LOGGER = logging.getLogger(__name__)
 
+# espera antes de tentar de novo quando a renovação em segundo plano falha
+_RENEW_RETRY_DELAY = 60.0
+
 
 class TokenManager:
     """Gerencia o accessToken (cache + renovação) para a Imou OpenAPI."""
@@ -27,6 +38,12 @@ class TokenManager:
         base_url: str,
         session: aiohttp.ClientSession,
         usage: ApiUsageTracker | None = None,
+        store: Store | None = None,
+        renew_lead: float = DEFAULT_TOKEN_RENEW_LEAD,
+        renew_jitter: float = DEFAULT_TOKEN_RENEW_JITTER,
+        codec: JsonCodec = DEFAULT_CODEC,
+        metrics: Optional[ApiMetrics] = None,
+        request_timeout: float = DEFAULT_REQUEST_TIMEOUT,
     ):
         self._app_id = app_id
         self._app_secret = app_secret
@@ -34,14 +51,83 @@ class TokenManager:
         self._session = session
         self._token: Optional[str] = None
         self._exp_ts: float = 0.0  # epoch seconds
-        self._timeout = aiohttp.ClientTimeout(total=10)
+        self._timeout = aiohttp.ClientTimeout(total=request_timeout)
         self._lock = asyncio.Lock()
         self._usage = usage
+        self._store = store
+        # incrementado a cada novo token obtido (refresh "single-flight")
+        self._generation = 0
+        self._renew_lead = renew_lead
+        self._renew_jitter = renew_jitter
+        self._renew_task: Optional[asyncio.Task[None]] = None
+        self._codec = codec
+        self._sign = SystemSigner(app_id, app_secret)
+        self._metrics = metrics
+
+    @property
+    def generation(self) -> int:
+        """Geração do token atual; muda sempre que um novo token é obtido."""
+        return self._generation
+
+    @property
+    def expires_in(self) -> Optional[float]:
+        """Segundos até o token atual expirar (``None`` sem token)."""
+        if not self._token:
+            return None
+        return self._exp_ts - time.time()
+
+    async def async_load(self) -> None:
+        """Carrega o token persistido, reaproveitando-o se ainda for válido."""
+        if self._store is None:
+            return
+
+        data = await self._store.async_load()
+        if not data:
+            return
+
+        token = data.get("token")
+        try:
+            exp_ts = float(data.get("exp_ts") or 0.0)
+        except (TypeError, ValueError):
+            exp_ts = 0.0
+
+        if token and time.time() < exp_ts:
+            self._token, self._exp_ts = token, exp_ts
+            _LOGGER.debug("Reutilizando token persistido (expira em %.0fs)", exp_ts - time.time())
+        else:
+            # token vencido: descarta do armazenamento
+            self._persist()
+
+    def _as_dict(self) -> Dict[str, Any]:
+        return {"token": self._token, "exp_ts": self._exp_ts}
+
+    def _persist(self) -> None:
+        if self._store is not None:
+            self._store.async_delay_save(self._as_dict)
+
+    def _set_token(self, token: Optional[str], exp_ts: float) -> None:
+        if token is not None:
+            self._generation += 1
+        self._token, self._exp_ts = token, exp_ts
+        self._persist()
 
     def _url(self, path: str) -> str:
         return f"{self._base_url}{path}"
 
     async def _fetch_new_token(self) -> Tuple[str, float]:
+        """Busca um novo token, registrando a latência em ``metrics``."""
+        if self._metrics is None:
+            return await self._request_token()
+        start = time.monotonic()
+        try:
+            result = await self._request_token()
+        except Exception as err:
+            self._metrics.record(TOKEN_ENDPOINT, time.monotonic() - start, str(err))
+            raise
+        self._metrics.record(TOKEN_ENDPOINT, time.monotonic() - start)
+        return result
+
+    async def _request_token(self) -> Tuple[str, float]:
         """
         Faz POST em /openapi/accessToken com 'system' assinado (sign/nonce/time).
         Resposta esperada:
@@ -50,20 +136,19 @@ class TokenManager:
           "id":"..."
         }
         """
-        system, now, _nonce = make_system(self._app_id, self._app_secret)
-        payload: Dict[str, Any] = {
-            "system": system,
-            "id": str(uuid.uuid4()),
-            "params": {},
-        }
+        system, now, nonce = self._sign()
+        body = self._codec.dumps({"system": system, "id": nonce, "params": {}})
         try:
             async with self._session.post(
-                self._url(TOKEN_ENDPOINT), json=payload, timeout=self._timeout
+                self._url(TOKEN_ENDPOINT),
+                data=body,
+                headers=JSON_CONTENT_TYPE,
+                timeout=self._timeout,
             ) as response:
                 if self._usage is not None:
-                    self._usage.note_call(response.headers.get("Date"))
+                    self._usage.note_call(response.headers.get("Date"), TOKEN_ENDPOINT)
                 response.raise_for_status()
-                text = await response.text()
+                raw = await response.read()
         except asyncio.TimeoutError as err:
             _LOGGER.error("Timeout ao solicitar novo token: %s", err)
             raise RuntimeError("Timeout ao solicitar token") from err
@@ -71,12 +156,12 @@ class TokenManager:
             _LOGGER.error("Erro de cliente ao solicitar novo token: %s", err)
             raise RuntimeError("Erro de cliente ao solicitar token") from err
 
-        if not text:
+        if not raw:
             data: Dict[str, Any] = {}
         else:
             try:
-                data = json.loads(text)
-            except json.JSONDecodeError as err:
+                data = self._codec.loads(raw)
+            except ValueError as err:
                 _LOGGER.error("Resposta inválida ao solicitar token: %s", err)
                 raise RuntimeError("Resposta inválida ao solicitar token") from err
 
@@ -104,20 +189,96 @@ class TokenManager:
                 return self._token
 
             token, exp_ts = await self._fetch_new_token()
-            self._token, self._exp_ts = token, exp_ts
+            self._set_token(token, exp_ts)
             return self._token
 
     # ==== NOVO: APIs para forçar renovação (usadas no retry) ====
 
-    async def refresh_token(self) -> str:
-        """Força renovação imediata do token e retorna o novo valor."""
+    async def refresh_token(self, generation: Optional[int] = None) -> str:
+        """Força renovação imediata do token e retorna o novo valor.
+
+        Se ``generation`` for informado e outro chamador já tiver renovado o
+        token desde então, o token atual é devolvido sem nova requisição.
+        """
         async with self._lock:
+            if (
+                generation is not None
+                and generation != self._generation
+                and self._token
+                and time.time() < self._exp_ts
+            ):
+                return self._token
+
+            # invalida o token persistido antes de buscar outro
+            self._set_token(None, 0.0)
             token, exp_ts = await self._fetch_new_token()
-            self._token, self._exp_ts = token, exp_ts
+            self._set_token(token, exp_ts)
             return self._token
 
     async def invalidate(self) -> None:
         """Invalida o token atual (próxima get_token() renova)."""
         async with self._lock:
-            self._token = None
-            self._exp_ts = 0.0
+            self._set_token(None, 0.0)
+
+    # ==== Renovação proativa em segundo plano ====
+
+    def async_start_renewal(self, create_task: Optional[TaskFactory] = None) -> None:
+        """Inicia a tarefa que renova o token pouco antes de expirar.
+
+        ``create_task(coro, name)`` permite que o HA acompanhe a tarefa; sem
+        ele a tarefa é criada direto no loop.
+        """
+        if self._renew_task is not None and not self._renew_task.done():
+            return
+        name = "imou_control token renewal"
+        if create_task is None:
+            self._renew_task = asyncio.get_running_loop().create_task(
+                self._renewal_loop(), name=name
+            )
+        else:
+            self._renew_task = create_task(self._renewal_loop(), name)
+
+    async def async_stop(self) -> None:
+        """Cancela a renovação em segundo plano e aguarda seu término."""
+        task, self._renew_task = self._renew_task, None
+        if task is None or task.done():
+            return
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+    def _next_renewal_delay(self) -> float:
+        if not self._token:
+            return 0.0
+        remaining = self._exp_ts - time.time()
+        if remaining <= 0:
+            return 0.0
+        # tokens de vida curta: renova na metade do tempo restante
+        lead = min(self._renew_lead, remaining / 2)
+        jitter = random.uniform(0.0, min(self._renew_jitter, remaining / 4))
+        return max(remaining - lead - jitter, 0.0)
+
+    async def _renewal_loop(self) -> None:
+        while True:
+            generation = self._generation
+            await asyncio.sleep(self._next_renewal_delay())
+
+            async with self._lock:
+                # outro chamador já renovou enquanto dormíamos: recalcula o prazo
+                if generation != self._generation and self._token:
+                    continue
+                try:
+                    # o token atual continua válido durante a busca, então
+                    # get_token() não espera por esta renovação
+                    token, exp_ts = await self._fetch_new_token()
+                except Exception as err:
+                    _LOGGER.warning("Falha na renovação antecipada do token: %s", err)
+                    failed = True
+                else:
+                    self._set_token(token, exp_ts)
+                    failed = False
+
+            if failed:
+                await asyncio.sleep(_RENEW_RETRY_DELAY)
@@ -0,0 +1,190 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from .command_queue import CommandSuperseded
+from .const import MIN_TOUR_DWELL, TOUR_MAX_RETRY_DELAY, TOUR_RETRY_DELAY
+from .rate_limit import PRIORITY_BACKGROUND, RequestPreempted
+from .utils import TaskFactory
+
+_LOGGER = logging.getLogger(__name__)
+
+MoveCallable = Callable[[str, str, int], Awaitable[Any]]
+
+
+@dataclass(frozen=True)
+class TourStep:
+    """Um passo da ronda: o preset visitado e quanto tempo a câmera fica nele."""
+
+    preset: str
+    dwell: float
+
+
+@dataclass
+class _Tour:
+    steps: List[TourStep]
+    repeat: bool
+    priority: int = PRIORITY_BACKGROUND
+    task: Optional[asyncio.Task[None]] = None
+    index: int = 0
+    resume: asyncio.Event = field(default_factory=asyncio.Event)
+
+    @property
+    def paused(self) -> bool:
+        return not self.resume.is_set()
+
+
+class TourManager:
+    """Rondas (patrulhas) de presets, com uma tarefa asyncio por câmera.
+
+    ``move(device_id, preset, priority)`` executa cada passo, com a
+    prioridade da ronda no limitador de taxa. Um comando manual para a
+    câmera deve chamar :meth:`preempt`, que encerra a ronda em andamento.
+    A câmera fica ao menos ``min_dwell`` segundos em cada passo; após um passo
+    com falha a espera cresce de ``retry_delay`` até ``max_retry_delay``.
+    """
+
+    def __init__(
+        self,
+        move: MoveCallable,
+        create_task: Optional[TaskFactory] = None,
+        *,
+        min_dwell: float = MIN_TOUR_DWELL,
+        retry_delay: float = TOUR_RETRY_DELAY,
+        max_retry_delay: float = TOUR_MAX_RETRY_DELAY,
+    ) -> None:
+        self._move = move
+        self._create_task = create_task
+        self._min_dwell = min_dwell
+        self._retry_delay = retry_delay
+        self._max_retry_delay = max_retry_delay
+        self._tours: Dict[str, _Tour] = {}
+
+    def is_active(self, device_id: str) -> bool:
+        return device_id in self._tours
+
+    def status(self) -> Dict[str, Dict[str, Any]]:
+        """Estado das rondas ativas, por câmera."""
+        return {
+            device_id: {
+                "preset": tour.steps[tour.index].preset,
+                "step": tour.index,
+                "steps": len(tour.steps),
+                "paused": tour.paused,
+                "repeat": tour.repeat,
+            }
+            for device_id, tour in self._tours.items()
+        }
+
+    def start(
+        self,
+        device_id: str,
+        steps: List[TourStep],
+        repeat: bool = True,
+        priority: int = PRIORITY_BACKGROUND,
+    ) -> None:
+        """Inicia (ou substitui) a ronda da câmera.
+
+        Rondas ficam em segundo plano; uma visita pedida pelo usuário usa
+        ``PRIORITY_INTERACTIVE`` para não ser adiada pela cota nem preterida
+        no limitador.
+        """
+        if not steps:
+            raise ValueError("A ronda precisa de pelo menos um preset")
+        self._cancel(device_id)
+        tour = _Tour(steps=list(steps), repeat=repeat, priority=priority)
+        tour.resume.set()
+        self._tours[device_id] = tour
+        name = f"imou_control tour {device_id}"
+        if self._create_task is None:
+            tour.task = asyncio.get_running_loop().create_task(
+                self._run(device_id, tour), name=name
+            )
+        else:
+            tour.task = self._create_task(self._run(device_id, tour), name)
+
+    def pause(self, device_id: str) -> bool:
+        tour = self._tours.get(device_id)
+        if tour is None:
+            return False
+        tour.resume.clear()
+        return True
+
+    def resume(self, device_id: str) -> bool:
+        tour = self._tours.get(device_id)
+        if tour is None:
+            return False
+        tour.resume.set()
+        return True
+
+    async def stop(self, device_id: str) -> bool:
+        tour = self._tours.get(device_id)
+        if tour is None:
+            return False
+        self._cancel(device_id)
+        if tour.task is not None:
+            try:
+                await tour.task
+            except asyncio.CancelledError:
+                pass
+        return True
+
+    def preempt(self, device_id: str) -> bool:
+        """Encerra a ronda porque um comando manual foi enviado à câmera."""
+        if device_id not in self._tours:
+            return False
+        _LOGGER.debug("Ronda de %s interrompida por comando manual", device_id)
+        self._cancel(device_id)
+        return True
+
+    async def async_stop_all(self) -> None:
+        for device_id in list(self._tours):
+            await self.stop(device_id)
+
+    def _cancel(self, device_id: str) -> None:
+        tour = self._tours.pop(device_id, None)
+        if tour is not None and tour.task is not None and not tour.task.done():
+            tour.task.cancel()
+
+    async def _run(self, device_id: str, tour: _Tour) -> None:
+        failures = 0
+        try:
+            while True:
+                await tour.resume.wait()
+                step = tour.steps[tour.index]
+                wait = max(step.dwell, self._min_dwell)
+                try:
+                    await self._move(device_id, step.preset, tour.priority)
+                except (CommandSuperseded, RequestPreempted):
+                    _LOGGER.debug("Ronda de %s preterida por outro comando", device_id)
+                    return
+                except Exception as err:
+                    failures += 1
+                    # só a primeira falha seguida vira aviso; as demais, debug
+                    _LOGGER.log(
+                        logging.WARNING if failures == 1 else logging.DEBUG,
+                        "Falha ao mover %s para o preset %s na ronda: %s",
+                        device_id,
+                        step.preset,
+                        err,
+                    )
+                    backoff = min(
+                        self._retry_delay * 2 ** (failures - 1), self._max_retry_delay
+                    )
+                    wait = max(wait, backoff)
+                else:
+                    failures = 0
+                await asyncio.sleep(wait)
+
+                if tour.index + 1 < len(tour.steps):
+                    tour.index += 1
+                elif tour.repeat:
+                    tour.index = 0
+                else:
+                    return
+        finally:
+            if self._tours.get(device_id) is tour:
+                del self._tours[device_id]
@@ -1,24 +1,57 @@
 from __future__ import annotations
 
+import asyncio
+import time
+from array import array
 from collections.abc import Callable
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from email.utils import parsedate_to_datetime
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
-from homeassistant.helpers.storage import Store
+if TYPE_CHECKING:
+    from homeassistant.helpers.storage import Store
+
+# Fraction of the monthly budget after which non-essential calls are skipped
+# when the projection exceeds the budget, and skipped unconditionally.
+QUOTA_SOFT_RATIO = 0.8
+QUOTA_HARD_RATIO = 0.95
+
+# Minimum observation window used to extrapolate the call rate.
+_MIN_PROJECTION_WINDOW = timedelta(hours=1)
+
+# Hourly call counts kept in a ring buffer (30 days).
+HOURLY_SLOTS = 30 * 24
 
 
 class ApiUsageTracker:
     """Track monthly API usage based on timestamps returned by Imou."""
 
-    def __init__(self, store: Store, *, save_delay: float = 30.0) -> None:
+    def __init__(
+        self,
+        store: Store,
+        *,
+        save_delay: float = 30.0,
+        budget: int | None = None,
+        notify_interval: float = 5.0,
+    ) -> None:
         self._store = store
         self._save_delay = save_delay
+        self._budget = budget or None
         self._period: str | None = None
         self._count: int = 0
+        self._skipped: int = 0
         self._last_reset: datetime | None = None
         self._last_call: datetime | None = None
         self._listeners: set[Callable[[], None]] = set()
+        self._notify_interval = notify_interval
+        self._last_notify = float("-inf")
+        self._notify_handle: asyncio.TimerHandle | None = None
+        self._date_cache: tuple[str, datetime] | None = None
+        self._by_endpoint: dict[str, int] = {}
+        self._by_device: dict[str, int] = {}
+        # slot = hour % HOURLY_SLOTS; _last_hour is the newest hour written
+        self._hourly = array("I", bytes(4 * HOURLY_SLOTS))
+        self._last_hour: int | None = None
 
     async def async_load(self) -> None:
         """Load persisted usage data from storage."""
@@ -29,6 +62,15 @@ class ApiUsageTracker:
 
         self._period = data.get("period")
         self._count = int(data.get("count", 0))
+        self._skipped = int(data.get("skipped", 0))
+        self._by_endpoint = {str(k): int(v) for k, v in (data.get("by_endpoint") or {}).items()}
+        self._by_device = {str(k): int(v) for k, v in (data.get("by_device") or {}).items()}
+
+        hourly = data.get("hourly") or []
+        last_hour = data.get("last_hour")
+        if len(hourly) == HOURLY_SLOTS and last_hour is not None:
+            self._hourly = array("I", (int(v) for v in hourly))
+            self._last_hour = int(last_hour)
 
         last_reset = data.get("last_reset")
         if last_reset:
@@ -44,6 +86,37 @@ class ApiUsageTracker:
 
         return self._count
 
+    @property
+    def by_endpoint(self) -> dict[str, int]:
+        """Return this period's call count per OpenAPI endpoint."""
+
+        return dict(self._by_endpoint)
+
+    @property
+    def by_device(self) -> dict[str, int]:
+        """Return this period's call count per device ID."""
+
+        return dict(self._by_device)
+
+    def hourly(self, hours: int = 24, now: datetime | None = None) -> list[tuple[datetime, int]]:
+        """Return ``(hour start, calls)`` for the last ``hours`` hours, oldest first."""
+
+        hours = max(1, min(hours, HOURLY_SLOTS))
+        now = now or datetime.now(timezone.utc)
+        current = int(now.timestamp() // 3600)
+        result = []
+        for hour in range(current - hours + 1, current + 1):
+            result.append(
+                (datetime.fromtimestamp(hour * 3600, timezone.utc), self._hour_count(hour))
+            )
+        return result
+
+    @property
+    def skipped(self) -> int:
+        """Return how many calls were avoided in the current period."""
+
+        return self._skipped
+
     @property
     def period(self) -> str | None:
         """Return the identifier of the current period (YYYY-MM)."""
@@ -62,21 +135,103 @@ class ApiUsageTracker:
 
         return self._last_call
 
-    def note_call(self, date_header: str | None = None) -> None:
+    @property
+    def budget(self) -> int | None:
+        """Return the configured monthly call budget, if any."""
+
+        return self._budget
+
+    def projected(self, now: datetime | None = None) -> int:
+        """Project the call count at the end of the current month.
+
+        The rate observed since the counter was last reset is extrapolated to
+        the end of the month.
+        """
+
+        now = now or datetime.now(timezone.utc)
+        if self._period != self._period_key(now):
+            return 0
+        if self._last_reset is None:
+            return self._count
+
+        month_end = self._next_month_start(now)
+        elapsed = max(now - self._last_reset, _MIN_PROJECTION_WINDOW)
+        remaining = max(month_end - now, timedelta(0))
+        rate = self._count / elapsed.total_seconds()
+        return int(round(self._count + rate * remaining.total_seconds()))
+
+    def should_defer(self, essential: bool, now: datetime | None = None) -> bool:
+        """Return whether a call should be skipped to stay within the budget.
+
+        Essential calls (user-initiated PTZ commands) are never deferred.
+        """
+
+        if essential or not self._budget:
+            return False
+
+        now = now or datetime.now(timezone.utc)
+        count = self._count if self._period == self._period_key(now) else 0
+        if count >= self._budget * QUOTA_HARD_RATIO:
+            return True
+        return count >= self._budget * QUOTA_SOFT_RATIO and self.projected(now) > self._budget
+
+    def note_call(
+        self,
+        date_header: str | None = None,
+        endpoint: str | None = None,
+        device_id: str | None = None,
+    ) -> None:
         """Record a single API call using the server-provided timestamp."""
 
-        moment = self._parse_date_header(date_header)
-        period = self._period_key(moment)
+        moment = self._moment_for(date_header)
+        self._roll_period(moment)
+        self._count += 1
+        self._last_call = moment
+        if endpoint:
+            self._by_endpoint[endpoint] = self._by_endpoint.get(endpoint, 0) + 1
+        if device_id:
+            self._by_device[device_id] = self._by_device.get(device_id, 0) + 1
+        self._add_hourly(int(moment.timestamp() // 3600))
+        self._store.async_delay_save(self._as_dict, self._save_delay)
+        self._notify_listeners()
 
+    def note_skipped(self) -> None:
+        """Record a call that was not made because it repeated the last command."""
+
+        self._roll_period(datetime.now(timezone.utc))
+        self._skipped += 1
+        self._store.async_delay_save(self._as_dict, self._save_delay)
+        self._notify_listeners()
+
+    def _roll_period(self, moment: datetime) -> None:
+        period = self._period_key(moment)
         if self._period != period:
             self._period = period
             self._count = 0
+            self._skipped = 0
+            self._by_endpoint = {}
+            self._by_device = {}
             self._last_reset = moment
 
-        self._count += 1
-        self._last_call = moment
-        self._store.async_delay_save(self._as_dict, self._save_delay)
-        self._notify_listeners()
+    def _add_hourly(self, hour: int) -> None:
+        last = self._last_hour
+        if last is None or hour - last >= HOURLY_SLOTS:
+            self._hourly = array("I", bytes(4 * HOURLY_SLOTS))
+            self._last_hour = hour
+        elif hour > last:
+            # clear the slots of the hours skipped since the last call
+            for skipped in range(last + 1, hour + 1):
+                self._hourly[skipped % HOURLY_SLOTS] = 0
+            self._last_hour = hour
+        elif last - hour >= HOURLY_SLOTS:
+            return
+        self._hourly[hour % HOURLY_SLOTS] += 1
+
+    def _hour_count(self, hour: int) -> int:
+        last = self._last_hour
+        if last is None or hour > last or last - hour >= HOURLY_SLOTS:
+            return 0
+        return self._hourly[hour % HOURLY_SLOTS]
 
     def async_add_listener(self, listener: Callable[[], None]) -> Callable[[], None]:
         """Register a callback invoked whenever usage changes."""
@@ -88,14 +243,66 @@ class ApiUsageTracker:
 
         return _remove
 
+    def async_flush(self) -> None:
+        """Deliver a pending throttled notification right away."""
+
+        if self._notify_handle is None:
+            return
+        self._notify_handle.cancel()
+        self._notify_handle = None
+        self._notify_now()
+
     def _notify_listeners(self) -> None:
+        """Notify listeners at most once per ``notify_interval`` seconds.
+
+        The first change after a quiet period is delivered immediately; later
+        changes inside the interval are coalesced into one trailing update.
+        """
+
+        if self._notify_interval <= 0:
+            self._notify_now()
+            return
+        if self._notify_handle is not None:
+            return
+
+        wait = self._last_notify + self._notify_interval - time.monotonic()
+        if wait <= 0:
+            self._notify_now()
+            return
+        self._notify_handle = asyncio.get_running_loop().call_later(
+            wait, self._notify_pending
+        )
+
+    def _notify_pending(self) -> None:
+        self._notify_handle = None
+        self._notify_now()
+
+    def _notify_now(self) -> None:
+        self._last_notify = time.monotonic()
         for listener in list(self._listeners):
             listener()
 
+    def _moment_for(self, date_header: str | None) -> datetime:
+        """Parse the ``Date`` header, reusing the result for repeated values."""
+
+        if not date_header:
+            return datetime.now(timezone.utc)
+        cached = self._date_cache
+        if cached is not None and cached[0] == date_header:
+            return cached[1]
+        moment = self._parse_date_header(date_header)
+        self._date_cache = (date_header, moment)
+        return moment
+
     def _as_dict(self) -> dict[str, Any]:
         return {
             "period": self._period,
             "count": self._count,
+            "skipped": self._skipped,
+            "by_endpoint": self._by_endpoint,
+            "by_device": self._by_device,
+            "hourly": self._hourly.tolist(),
+            "last_hour": self._last_hour,
             "last_reset": self._format_datetime(self._last_reset),
             "last_call": self._format_datetime(self._last_call),
         }
@@ -104,6 +311,12 @@ class ApiUsageTracker:
     def _period_key(moment: datetime) -> str:
         return f"{moment.year:04d}-{moment.month:02d}"
 
+    @staticmethod
+    def _next_month_start(moment: datetime) -> datetime:
+        if moment.month == 12:
+            return datetime(moment.year + 1, 1, 1, tzinfo=timezone.utc)
+        return datetime(moment.year, moment.month + 1, 1, tzinfo=timezone.utc)
+
     @staticmethod
     def _parse_iso_datetime(value: str) -> datetime:
         dt = datetime.fromisoformat(value)
@@ -1,6 +1,32 @@
 from __future__ import annotations
-import time, uuid, hashlib
-from typing import Tuple, Dict
+import asyncio, time, uuid, hashlib
+from typing import Any, Callable, Coroutine, Tuple, Dict
+
+# cria uma tarefa de segundo plano (no HA, entry.async_create_background_task)
+TaskFactory = Callable[[Coroutine[Any, Any, None], str], "asyncio.Task[None]"]
+
+
+class SystemSigner:
+    """
+    Modelo reutilizável do bloco 'system': os campos fixos (ver/appId) e o
+    sufixo com o appSecret são montados uma única vez; a cada chamada só
+    time/nonce/sign são gerados.
+    """
+
+    __slots__ = ("_static", "_secret_suffix")
+
+    def __init__(self, app_id: str, app_secret: str) -> None:
+        self._static = {"ver": "1.0", "appId": app_id}
+        self._secret_suffix = f",appSecret:{app_secret}"
+
+    def __call__(self) -> Tuple[Dict, int, str]:
+        ts = int(time.time())
+        nonce = str(uuid.uuid4())
+        raw = f"time:{ts},nonce:{nonce}{self._secret_suffix}"
+        sign = hashlib.md5(raw.encode("utf-8")).hexdigest()
+        system = {**self._static, "sign": sign, "time": ts, "nonce": nonce}
+        return system, ts, nonce
+
 
 def make_system(app_id: str, app_secret: str) -> Tuple[Dict, int, str]:
     """
@@ -8,15 +34,4 @@ def make_system(app_id: str, app_secret: str) -> Tuple[Dict, int, str]:
     sign = md5( f"time:{time},nonce:{nonce},appSecret:{app_secret}" ).hexdigest().lower()
     Retorna (system_dict, time_ts, nonce_str)
     """
-    ts = int(time.time())
-    nonce = str(uuid.uuid4())
-    raw = f"time:{ts},nonce:{nonce},appSecret:{app_secret}"
-    sign = hashlib.md5(raw.encode("utf-8")).hexdigest()
-    system = {
-        "ver": "1.0",
-        "appId": app_id,
-        "sign": sign,
-        "time": ts,
-        "nonce": nonce
-    }
-    return system, ts, nonce
+    return SystemSigner(app_id, app_secret)()
@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+from functools import partial
+from typing import Any, Dict, Optional, Tuple
+
+import voluptuous as vol
+
+from homeassistant.components import websocket_api
+from homeassistant.core import HomeAssistant, callback
+
+from .const import DOMAIN
+from .setpoints import SetpointStream, SetpointStreams
+
+WS_SUBSCRIBE_SETPOINTS = f"{DOMAIN}/subscribe_setpoints"
+WS_SETPOINT = f"{DOMAIN}/setpoint"
+
+# assinaturas abertas, por (conexão, id da mensagem de assinatura)
+_STREAMS = f"{DOMAIN}_setpoint_streams"
+
+
+@callback
+def async_register_websocket_commands(hass: HomeAssistant) -> None:
+    websocket_api.async_register_command(hass, ws_subscribe_setpoints)
+    websocket_api.async_register_command(hass, ws_setpoint)
+
+
+@callback
+def async_close_setpoint_streams(hass: HomeAssistant, entry_id: str) -> None:
+    """Encerra as assinaturas atendidas pela entrada que está sendo descarregada."""
+    streams: Optional[SetpointStreams] = hass.data.get(_STREAMS)
+    if streams is not None:
+        streams.close_entry(entry_id)
+
+
+def _resolve(
+    hass: HomeAssistant, device: str
+) -> Optional[Tuple[str, Dict[str, Any], str]]:
+    """Entrada, dados da entrada e ID da câmera, procurando em todas as contas."""
+    for entry_id, data in hass.data.get(DOMAIN, {}).items():
+        device_id = data["directory"].resolve(device)
+        if device_id:
+            return entry_id, data, device_id
+    return None
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): WS_SUBSCRIBE_SETPOINTS,
+        vol.Required("device"): str,
+    }
+)
+@callback
+def ws_subscribe_setpoints(
+    hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: Dict[str, Any]
+) -> None:
+    """Abre um fluxo de alvos para uma câmera.
+
+    A câmera é resolvida uma vez aqui; depois cada ``imou_control/setpoint``
+    com ``subscription`` igual ao ``id`` desta mensagem envia um alvo. Cada
+    alvo aplicado gera um evento com ``status``, ``latency_ms`` e ``dropped``.
+    """
+    found = _resolve(hass, msg["device"])
+    if found is None:
+        connection.send_error(
+            msg["id"], websocket_api.ERR_NOT_FOUND, f"Dispositivo {msg['device']} não encontrado"
+        )
+        return
+    entry_id, data, device_id = found
+    api, commands, tours = data["api"], data["commands"], data["tours"]
+    directory = data["directory"]
+
+    async def _apply(h: float, v: float, z: float) -> None:
+        tours.preempt(device_id)
+        directory.forget_preset(device_id)
+        await commands.submit(device_id, partial(api.set_position, device_id, h, v, z))
+
+    @callback
+    def _send(result: Dict[str, Any]) -> None:
+        connection.send_message(websocket_api.event_message(msg["id"], result))
+
+    stream = SetpointStream(
+        _apply,
+        _send,
+        lambda coro, name: hass.async_create_background_task(coro, name),
+    )
+    streams: SetpointStreams = hass.data.setdefault(_STREAMS, SetpointStreams())
+    key = (id(connection), msg["id"])
+
+    @callback
+    def _end() -> None:
+        # a entrada foi descarregada: o cliente precisa assinar de novo
+        connection.subscriptions.pop(msg["id"], None)
+        connection.send_error(
+            msg["id"],
+            websocket_api.ERR_HOME_ASSISTANT_ERROR,
+            "Integração recarregada; assine novamente",
+        )
+
+    streams.add(key, entry_id, stream, _end)
+    connection.subscriptions[msg["id"]] = partial(streams.discard, key)
+    connection.send_result(msg["id"], {"device_id": device_id})
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): WS_SETPOINT,
+        vol.Required("subscription"): int,
+        vol.Required("h"): vol.Coerce(float),
+        vol.Required("v"): vol.Coerce(float),
+        vol.Optional("z", default=0.0): vol.Coerce(float),
+    }
+)
+@callback
+def ws_setpoint(
+    hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: Dict[str, Any]
+) -> None:
+    """Envia um alvo para o fluxo aberto por ``imou_control/subscribe_setpoints``."""
+    streams: Optional[SetpointStreams] = hass.data.get(_STREAMS)
+    stream = None if streams is None else streams.get((id(connection), msg["subscription"]))
+    if stream is None:
+        connection.send_error(msg["id"], websocket_api.ERR_NOT_FOUND, "Assinatura não encontrada")
+        return
+    # confirma o recebimento na hora; a aplicação é confirmada no evento
+    connection.send_result(msg["id"])
+    stream.push(msg["h"], msg["v"], msg["z"])
@@ -39,6 +39,12 @@ def _ensure_usage_stub() -> None:
         def note_call(self, *_args: Any, **_kwargs: Any) -> None:
             pass
 
+        def note_skipped(self) -> None:
+            pass
+
+        def should_defer(self, *_args: Any, **_kwargs: Any) -> bool:
+            return False
+
         async def async_load(self) -> None:
             return None
 
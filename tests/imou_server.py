@@ -0,0 +1,263 @@
+"""Servidor local que imita a Imou OpenAPI para testes e benchmarks.
+
+Atende ``/openapi/accessToken``, ``/openapi/controlLocationPTZ``,
+``/openapi/controlMovePTZ`` e ``/openapi/deviceOpenList`` conferindo a assinatura do bloco ``system`` como a
+nuvem faz. Latência, expiração de token (``TK1002``), erros 5xx, timeouts e
+limite de taxa (HTTP 429) podem ser injetados; a conta pode ter milhares de
+câmeras sintéticas.
+
+    async with ImouServer(devices=5000) as server:
+        client = ApiClient("app", "secret", server.url, session, ...)
+"""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import itertools
+import json
+import time
+from collections import Counter, deque
+from typing import Any, Callable, Deque, Dict, List, Optional, Set, Tuple
+
+from aiohttp import web
+
+TOKEN_PATH = "/openapi/accessToken"
+PTZ_PATH = "/openapi/controlLocationPTZ"
+DEVICE_LIST_PATH = "/openapi/deviceOpenList"
+PTZ_MOVE_PATH = "/openapi/controlMovePTZ"
+
+# Códigos de resultado devolvidos pelo servidor
+CODE_OK = "0"
+CODE_TOKEN_EXPIRED = "TK1002"
+CODE_BAD_SIGN = "SN1001"
+CODE_UNKNOWN_DEVICE = "DV1002"
+
+# Falhas injetáveis (ver ImouServer.inject)
+FAULT_HTTP_500 = "http_500"
+FAULT_HTTP_503 = "http_503"
+FAULT_TIMEOUT = "timeout"
+FAULT_TOKEN_EXPIRED = "token_expired"
+
+_Handler = Callable[[Dict[str, Any]], Tuple[str, str, Dict[str, Any]]]
+
+
+class ImouServer:
+    """Imitação da OpenAPI servida por aiohttp em ``127.0.0.1`` (porta livre).
+
+    ``latency`` atrasa cada resposta; ``rate_limit`` (requisições/s, com
+    rajada ``rate_burst``) responde 429 ao que passar do limite. As falhas de
+    :meth:`inject` são consumidas uma por requisição, na ordem, por endpoint.
+    """
+
+    def __init__(
+        self,
+        app_id: str = "app",
+        app_secret: str = "secret",
+        *,
+        devices: int = 3,
+        token_ttl: int = 259200,
+        latency: float = 0.0,
+        rate_limit: float = 0.0,
+        rate_burst: int = 10,
+    ) -> None:
+        self.app_id = app_id
+        self.app_secret = app_secret
+        self.token_ttl = token_ttl
+        self.latency = latency
+        self.rate_limit = rate_limit
+        self.rate_burst = rate_burst
+        self.devices: List[Dict[str, Any]] = [
+            {
+                "deviceId": f"CAM{index:05d}",
+                "deviceName": f"Camera {index}",
+                "bindId": index + 1,
+                "channelNum": 1,
+            }
+            for index in range(devices)
+        ]
+        self._device_ids = {info["deviceId"] for info in self.devices}
+        # token -> instante (time.time) em que expira
+        self._tokens: Dict[str, float] = {}
+        self._token_seq = itertools.count(1)
+        self._seen_nonces: Set[str] = set()
+        self._faults: Dict[str, Deque[str]] = {}
+        self._bucket = float(rate_burst)
+        self._bucket_at = time.monotonic()
+        self._release = asyncio.Event()
+        self._runner: Optional[web.AppRunner] = None
+        self.url = ""
+        # o que chegou ao servidor, para as verificações dos testes
+        self.requests: Counter[str] = Counter()
+        self.moves: List[Tuple[str, float, float, float]] = []
+        # (deviceId, operation, duration) de controlMovePTZ
+        self.continuous_moves: List[Tuple[str, int, int]] = []
+        self.rejected: Counter[str] = Counter()
+        self.tokens_issued = 0
+
+    async def __aenter__(self) -> "ImouServer":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *_exc: Any) -> None:
+        await self.close()
+
+    async def start(self) -> str:
+        app = web.Application()
+        app.router.add_post(TOKEN_PATH, self._handle_token)
+        app.router.add_post(PTZ_PATH, self._handle_ptz)
+        app.router.add_post(DEVICE_LIST_PATH, self._handle_device_list)
+        app.router.add_post(PTZ_MOVE_PATH, self._handle_ptz_move)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", 0)
+        await site.start()
+        port = self._runner.addresses[0][1]
+        self.url = f"http://127.0.0.1:{port}"
+        return self.url
+
+    async def close(self) -> None:
+        # solta as requisições presas em FAULT_TIMEOUT antes de desligar
+        self._release.set()
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    # ---- controle dos testes ----
+
+    def inject(self, path: str, *faults: str) -> None:
+        """Enfileira falhas para as próximas requisições a ``path``."""
+        self._faults.setdefault(path, deque()).extend(faults)
+
+    def expire_tokens(self) -> None:
+        """Invalida todos os tokens emitidos (a próxima chamada recebe TK1002)."""
+        self._tokens.clear()
+
+    # ---- tratamento das requisições ----
+
+    async def _handle_token(self, request: web.Request) -> web.StreamResponse:
+        return await self._serve(request, TOKEN_PATH, self._issue_token)
+
+    async def _handle_ptz(self, request: web.Request) -> web.StreamResponse:
+        return await self._serve(request, PTZ_PATH, self._move)
+
+    async def _handle_device_list(self, request: web.Request) -> web.StreamResponse:
+        return await self._serve(request, DEVICE_LIST_PATH, self._list_devices)
+
+    async def _handle_ptz_move(self, request: web.Request) -> web.StreamResponse:
+        return await self._serve(request, PTZ_MOVE_PATH, self._move_continuous)
+
+    async def _serve(
+        self, request: web.Request, path: str, handler: _Handler
+    ) -> web.StreamResponse:
+        self.requests[path] += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        if not self._take_rate_token():
+            self.rejected[path] += 1
+            raise web.HTTPTooManyRequests()
+
+        fault = self._next_fault(path)
+        if fault == FAULT_TIMEOUT:
+            # segura a resposta até o cliente desistir ou o servidor fechar
+            await self._release.wait()
+            raise web.HTTPServiceUnavailable()
+        if fault == FAULT_HTTP_500:
+            self.rejected[path] += 1
+            raise web.HTTPInternalServerError()
+        if fault == FAULT_HTTP_503:
+            self.rejected[path] += 1
+            raise web.HTTPServiceUnavailable()
+
+        body = json.loads(await request.read())
+        request_id = body.get("id")
+        if not self._signature_ok(body.get("system") or {}):
+            self.rejected[path] += 1
+            return self._result(request_id, CODE_BAD_SIGN, "sign is invalid")
+
+        params = body.get("params") or {}
+        if path != TOKEN_PATH:
+            if fault == FAULT_TOKEN_EXPIRED or not self._token_ok(params.get("token")):
+                self.rejected[path] += 1
+                return self._result(request_id, CODE_TOKEN_EXPIRED, "token is expired")
+
+        code, msg, data = handler(params)
+        if code != CODE_OK:
+            self.rejected[path] += 1
+        return self._result(request_id, code, msg, data)
+
+    def _issue_token(self, _params: Dict[str, Any]) -> Tuple[str, str, Dict[str, Any]]:
+        token = f"At_{next(self._token_seq):08d}"
+        self.tokens_issued += 1
+        self._tokens[token] = time.time() + self.token_ttl
+        return CODE_OK, "Operation is successful.", {
+            "accessToken": token,
+            "expireTime": self.token_ttl,
+        }
+
+    def _move(self, params: Dict[str, Any]) -> Tuple[str, str, Dict[str, Any]]:
+        device_id = params.get("deviceId")
+        if device_id not in self._device_ids:
+            return CODE_UNKNOWN_DEVICE, "device does not exist", {}
+        self.moves.append(
+            (device_id, float(params["h"]), float(params["v"]), float(params["z"]))
+        )
+        return CODE_OK, "Operation is successful.", {}
+
+    def _move_continuous(self, params: Dict[str, Any]) -> Tuple[str, str, Dict[str, Any]]:
+        device_id = params.get("deviceId")
+        if device_id not in self._device_ids:
+            return CODE_UNKNOWN_DEVICE, "device does not exist", {}
+        self.continuous_moves.append(
+            (device_id, int(params["operation"]), int(params["duration"]))
+        )
+        return CODE_OK, "Operation is successful.", {}
+
+    def _list_devices(self, params: Dict[str, Any]) -> Tuple[str, str, Dict[str, Any]]:
+        cursor = int(params.get("bindId", -1))
+        limit = int(params.get("limit", 128))
+        # bindId cresce com o índice: a página começa logo após o cursor
+        start = max(cursor, 0)
+        page = self.devices[start : start + limit]
+        return CODE_OK, "Operation is successful.", {
+            "count": len(page),
+            "deviceList": page,
+        }
+
+    # ---- auxiliares ----
+
+    def _signature_ok(self, system: Dict[str, Any]) -> bool:
+        nonce = str(system.get("nonce", ""))
+        if system.get("appId") != self.app_id or not nonce or nonce in self._seen_nonces:
+            return False
+        self._seen_nonces.add(nonce)
+        raw = f"time:{system.get('time')},nonce:{nonce},appSecret:{self.app_secret}"
+        return system.get("sign") == hashlib.md5(raw.encode("utf-8")).hexdigest()
+
+    def _token_ok(self, token: Optional[str]) -> bool:
+        expires = self._tokens.get(token or "")
+        return expires is not None and time.time() < expires
+
+    def _next_fault(self, path: str) -> Optional[str]:
+        faults = self._faults.get(path)
+        return faults.popleft() if faults else None
+
+    def _take_rate_token(self) -> bool:
+        if self.rate_limit <= 0:
+            return True
+        now = time.monotonic()
+        self._bucket = min(
+            self.rate_burst, self._bucket + (now - self._bucket_at) * self.rate_limit
+        )
+        self._bucket_at = now
+        if self._bucket < 1:
+            return False
+        self._bucket -= 1
+        return True
+
+    @staticmethod
+    def _result(
+        request_id: Any, code: str, msg: str, data: Optional[Dict[str, Any]] = None
+    ) -> web.Response:
+        return web.json_response(
+            {"result": {"code": code, "msg": msg, "data": data or {}}, "id": request_id}
+        )
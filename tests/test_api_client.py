@@ -1,3 +1,4 @@
+import logging
 from unittest.mock import AsyncMock, MagicMock
 
 import pytest
@@ -46,6 +47,348 @@ async def test_call_with_retry_refreshes_token_on_tk1002(monkeypatch):
 
     assert result == responses[1]
     assert len(calls) == 2
-    assert calls[0]["token_override"] is None
+    assert calls[0]["token_override"] == "cached-token"
     assert calls[1]["token_override"] == "refreshed-token"
     assert token_refresher.await_count == 1
+
+
+@pytest.mark.asyncio
+async def test_call_with_retry_passes_seen_token_generation(monkeypatch):
+    token_refresher = AsyncMock(return_value="refreshed-token")
+
+    client = ApiClient(
+        app_id="app",
+        app_secret="secret",
+        base_url="https://example.com",
+        session=MagicMock(),
+        token_getter=AsyncMock(return_value="cached-token"),
+        token_refresher=token_refresher,
+        token_generation=lambda: 7,
+    )
+
+    responses = [
+        {"result": {"code": "TK1002", "msg": "token expired"}},
+        {"result": {"code": "0", "msg": "ok"}},
+    ]
+
+    async def fake_do_call(path, params, include_token=True, token_override=None):
+        return responses.pop(0)
+
+    monkeypatch.setattr(client, "_do_call", fake_do_call)
+
+    await client._call_with_retry("/test", {}, include_token=True)
+
+    token_refresher.assert_awaited_once_with(7)
+
+
+@pytest.mark.asyncio
+async def test_call_with_retry_uses_generation_of_the_token_it_sent(monkeypatch):
+    generation = [3]
+
+    async def token_getter():
+        # token vencido: get_token() busca outro e avança a geração
+        generation[0] += 1
+        return "fresh-token"
+
+    token_refresher = AsyncMock(return_value="refreshed-token")
+    client = ApiClient(
+        app_id="app",
+        app_secret="secret",
+        base_url="https://example.com",
+        session=MagicMock(),
+        token_getter=token_getter,
+        token_refresher=token_refresher,
+        token_generation=lambda: generation[0],
+    )
+    sent = []
+    responses = [
+        {"result": {"code": "TK1002", "msg": "token expired"}},
+        {"result": {"code": "0", "msg": "ok"}},
+    ]
+
+    async def fake_do_call(path, params, include_token=True, token_override=None):
+        sent.append(token_override)
+        return responses.pop(0)
+
+    monkeypatch.setattr(client, "_do_call", fake_do_call)
+
+    await client._call_with_retry("/test", {}, include_token=True)
+
+    assert sent == ["fresh-token", "refreshed-token"]
+    token_refresher.assert_awaited_once_with(4)
+
+
+@pytest.mark.asyncio
+async def test_background_calls_are_deferred_when_budget_is_nearly_spent(monkeypatch):
+    api_module = load_imou_module("api")
+    usage = MagicMock()
+    usage.should_defer.side_effect = lambda essential: not essential
+
+    client = api_module.ApiClient(
+        app_id="app",
+        app_secret="secret",
+        base_url="https://example.com",
+        session=MagicMock(),
+        token_getter=AsyncMock(return_value="token"),
+        usage=usage,
+    )
+    do_call = AsyncMock(return_value={"result": {"code": "0"}})
+    monkeypatch.setattr(client, "_do_call", do_call)
+
+    with pytest.raises(api_module.QuotaBudgetExceeded):
+        await client._call_with_retry(
+            "/test", {}, priority=api_module.PRIORITY_BACKGROUND
+        )
+    do_call.assert_not_awaited()
+
+    assert await client.set_position("cam", 0.1, 0.2)
+    assert do_call.await_count == 1
+
+
+def _device_page(start, count):
+    return {
+        "result": {
+            "code": "0",
+            "data": {
+                "deviceList": [
+                    {"deviceId": f"cam-{i}", "bindId": 1000 + i}
+                    for i in range(start, start + count)
+                ]
+            },
+        }
+    }
+
+
+@pytest.mark.asyncio
+async def test_iter_device_pages_follows_bind_id_cursor(monkeypatch):
+    client = ApiClient(
+        app_id="app",
+        app_secret="secret",
+        base_url="https://example.com",
+        session=MagicMock(),
+        token_getter=AsyncMock(return_value="token"),
+    )
+
+    pages = [_device_page(0, 3), _device_page(3, 3), _device_page(6, 1)]
+    cursors = []
+
+    async def fake_call(path, params, include_token=True, **_kwargs):
+        cursors.append(params["bindId"])
+        return pages[len(cursors) - 1]
+
+    monkeypatch.setattr(client, "_call_with_retry", fake_call)
+
+    received = [page async for page in client.iter_device_pages(page_size=3)]
+
+    assert [len(page) for page in received] == [3, 3, 1]
+    assert cursors == ["-1", "1002", "1005"]
+
+    cursors.clear()
+    devices = await client.list_devices()
+    assert len(devices) == 3  # página padrão (128) incompleta: só a 1ª consulta
+
+
+@pytest.mark.asyncio
+async def test_list_devices_returns_empty_when_a_page_fails(monkeypatch):
+    client = ApiClient(
+        app_id="app",
+        app_secret="secret",
+        base_url="https://example.com",
+        session=MagicMock(),
+        token_getter=AsyncMock(return_value="token"),
+    )
+    responses = [_device_page(0, 128)]
+
+    async def fake_call(path, params, include_token=True, **_kwargs):
+        if not responses:
+            raise RuntimeError("boom")
+        return responses.pop(0)
+
+    monkeypatch.setattr(client, "_call_with_retry", fake_call)
+
+    assert await client.list_devices() == []
+
+
+@pytest.mark.asyncio
+async def test_transient_failures_are_retried_for_idempotent_endpoints(monkeypatch, caplog):
+    api_module = load_imou_module("api")
+    resilience = load_imou_module("resilience")
+    client = api_module.ApiClient(
+        app_id="app",
+        app_secret="secret",
+        base_url="https://example.com",
+        session=MagicMock(),
+        token_getter=AsyncMock(return_value="token"),
+        retry_policy=resilience.RetryPolicy(attempts=3, base_delay=0, max_delay=0),
+    )
+    outcomes = [
+        api_module.TransientApiError("timeout"),
+        api_module.TransientApiError("503"),
+        {"result": {"code": "0"}},
+    ]
+
+    async def fake_do_call(path, params, include_token=True, token_override=None):
+        outcome = outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    monkeypatch.setattr(client, "_do_call", fake_do_call)
+
+    with caplog.at_level(logging.DEBUG):
+        assert await client.set_position("cam", 0.0, 0.0)
+    assert outcomes == []
+    assert client.breaker(api_module.PTZ_LOCATION_ENDPOINT).state == "closed"
+    # tentativas que o retry resolve não aparecem como erro
+    assert not [r for r in caplog.records if r.levelno >= logging.WARNING]
+
+
+@pytest.mark.asyncio
+async def test_open_circuit_fails_fast_without_calling_the_cloud(monkeypatch, caplog):
+    api_module = load_imou_module("api")
+    resilience = load_imou_module("resilience")
+    client = api_module.ApiClient(
+        app_id="app",
+        app_secret="secret",
+        base_url="https://example.com",
+        session=MagicMock(),
+        token_getter=AsyncMock(return_value="token"),
+        retry_policy=resilience.RetryPolicy(attempts=1),
+        breaker_threshold=2,
+    )
+    do_call = AsyncMock(side_effect=api_module.TransientApiError("timeout"))
+    monkeypatch.setattr(client, "_do_call", do_call)
+
+    for _ in range(2):
+        with pytest.raises(api_module.TransientApiError):
+            await client.set_position("cam", 0.0, 0.0)
+    errors = [r.getMessage() for r in caplog.records if r.levelno == logging.ERROR]
+    assert len(errors) == 3
+    assert sum("Circuito" in message for message in errors) == 1
+
+    with pytest.raises(RuntimeError, match="Circuito aberto"):
+        await client.set_position("cam", 0.0, 0.0)
+    assert do_call.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_set_position_skips_targets_close_to_the_last_one_sent(monkeypatch):
+    api_module = load_imou_module("api")
+    usage = MagicMock()
+    usage.should_defer.return_value = False
+    client = api_module.ApiClient(
+        app_id="app",
+        app_secret="secret",
+        base_url="https://example.com",
+        session=MagicMock(),
+        token_getter=AsyncMock(return_value="token"),
+        usage=usage,
+        dedup_epsilon=0.01,
+        dedup_ttl=60.0,
+    )
+    do_call = AsyncMock(return_value={"result": {"code": "0"}})
+    monkeypatch.setattr(client, "_do_call", do_call)
+    now = [1000.0]
+    monkeypatch.setattr(api_module.time, "monotonic", lambda: now[0])
+
+    assert await client.set_position("cam", 0.5, 0.5)
+    assert await client.set_position("cam", 0.505, 0.5)
+    assert do_call.await_count == 1
+    assert client.skipped_moves == {"cam": 1}
+    # o sensor de uso é avisado mesmo sem chamada à API
+    usage.note_skipped.assert_called_once_with()
+
+    assert await client.set_position("cam", 0.6, 0.5)
+    assert await client.set_position("other", 0.6, 0.5)
+    assert do_call.await_count == 3
+
+    now[0] += 61.0
+    assert await client.set_position("cam", 0.6, 0.5)
+    assert do_call.await_count == 4
+
+    client.forget_position("cam")
+    assert await client.set_position("cam", 0.6, 0.5)
+    assert do_call.await_count == 5
+    assert client.skipped_moves == {"cam": 1}
+
+
+@pytest.mark.asyncio
+async def test_interactive_device_listing_is_not_skipped_by_the_budget(monkeypatch):
+    api_module = load_imou_module("api")
+    usage = MagicMock()
+    usage.should_defer.side_effect = lambda essential: not essential
+    client = api_module.ApiClient(
+        app_id="app",
+        app_secret="secret",
+        base_url="https://example.com",
+        session=MagicMock(),
+        token_getter=AsyncMock(return_value="token"),
+        usage=usage,
+    )
+    monkeypatch.setattr(
+        client, "_do_call", AsyncMock(return_value=_device_page(0, 3))
+    )
+
+    assert await client.list_devices() == []
+
+    pages = client.iter_device_pages(priority=api_module.PRIORITY_INTERACTIVE)
+    assert len(await anext(pages)) == 3
+
+
+@pytest.mark.asyncio
+async def test_broken_cursor_fails_instead_of_truncating_the_list(monkeypatch):
+    api_module = load_imou_module("api")
+    client = api_module.ApiClient(
+        app_id="app",
+        app_secret="secret",
+        base_url="https://example.com",
+        session=MagicMock(),
+        token_getter=AsyncMock(return_value="token"),
+    )
+    size = api_module.DEVICE_PAGE_SIZE
+    page = _device_page(0, size)
+    for info in page["result"]["data"]["deviceList"]:
+        info.pop("bindId")
+    monkeypatch.setattr(client, "_do_call", AsyncMock(return_value=page))
+
+    pages = client.iter_device_pages()
+    assert len(await anext(pages)) == size
+    with pytest.raises(RuntimeError, match="bindId"):
+        await anext(pages)
+
+    assert await client.list_devices() == []
+
+
+@pytest.mark.asyncio
+async def test_do_call_records_latency_and_errors_per_endpoint(monkeypatch):
+    api_module = load_imou_module("api")
+    api_metrics = load_imou_module("metrics").ApiMetrics()
+    client = api_module.ApiClient(
+        app_id="app",
+        app_secret="secret",
+        base_url="https://example.com",
+        session=MagicMock(),
+        token_getter=AsyncMock(return_value="token"),
+        metrics=api_metrics,
+    )
+    post = AsyncMock(
+        side_effect=[
+            {"result": {"code": "0"}},
+            {"result": {"code": "DV1007", "msg": "offline"}},
+            api_module.TransientApiError("Timeout ao chamar /ptz"),
+        ]
+    )
+    monkeypatch.setattr(client, "_post", post)
+
+    await client._do_call("/ptz", {"deviceId": "cam"})
+    await client._do_call("/ptz", {"deviceId": "cam"})
+    with pytest.raises(api_module.TransientApiError):
+        await client._do_call("/ptz", {"deviceId": "cam"})
+
+    histogram = api_metrics.histogram("/ptz")
+    assert (histogram.count, histogram.errors) == (3, 2)
+    assert [s.error for s in api_metrics.recent_errors] == [
+        "code=DV1007",
+        "Timeout ao chamar /ptz",
+    ]
+    assert post.await_args.args[2] == "cam"
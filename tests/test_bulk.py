@@ -0,0 +1,65 @@
+import asyncio
+
+import pytest
+
+from tests.helpers import load_imou_module
+
+bulk = load_imou_module("bulk")
+CommandSuperseded = bulk.CommandSuperseded
+
+DEVICES = {"Sala": "cam1", "Garagem": "cam2", "Porta": "cam3", "Quintal": "cam4"}
+
+
+@pytest.mark.asyncio
+async def test_run_bulk_respects_the_concurrency_limit():
+    running = 0
+    peak = 0
+    calls = []
+
+    async def runner(device_id, item):
+        nonlocal running, peak
+        calls.append(device_id)
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        return "moved"
+
+    items = [{"device": name} for name in DEVICES]
+    results = await bulk.run_bulk(items, DEVICES.get, runner, limit=2)
+
+    assert peak == 2
+    # uma execução (e um evento) por câmera
+    assert sorted(calls) == ["cam1", "cam2", "cam3", "cam4"]
+    assert [r["device_id"] for r in results] == ["cam1", "cam2", "cam3", "cam4"]
+    assert all(r["success"] and r["latency_ms"] >= 0 for r in results)
+
+
+@pytest.mark.asyncio
+async def test_run_bulk_reports_status_per_device():
+    preempted = []
+
+    async def runner(device_id, item):
+        if device_id == "cam1":
+            return "already_active"
+        if device_id == "cam2":
+            raise CommandSuperseded("cam2")
+        if device_id == "cam3":
+            raise RuntimeError("API falhou")
+        return "preset_not_found"
+
+    items = [{"device": name} for name in [*DEVICES, "Inexistente"]]
+    results = await bulk.run_bulk(
+        items, DEVICES.get, runner, limit=4, on_device=preempted.append
+    )
+
+    assert [(r["device"], r["status"], r["success"]) for r in results] == [
+        ("Sala", "already_active", True),
+        ("Garagem", "superseded", False),
+        ("Porta", "error", False),
+        ("Quintal", "preset_not_found", False),
+        ("Inexistente", "device_not_found", False),
+    ]
+    assert results[2]["error"] == "API falhou"
+    assert "latency_ms" not in results[4]
+    assert preempted == ["cam1", "cam2", "cam3", "cam4"]
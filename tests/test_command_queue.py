@@ -0,0 +1,90 @@
+import asyncio
+
+import pytest
+
+from tests.helpers import load_imou_module
+
+command_queue = load_imou_module("command_queue")
+LatestWinsQueue = command_queue.LatestWinsQueue
+CommandSuperseded = command_queue.CommandSuperseded
+
+
+@pytest.mark.asyncio
+async def test_only_latest_pending_command_is_sent():
+    queue = LatestWinsQueue()
+    release = asyncio.Event()
+    sent = []
+
+    async def send(target, wait=False):
+        sent.append(target)
+        if wait:
+            await release.wait()
+        return target
+
+    first = asyncio.create_task(queue.submit("cam", lambda: send(1, wait=True)))
+    await asyncio.sleep(0)
+    stale = [
+        asyncio.create_task(queue.submit("cam", lambda t=t: send(t))) for t in (2, 3)
+    ]
+    latest = asyncio.create_task(queue.submit("cam", lambda: send(4)))
+    await asyncio.sleep(0)
+
+    release.set()
+
+    assert await first == 1
+    assert await latest == 4
+    for task in stale:
+        with pytest.raises(CommandSuperseded):
+            await task
+    assert sent == [1, 4]
+    assert queue.dropped == {"cam": 2}
+    assert queue.in_flight == set()
+
+
+@pytest.mark.asyncio
+async def test_devices_are_independent():
+    queue = LatestWinsQueue()
+    release = asyncio.Event()
+
+    async def slow():
+        await release.wait()
+        return "a"
+
+    async def fast():
+        return "b"
+
+    slow_task = asyncio.create_task(queue.submit("cam-a", slow))
+    await asyncio.sleep(0)
+
+    assert await queue.submit("cam-b", fast) == "b"
+    assert queue.in_flight == {"cam-a"}
+
+    release.set()
+    assert await slow_task == "a"
+    assert queue.total_dropped == 0
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_does_not_block_device():
+    queue = LatestWinsQueue()
+    release = asyncio.Event()
+
+    async def slow():
+        await release.wait()
+
+    running = asyncio.create_task(queue.submit("cam", slow))
+    await asyncio.sleep(0)
+    waiter = asyncio.create_task(queue.submit("cam", slow))
+    await asyncio.sleep(0)
+    waiter.cancel()
+    release.set()
+    await running
+
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+    assert queue.in_flight == set()
+
+    async def quick():
+        return "ok"
+
+    assert await queue.submit("cam", quick) == "ok"
@@ -0,0 +1,58 @@
+import asyncio
+
+import pytest
+
+from tests.helpers import load_imou_module
+from tests.imou_server import ImouServer
+
+api = load_imou_module("api")
+connection = load_imou_module("connection")
+token_manager = load_imou_module("token_manager")
+
+
+@pytest.mark.asyncio
+async def test_commands_reuse_the_pooled_connection():
+    async with ImouServer() as server:
+        pool = connection.ConnectionPool(server.url)
+        tm = token_manager.TokenManager("app", "secret", server.url, pool.session)
+        client = api.ApiClient(
+            "app", "secret", server.url, pool.session, tm.get_token, tm.refresh_token
+        )
+
+        for step in range(5):
+            await client.set_position("CAM00000", step / 5, 0.0)
+        stats = pool.stats
+        await pool.async_close()
+
+    assert stats["requests"] == 6
+    assert stats["connections_created"] == 1
+    assert stats["connections_reused"] == 5
+    assert stats["reuse_ratio"] == pytest.approx(5 / 6, abs=0.001)
+
+
+@pytest.mark.asyncio
+async def test_keep_warm_probes_only_while_idle_and_stops_on_close():
+    async with ImouServer() as server:
+        pool = connection.ConnectionPool(server.url, keep_warm=0.05)
+        pool.async_start_keep_warm()
+        await asyncio.sleep(0.22)
+        probes = pool.stats["keep_warm_probes"]
+
+        await pool.async_close()
+        await asyncio.sleep(0.1)
+
+    assert 3 <= probes <= 6
+    assert pool.stats["keep_warm_probes"] == probes
+    assert pool.stats["connections_created"] == 1
+    # nenhuma chamada à OpenAPI
+    assert not server.requests
+
+
+@pytest.mark.asyncio
+async def test_keep_warm_is_off_by_default():
+    pool = connection.ConnectionPool("http://127.0.0.1:9")
+    pool.async_start_keep_warm()
+    await asyncio.sleep(0)
+
+    assert pool.stats["keep_warm_probes"] == 0
+    await pool.async_close()
@@ -0,0 +1,115 @@
+from tests.helpers import load_imou_module
+
+devices = load_imou_module("devices")
+
+
+def _directory(presets=None):
+    return devices.DeviceDirectory({}, {}, presets if presets is not None else {})
+
+
+def test_cached_list_builds_devices_before_the_cloud_answers():
+    saved = {"cam1": {"porta": (0.1, 0.2, 0.0)}}
+    directory = _directory(saved)
+    cached = [
+        {"deviceId": "cam1", "deviceName": "Sala"},
+        {"deviceId": "cam2", "deviceName": None},
+        {"deviceName": "sem id"},
+    ]
+
+    results = [directory.apply(info) for info in cached]
+
+    assert results == [
+        ("cam1", devices.DEVICE_ADDED),
+        ("cam2", devices.DEVICE_ADDED),
+        (None, None),
+    ]
+    assert directory.devices["cam1"]["name"] == "Imou Sala"
+    assert directory.devices["cam2"]["name"] == "Imou cam2"
+    assert directory.resolve("Sala") == "cam1"
+    assert directory.resolve("Imou Sala") == "cam1"
+    assert directory.resolve("cam2") == "cam2"
+    # os presets da entrada são os mesmos objetos guardados no store
+    assert directory.devices["cam1"]["presets"] is saved["cam1"]
+    directory.devices["cam2"]["presets"]["novo"] = (0.0, 0.0, 0.0)
+    assert saved["cam2"] == {"novo": (0.0, 0.0, 0.0)}
+
+
+def test_revalidation_renames_without_recreating_devices():
+    directory = _directory()
+    directory.apply({"deviceId": "cam1", "deviceName": "Sala"})
+    entry = directory.devices["cam1"]
+    entry["last_preset"] = "porta"
+
+    assert directory.apply({"deviceId": "cam1", "deviceName": "Sala"}) == ("cam1", None)
+    assert directory.apply({"deviceId": "cam1", "deviceName": "Varanda"}) == (
+        "cam1",
+        devices.DEVICE_RENAMED,
+    )
+
+    assert directory.devices["cam1"] is entry
+    assert entry["name"] == "Imou Varanda"
+    assert entry["last_preset"] == "porta"
+    assert directory.resolve("Sala") is None
+    assert directory.resolve("Imou Sala") is None
+    assert directory.resolve("Varanda") == "cam1"
+
+
+def test_remove_keeps_presets_of_the_camera():
+    saved = {}
+    directory = _directory(saved)
+    directory.apply({"deviceId": "cam1", "deviceName": "Sala"})
+    directory.devices["cam1"]["presets"]["porta"] = (0.1, 0.2, 0.0)
+
+    assert directory.remove("cam1")
+    assert not directory.remove("cam1")
+    assert directory.resolve("Sala") is None
+    assert saved == {"cam1": {"porta": (0.1, 0.2, 0.0)}}
+
+
+def test_cache_payload_keeps_only_id_and_name():
+    info = [
+        {"deviceId": "cam1", "deviceName": "Sala", "bindId": 7, "channels": []},
+        {"deviceName": "sem id"},
+    ]
+
+    assert devices.cache_payload(info) == [{"deviceId": "cam1", "deviceName": "Sala"}]
+
+
+def test_cameras_are_removed_only_after_consecutive_missing_scans():
+    directory = _directory()
+    for device_id in ("cam1", "cam2", "cam3"):
+        directory.apply({"deviceId": device_id, "deviceName": device_id})
+
+    assert directory.stale_devices(["cam1"], scans=2) == []
+    # cam2 volta a aparecer: a contagem recomeça
+    assert directory.stale_devices(["cam1", "cam2"], scans=2) == ["cam3"]
+    assert directory.stale_devices(["cam1"], scans=2) == ["cam3"]
+
+    directory.remove("cam3")
+    assert directory.stale_devices(["cam1"], scans=2) == ["cam2"]
+
+
+class _Select:
+    def __init__(self):
+        self.writes = 0
+
+    def async_write_ha_state(self):
+        self.writes += 1
+
+
+def test_move_away_from_preset_lets_the_same_preset_move_again():
+    directory = _directory({"cam1": {"porta": (0.1, 0.2, 0.0)}})
+    directory.apply({"deviceId": "cam1", "deviceName": "Sala"})
+    dev = directory.devices["cam1"]
+    dev["select_entity"] = select = _Select()
+    dev["last_preset"] = "porta"
+
+    # start_move tira a câmera do preset
+    assert directory.forget_preset("cam1")
+
+    # call_preset só ignora o preset se ele ainda for o ativo
+    assert dev["last_preset"] != "porta"
+    assert select.writes == 1
+    assert not directory.forget_preset("cam1")
+    assert not directory.forget_preset("cam9")
+    assert select.writes == 1
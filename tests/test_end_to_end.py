@@ -0,0 +1,170 @@
+import asyncio
+
+import aiohttp
+import pytest
+
+from tests.helpers import load_imou_module
+from tests.imou_server import (
+    DEVICE_LIST_PATH,
+    FAULT_HTTP_500,
+    FAULT_HTTP_503,
+    FAULT_TIMEOUT,
+    PTZ_MOVE_PATH,
+    PTZ_PATH,
+    TOKEN_PATH,
+    ImouServer,
+)
+
+api = load_imou_module("api")
+metrics = load_imou_module("metrics")
+rate_limit = load_imou_module("rate_limit")
+token_manager = load_imou_module("token_manager")
+
+
+def _clients(server, session, *, app_secret=None, request_timeout=2.0, **kwargs):
+    tm = token_manager.TokenManager(
+        server.app_id,
+        app_secret or server.app_secret,
+        server.url,
+        session,
+        request_timeout=request_timeout,
+    )
+    kwargs.setdefault(
+        "retry_policy", api.RetryPolicy(attempts=3, base_delay=0.01, max_delay=0.02)
+    )
+    client = api.ApiClient(
+        server.app_id,
+        app_secret or server.app_secret,
+        server.url,
+        session,
+        tm.get_token,
+        tm.refresh_token,
+        token_generation=lambda: tm.generation,
+        request_timeout=request_timeout,
+        **kwargs,
+    )
+    return tm, client
+
+
+@pytest.mark.asyncio
+async def test_signed_move_reaches_the_server_with_one_token():
+    async with ImouServer() as server, aiohttp.ClientSession() as session:
+        _tm, client = _clients(server, session)
+
+        assert await client.set_position("CAM00000", 0.25, -0.5)
+        assert await client.set_position("CAM00001", 0.1, 0.2, 0.3)
+
+    assert server.moves == [("CAM00000", 0.25, -0.5, 0.0), ("CAM00001", 0.1, 0.2, 0.3)]
+    assert server.tokens_issued == 1
+    assert not server.rejected
+
+
+@pytest.mark.asyncio
+async def test_expired_token_is_refreshed_once_for_concurrent_commands():
+    async with ImouServer(devices=10) as server, aiohttp.ClientSession() as session:
+        _tm, client = _clients(server, session)
+        await client.set_position("CAM00000", 0.0, 0.0)
+        server.expire_tokens()
+
+        await asyncio.gather(
+            *(client.set_position(f"CAM{i:05d}", 0.5, 0.5) for i in range(10))
+        )
+
+    assert server.rejected[PTZ_PATH] == 10
+    assert server.tokens_issued == 2
+    assert len(server.moves) == 11
+
+
+@pytest.mark.asyncio
+async def test_server_errors_and_timeouts_are_retried():
+    api_metrics = metrics.ApiMetrics()
+    async with ImouServer() as server, aiohttp.ClientSession() as session:
+        _tm, client = _clients(server, session, request_timeout=0.2, metrics=api_metrics)
+        server.inject(PTZ_PATH, FAULT_HTTP_503, FAULT_TIMEOUT)
+
+        assert await client.set_position("CAM00000", 0.25, 0.25)
+
+        server.inject(PTZ_PATH, FAULT_HTTP_500, FAULT_HTTP_503, FAULT_HTTP_503)
+        with pytest.raises(api.TransientApiError):
+            await client.set_position("CAM00000", 0.5, 0.5)
+
+    assert server.requests[PTZ_PATH] == 6
+    assert server.moves == [("CAM00000", 0.25, 0.25, 0.0)]
+    errors = [s.error for s in api_metrics.recent_errors]
+    assert errors[1].startswith("Timeout")
+    assert api_metrics.histogram(PTZ_PATH).errors == 5
+
+
+@pytest.mark.asyncio
+async def test_client_rate_limiter_keeps_below_the_server_throttle():
+    server = ImouServer(rate_limit=10, rate_burst=2)
+    async with server, aiohttp.ClientSession() as session:
+        _tm, client = _clients(server, session, retry_policy=api.RetryPolicy(attempts=1))
+        # o token também conta no limite do servidor
+        await client.set_position("CAM00000", 0.1, 0.1)
+        with pytest.raises(api.TransientApiError):
+            await client.set_position("CAM00000", 0.2, 0.2)
+        assert server.rejected[PTZ_PATH] == 1
+
+    # com folga no servidor: a ordem de chegada pode variar alguns ms
+    server = ImouServer(rate_limit=10, rate_burst=2)
+    async with server, aiohttp.ClientSession() as session:
+        tm, client = _clients(
+            server,
+            session,
+            retry_policy=api.RetryPolicy(attempts=1),
+            rate_limiter=rate_limit.PriorityRateLimiter(5, 1),
+        )
+        await tm.get_token()
+        for step in range(4):
+            await client.set_position("CAM00000", step / 10, 0.0)
+
+    assert not server.rejected
+    assert len(server.moves) == 4
+
+
+@pytest.mark.asyncio
+async def test_large_account_is_listed_page_by_page():
+    async with ImouServer(devices=3000) as server, aiohttp.ClientSession() as session:
+        _tm, client = _clients(server, session)
+
+        devices = await client.list_devices()
+
+    assert len(devices) == 3000
+    assert len({info["deviceId"] for info in devices}) == 3000
+    assert server.requests[DEVICE_LIST_PATH] == -(-3000 // api.DEVICE_PAGE_SIZE)
+
+
+@pytest.mark.asyncio
+async def test_wrong_secret_is_rejected_by_the_signature_check():
+    async with ImouServer() as server, aiohttp.ClientSession() as session:
+        tm, _client = _clients(server, session, app_secret="wrong")
+
+        with pytest.raises(RuntimeError, match="SN1001"):
+            await tm.get_token()
+
+    assert server.rejected[TOKEN_PATH] == 1
+    assert server.tokens_issued == 0
+
+
+@pytest.mark.asyncio
+async def test_continuous_moves_are_not_retried_and_reset_the_last_position():
+    async with ImouServer() as server, aiohttp.ClientSession() as session:
+        _tm, client = _clients(server, session)
+        await client.set_position("CAM00000", 0.5, 0.5)
+
+        assert await client.move_ptz("CAM00000", 2, 500)
+        # a posição mudou: o mesmo alvo absoluto é enviado de novo
+        await client.set_position("CAM00000", 0.5, 0.5)
+
+        server.inject(PTZ_MOVE_PATH, FAULT_HTTP_503)
+        with pytest.raises(api.TransientApiError):
+            await client.move_ptz("CAM00000", 3, 500)
+
+        server.expire_tokens()
+        assert await client.move_ptz("CAM00000", 10, 0)
+
+    assert len(server.moves) == 2
+    assert server.continuous_moves == [("CAM00000", 2, 500), ("CAM00000", 10, 0)]
+    # 503 sem nova tentativa; TK1002 repetido uma vez com o token novo
+    assert server.requests[PTZ_MOVE_PATH] == 4
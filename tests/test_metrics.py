@@ -0,0 +1,50 @@
+import pytest
+
+from tests.helpers import load_imou_module
+
+metrics = load_imou_module("metrics")
+
+
+def test_percentiles_land_in_the_bucket_of_the_sample():
+    histogram = metrics.LatencyHistogram()
+    for latency_ms in [100.0] * 90 + [800.0] * 9 + [5000.0]:
+        histogram.record(latency_ms)
+
+    # limite superior do balde: no máximo ~19% acima do valor real
+    assert 100.0 <= histogram.percentile(0.50) < 100.0 * 1.19
+    assert 800.0 <= histogram.percentile(0.95) < 800.0 * 1.19
+    assert histogram.percentile(0.99) == pytest.approx(800.0, rel=0.19)
+    assert histogram.percentile(1.0) == 5000.0
+
+
+def test_slow_calls_beyond_the_last_bucket_report_the_maximum():
+    histogram = metrics.LatencyHistogram()
+    histogram.record(0.2)
+    histogram.record(120_000.0)
+
+    assert histogram.percentile(0.5) == 1.0
+    assert histogram.percentile(0.99) == 120_000.0
+
+
+def test_empty_histogram_has_no_percentiles_or_error_rate():
+    histogram = metrics.LatencyHistogram()
+
+    assert histogram.percentile(0.5) is None
+    assert histogram.error_rate is None
+
+
+def test_api_metrics_tracks_errors_and_recent_samples_per_endpoint():
+    api_metrics = metrics.ApiMetrics(recent=3)
+    api_metrics.record("/openapi/controlLocationPTZ", 0.120)
+    api_metrics.record("/openapi/controlLocationPTZ", 0.300, "code=DV1007")
+    for _ in range(3):
+        api_metrics.record("/openapi/accessToken", 0.050)
+
+    ptz = api_metrics.histogram("/openapi/controlLocationPTZ")
+    assert (ptz.count, ptz.errors, ptz.error_rate) == (2, 1, 0.5)
+    # o erro sai das amostras recentes, mas continua na lista de erros
+    assert [s.endpoint for s in api_metrics.recent] == ["/openapi/accessToken"] * 3
+    assert [s.error for s in api_metrics.recent_errors] == ["code=DV1007"]
+    summary = api_metrics.summary()
+    assert summary["/openapi/accessToken"]["count"] == 3
+    assert summary["/openapi/controlLocationPTZ"]["max_ms"] == 300.0
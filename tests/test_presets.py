@@ -0,0 +1,35 @@
+import pytest
+
+from tests.helpers import load_imou_module
+
+presets = load_imou_module("presets")
+
+
+def test_encode_and_decode_round_trip_skipping_empty_devices():
+    data = {"cam1": {"porta": (0.1, -0.2, 0.0), "garagem": (0.5, 0.5, 0.3)}, "cam2": {}}
+
+    encoded = presets.encode_presets(data)
+
+    assert encoded == {
+        "devices": {"cam1": [["porta", 0.1, -0.2, 0.0], ["garagem", 0.5, 0.5, 0.3]]}
+    }
+    assert presets.decode_presets(encoded) == {
+        "cam1": {"porta": (0.1, -0.2, 0.0), "garagem": (0.5, 0.5, 0.3)}
+    }
+    assert presets.decode_presets(None) == {}
+
+
+def test_migrate_from_v1_keeps_every_device():
+    old = {"cam1": {"porta": [0.1, -0.2, 0.0]}, "offline": {"varanda": [1, 0]}}
+
+    migrated = presets.migrate_presets(1, old)
+
+    assert presets.decode_presets(migrated) == {
+        "cam1": {"porta": (0.1, -0.2, 0.0)},
+        "offline": {"varanda": (1.0, 0.0, 0.0)},
+    }
+
+
+def test_migrate_rejects_unknown_versions():
+    with pytest.raises(NotImplementedError):
+        presets.migrate_presets(99, {})
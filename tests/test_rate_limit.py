@@ -0,0 +1,70 @@
+import asyncio
+
+import pytest
+
+from tests.helpers import load_imou_module
+
+rate_limit = load_imou_module("rate_limit")
+PriorityRateLimiter = rate_limit.PriorityRateLimiter
+RequestPreempted = rate_limit.RequestPreempted
+PRIORITY_INTERACTIVE = rate_limit.PRIORITY_INTERACTIVE
+PRIORITY_BACKGROUND = rate_limit.PRIORITY_BACKGROUND
+
+
+@pytest.mark.asyncio
+async def test_burst_is_served_immediately():
+    limiter = PriorityRateLimiter(rate=1, burst=3)
+
+    await asyncio.wait_for(
+        asyncio.gather(*(limiter.acquire() for _ in range(3))), timeout=0.1
+    )
+
+    with pytest.raises(asyncio.TimeoutError):
+        await asyncio.wait_for(limiter.acquire(), timeout=0.05)
+
+
+@pytest.mark.asyncio
+async def test_interactive_lane_goes_first():
+    limiter = PriorityRateLimiter(rate=50, burst=1)
+    await limiter.acquire()
+    order = []
+
+    async def take(priority, label):
+        await limiter.acquire(priority)
+        order.append(label)
+
+    background = [
+        asyncio.create_task(take(PRIORITY_BACKGROUND, f"bg{i}")) for i in range(2)
+    ]
+    await asyncio.sleep(0)
+    interactive = asyncio.create_task(take(PRIORITY_INTERACTIVE, "ui"))
+
+    await asyncio.wait_for(asyncio.gather(*background, interactive), timeout=1)
+
+    assert order[0] == "ui"
+
+
+@pytest.mark.asyncio
+async def test_interactive_command_preempts_background_waiter_for_same_device():
+    limiter = PriorityRateLimiter(rate=20, burst=1)
+    await limiter.acquire()
+
+    same_device = asyncio.create_task(limiter.acquire(PRIORITY_BACKGROUND, "cam-1"))
+    other_device = asyncio.create_task(limiter.acquire(PRIORITY_BACKGROUND, "cam-2"))
+    await asyncio.sleep(0)
+
+    await asyncio.wait_for(limiter.acquire(PRIORITY_INTERACTIVE, "cam-1"), timeout=1)
+
+    with pytest.raises(RequestPreempted):
+        await same_device
+    await asyncio.wait_for(other_device, timeout=1)
+    assert limiter.preempted == 1
+
+
+@pytest.mark.asyncio
+async def test_zero_rate_disables_limit():
+    limiter = PriorityRateLimiter(rate=0, burst=1)
+
+    await asyncio.wait_for(
+        asyncio.gather(*(limiter.acquire() for _ in range(100))), timeout=0.1
+    )
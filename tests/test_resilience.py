@@ -0,0 +1,64 @@
+import pytest
+
+from tests.helpers import load_imou_module
+
+resilience = load_imou_module("resilience")
+CircuitBreaker = resilience.CircuitBreaker
+CircuitOpenError = resilience.CircuitOpenError
+RetryPolicy = resilience.RetryPolicy
+
+
+def test_breaker_opens_after_threshold_and_fails_fast():
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60)
+
+    for _ in range(2):
+        breaker.before_call()
+        breaker.record_failure()
+
+    assert breaker.state == CircuitBreaker.OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+
+def test_breaker_half_open_allows_single_probe(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(resilience.time, "monotonic", lambda: now[0])
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30)
+
+    breaker.before_call()
+    breaker.record_failure()
+    now[0] += 31
+
+    breaker.before_call()  # chamada de prova
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+    breaker.before_call()
+
+
+def test_failed_probe_reopens_circuit(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(resilience.time, "monotonic", lambda: now[0])
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=30)
+
+    for _ in range(3):
+        breaker.before_call()
+        breaker.record_failure()
+    now[0] += 31
+    breaker.before_call()
+    breaker.record_failure()
+
+    assert breaker.state == CircuitBreaker.OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+
+def test_retry_delay_is_capped_exponential_with_jitter():
+    policy = RetryPolicy(attempts=5, base_delay=0.5, max_delay=2.0)
+
+    for attempt, cap in enumerate([0.5, 1.0, 2.0, 2.0]):
+        for _ in range(20):
+            assert 0.0 <= policy.delay(attempt) <= cap
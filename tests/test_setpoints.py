@@ -0,0 +1,116 @@
+import asyncio
+
+import pytest
+
+from tests.helpers import load_imou_module
+
+setpoints = load_imou_module("setpoints")
+
+
+def _stream(apply):
+    sent = []
+    return setpoints.SetpointStream(apply, sent.append), sent
+
+
+@pytest.mark.asyncio
+async def test_only_the_newest_setpoint_is_sent_after_the_one_in_flight():
+    release = asyncio.Event()
+    applied = []
+
+    async def apply(h, v, z):
+        applied.append((h, v, z))
+        if len(applied) == 1:
+            await release.wait()
+
+    stream, sent = _stream(apply)
+    stream.push(0.1, 0.0)
+    await asyncio.sleep(0)
+    for h in (0.2, 0.3, 0.4):
+        stream.push(h, 0.5, 0.1)
+    release.set()
+    await stream._task
+
+    assert applied == [(0.1, 0.0, 0.0), (0.4, 0.5, 0.1)]
+    assert [(e["h"], e["status"], e["dropped"]) for e in sent] == [
+        (0.1, "applied", 2),
+        (0.4, "applied", 2),
+    ]
+    assert all(e["latency_ms"] >= 0 for e in sent)
+
+
+@pytest.mark.asyncio
+async def test_failed_and_superseded_setpoints_are_reported():
+    outcomes = [RuntimeError("API falhou"), setpoints.CommandSuperseded(), None]
+
+    async def apply(h, v, z):
+        outcome = outcomes.pop(0)
+        if outcome is not None:
+            raise outcome
+
+    stream, sent = _stream(apply)
+    for h in (0.1, 0.2, 0.3):
+        stream.push(h, 0.0)
+        await stream._task
+
+    assert [e["status"] for e in sent] == ["error", "superseded", "applied"]
+    assert sent[0]["error"] == "API falhou"
+
+
+@pytest.mark.asyncio
+async def test_closed_stream_ignores_setpoints_and_sends_nothing():
+    release = asyncio.Event()
+    applied = []
+
+    async def apply(h, v, z):
+        applied.append(h)
+        await release.wait()
+
+    stream, sent = _stream(apply)
+    stream.push(0.1, 0.0)
+    await asyncio.sleep(0)
+    stream.push(0.2, 0.0)
+    stream.close()
+    stream.push(0.3, 0.0)
+    release.set()
+    await stream._task
+
+    assert applied == [0.1]
+    assert sent == []
+
+
+@pytest.mark.asyncio
+async def test_unloading_an_entry_ends_its_open_streams():
+    release = asyncio.Event()
+    applied = []
+
+    async def apply(h, v, z):
+        applied.append(h)
+        await release.wait()
+
+    streams = setpoints.SetpointStreams()
+    ended = []
+    reloaded, sent = _stream(apply)
+    other, _ = _stream(apply)
+    streams.add((1, 5), "entry1", reloaded, lambda: ended.append((1, 5)))
+    streams.add((2, 7), "entry2", other, lambda: ended.append((2, 7)))
+    reloaded.push(0.1, 0.0)
+    await asyncio.sleep(0)
+
+    # mudar as opções recarrega a entrada com a assinatura aberta
+    assert streams.close_entry("entry1") == 1
+
+    assert ended == [(1, 5)]
+    assert streams.get((1, 5)) is None
+    assert streams.get((2, 7)) is other
+    # o alvo em andamento termina, mas nada mais é enviado pela API antiga
+    reloaded.push(0.2, 0.0)
+    release.set()
+    await reloaded._task
+    assert applied == [0.1]
+    assert sent == []
+    assert streams.close_entry("entry1") == 0
+
+    # cancelar a assinatura fecha o fluxo sem avisar o cliente
+    streams.discard((2, 7))
+    assert len(streams) == 0
+    assert ended == [(1, 5)]
@@ -1,3 +1,4 @@
+import asyncio
 import time
 from unittest.mock import AsyncMock, MagicMock
 
@@ -75,3 +76,190 @@ async def test_refresh_token_forces_new_token(monkeypatch):
     assert manager._token == "forced-token"
     assert manager._exp_ts == forced_expiration
     assert fetch_mock.await_count == 1
+
+
+@pytest.mark.asyncio
+async def test_async_load_reuses_persisted_token():
+    store = MagicMock()
+    exp_ts = time.time() + 600
+    store.async_load = AsyncMock(return_value={"token": "stored-token", "exp_ts": exp_ts})
+
+    manager = TokenManager(
+        app_id="app",
+        app_secret="secret",
+        base_url="https://example.com",
+        session=MagicMock(),
+        store=store,
+    )
+    fetch_mock = AsyncMock()
+    manager._fetch_new_token = fetch_mock
+
+    await manager.async_load()
+    token = await manager.get_token()
+
+    assert token == "stored-token"
+    assert manager._exp_ts == exp_ts
+    fetch_mock.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_async_load_discards_expired_token():
+    store = MagicMock()
+    store.async_load = AsyncMock(
+        return_value={"token": "stale-token", "exp_ts": time.time() - 1}
+    )
+
+    manager = TokenManager(
+        app_id="app",
+        app_secret="secret",
+        base_url="https://example.com",
+        session=MagicMock(),
+        store=store,
+    )
+
+    await manager.async_load()
+
+    assert manager._token is None
+    store.async_delay_save.assert_called_once()
+    assert store.async_delay_save.call_args.args[0]() == {"token": None, "exp_ts": 0.0}
+
+
+@pytest.mark.asyncio
+async def test_refresh_token_persists_new_token(monkeypatch):
+    store = MagicMock()
+    manager = TokenManager(
+        app_id="app",
+        app_secret="secret",
+        base_url="https://example.com",
+        session=MagicMock(),
+        store=store,
+    )
+    manager._token = "valid-token"
+    manager._exp_ts = time.time() + 120
+
+    forced_expiration = time.time() + 300
+    monkeypatch.setattr(
+        manager,
+        "_fetch_new_token",
+        AsyncMock(return_value=("forced-token", forced_expiration)),
+    )
+
+    await manager.refresh_token()
+
+    saver = store.async_delay_save.call_args.args[0]
+    assert saver() == {"token": "forced-token", "exp_ts": forced_expiration}
+
+
+@pytest.mark.asyncio
+async def test_concurrent_refresh_fetches_token_once(monkeypatch):
+    manager = TokenManager(
+        app_id="app",
+        app_secret="secret",
+        base_url="https://example.com",
+        session=MagicMock(),
+    )
+    manager._token = "expired-token"
+    manager._exp_ts = time.time() + 120
+    seen_generation = manager.generation
+
+    async def fake_fetch():
+        await asyncio.sleep(0)
+        return f"token-{fetch_mock.await_count}", time.time() + 300
+
+    fetch_mock = AsyncMock(side_effect=fake_fetch)
+    monkeypatch.setattr(manager, "_fetch_new_token", fetch_mock)
+
+    tokens = await asyncio.gather(
+        *(manager.refresh_token(seen_generation) for _ in range(10))
+    )
+
+    assert fetch_mock.await_count == 1
+    assert set(tokens) == {"token-1"}
+    assert manager.generation == seen_generation + 1
+
+
+@pytest.mark.asyncio
+async def test_background_renewal_replaces_token_before_expiry(monkeypatch):
+    manager = TokenManager(
+        app_id="app",
+        app_secret="secret",
+        base_url="https://example.com",
+        session=MagicMock(),
+        renew_lead=300,
+        renew_jitter=0,
+    )
+    manager._token = "old-token"
+    manager._exp_ts = time.time() + 0.1
+
+    renewed = asyncio.Event()
+
+    async def fake_fetch():
+        renewed.set()
+        return "renewed-token", time.time() + 3600
+
+    monkeypatch.setattr(manager, "_fetch_new_token", fake_fetch)
+
+    manager.async_start_renewal()
+    # o token antigo continua disponível enquanto a renovação não acontece
+    assert await manager.get_token() == "old-token"
+    await asyncio.wait_for(renewed.wait(), timeout=1)
+    await asyncio.sleep(0)
+
+    assert manager._token == "renewed-token"
+
+    await manager.async_stop()
+    assert manager._renew_task is None
+
+
+@pytest.mark.asyncio
+async def test_renewal_task_is_created_through_the_given_factory():
+    manager = TokenManager(
+        app_id="app",
+        app_secret="secret",
+        base_url="https://example.com",
+        session=MagicMock(),
+    )
+    manager._token = "token"
+    manager._exp_ts = time.time() + 3600
+    created = []
+
+    def create_task(coro, name):
+        task = asyncio.get_running_loop().create_task(coro, name=name)
+        created.append((task, name))
+        return task
+
+    manager.async_start_renewal(create_task)
+    manager.async_start_renewal(create_task)
+
+    assert len(created) == 1
+    assert created[0][1] == "imou_control token renewal"
+
+    await manager.async_stop()
+    assert created[0][0].cancelled()
+
+
+@pytest.mark.asyncio
+async def test_token_fetches_are_timed_and_expiry_is_reported(monkeypatch):
+    api_metrics = load_imou_module("metrics").ApiMetrics()
+    manager = TokenManager(
+        app_id="app",
+        app_secret="secret",
+        base_url="https://example.com",
+        session=MagicMock(),
+        metrics=api_metrics,
+    )
+    assert manager.expires_in is None
+
+    request = AsyncMock(
+        side_effect=[RuntimeError("Timeout ao solicitar token"), ("new", time.time() + 600)]
+    )
+    monkeypatch.setattr(manager, "_request_token", request)
+
+    with pytest.raises(RuntimeError):
+        await manager.get_token()
+    assert await manager.get_token() == "new"
+
+    histogram = api_metrics.histogram("/openapi/accessToken")
+    assert (histogram.count, histogram.errors) == (2, 1)
+    assert 590 < manager.expires_in <= 600
+    assert manager.generation == 1
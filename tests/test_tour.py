@@ -0,0 +1,165 @@
+import asyncio
+import logging
+
+import pytest
+
+from tests.helpers import load_imou_module
+
+tour_module = load_imou_module("tour")
+TourManager = tour_module.TourManager
+TourStep = tour_module.TourStep
+rate_limit = load_imou_module("rate_limit")
+
+
+@pytest.mark.asyncio
+async def test_tour_cycles_through_presets():
+    visited = []
+    done = asyncio.Event()
+
+    async def move(device_id, preset, priority):
+        visited.append((device_id, preset))
+        if len(visited) == 5:
+            done.set()
+
+    tours = TourManager(move, min_dwell=0)
+    tours.start("cam", [TourStep("a", 0), TourStep("b", 0)], repeat=True)
+    await asyncio.wait_for(done.wait(), timeout=1)
+    await tours.stop("cam")
+
+    assert [preset for _, preset in visited[:5]] == ["a", "b", "a", "b", "a"]
+    assert not tours.is_active("cam")
+
+
+@pytest.mark.asyncio
+async def test_single_pass_tour_ends_by_itself():
+    visited = []
+
+    async def move(device_id, preset, priority):
+        visited.append(preset)
+
+    tours = TourManager(move, min_dwell=0)
+    tours.start("cam", [TourStep("a", 0), TourStep("b", 0)], repeat=False)
+    for _ in range(10):
+        await asyncio.sleep(0)
+
+    assert visited == ["a", "b"]
+    assert not tours.is_active("cam")
+
+
+@pytest.mark.asyncio
+async def test_moves_use_the_priority_given_to_the_tour():
+    priorities = []
+
+    async def move(device_id, preset, priority):
+        priorities.append((preset, priority))
+
+    tours = TourManager(move, min_dwell=0)
+    tours.start("cam", [TourStep("a", 0)], repeat=False)
+    tours.start(
+        "cam2", [TourStep("b", 0)], repeat=False, priority=rate_limit.PRIORITY_INTERACTIVE
+    )
+    for _ in range(10):
+        await asyncio.sleep(0)
+
+    assert sorted(priorities) == [
+        ("a", rate_limit.PRIORITY_BACKGROUND),
+        ("b", rate_limit.PRIORITY_INTERACTIVE),
+    ]
+
+@pytest.mark.asyncio
+async def test_pause_and_resume():
+    visited = []
+
+    async def move(device_id, preset, priority):
+        visited.append(preset)
+
+    tours = TourManager(move, min_dwell=0)
+    tours.start("cam", [TourStep("a", 0.01), TourStep("b", 0)], repeat=False)
+    await asyncio.sleep(0)
+    assert tours.pause("cam")
+    await asyncio.sleep(0.05)
+
+    assert visited == ["a"]
+    assert tours.status()["cam"]["paused"]
+
+    tours.resume("cam")
+    await asyncio.sleep(0.01)
+    assert visited == ["a", "b"]
+
+
+@pytest.mark.asyncio
+async def test_manual_command_preempts_tour():
+    moving = asyncio.Event()
+
+    async def move(device_id, preset, priority):
+        moving.set()
+        await asyncio.sleep(10)
+
+    tours = TourManager(move, min_dwell=0)
+    tours.start("cam", [TourStep("a", 0)])
+    await asyncio.wait_for(moving.wait(), timeout=1)
+
+    assert tours.preempt("cam")
+    assert not tours.is_active("cam")
+    assert not tours.preempt("cam")
+
+
+class _RecordingAsyncio:
+    """Troca as esperas da ronda por registros, sem esperar de verdade."""
+
+    def __init__(self):
+        self.sleeps = []
+
+    def __getattr__(self, name):
+        return getattr(asyncio, name)
+
+    async def sleep(self, delay):
+        self.sleeps.append(delay)
+        await asyncio.sleep(0)
+
+
+@pytest.mark.asyncio
+async def test_failed_moves_back_off_and_warn_once(monkeypatch, caplog):
+    fake = _RecordingAsyncio()
+    monkeypatch.setattr(tour_module, "asyncio", fake)
+    outcomes = [RuntimeError("circuito aberto")] * 4 + [None]
+    done = asyncio.Event()
+
+    async def move(device_id, preset, priority):
+        if not outcomes:
+            done.set()
+            await asyncio.Event().wait()
+        outcome = outcomes.pop(0)
+        if outcome is not None:
+            raise outcome
+
+    tours = TourManager(move, min_dwell=1, retry_delay=30, max_retry_delay=120)
+    with caplog.at_level(logging.DEBUG):
+        tours.start("cam", [TourStep("a", 0)], repeat=True)
+        await asyncio.wait_for(done.wait(), timeout=1)
+        await asyncio.sleep(0)
+        await tours.stop("cam")
+
+    # dwell 0 vira o mínimo; falhas seguidas dobram a espera até o teto
+    assert fake.sleeps[:5] == [30, 60, 120, 120, 1]
+    warnings = [r for r in caplog.records if r.levelno == logging.WARNING]
+    assert len(warnings) == 1
+
+
+@pytest.mark.asyncio
+async def test_tour_task_is_created_through_the_given_factory():
+    created = []
+
+    def create_task(coro, name):
+        task = asyncio.get_running_loop().create_task(coro, name=name)
+        created.append(name)
+        return task
+
+    async def move(device_id, preset, priority):
+        await asyncio.sleep(10)
+
+    tours = TourManager(move, create_task)
+    tours.start("cam", [TourStep("a", 5)])
+    await tours.stop("cam")
+
+    assert created == ["imou_control tour cam"]
@@ -0,0 +1,214 @@
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from tests.helpers import load_imou_module
+
+ApiUsageTracker = load_imou_module("usage").ApiUsageTracker
+
+
+def _tracker_with(count, last_reset, budget):
+    tracker = ApiUsageTracker(MagicMock(), budget=budget)
+    tracker._period = f"{last_reset.year:04d}-{last_reset.month:02d}"
+    tracker._count = count
+    tracker._last_reset = last_reset
+    return tracker
+
+
+def test_projection_extrapolates_current_rate():
+    start = datetime(2026, 4, 1, tzinfo=timezone.utc)
+    now = datetime(2026, 4, 11, tzinfo=timezone.utc)
+    tracker = _tracker_with(1000, start, budget=None)
+
+    # 10 dias decorridos de 30: 100 chamadas/dia
+    assert tracker.projected(now) == 3000
+
+
+def test_projection_resets_with_new_month():
+    tracker = _tracker_with(500, datetime(2026, 3, 1, tzinfo=timezone.utc), budget=None)
+
+    assert tracker.projected(datetime(2026, 4, 2, tzinfo=timezone.utc)) == 0
+
+
+def test_should_defer_only_non_essential_calls_near_budget():
+    start = datetime(2026, 4, 1, tzinfo=timezone.utc)
+    now = datetime(2026, 4, 20, tzinfo=timezone.utc)
+    tracker = _tracker_with(850, start, budget=1000)
+
+    assert tracker.should_defer(essential=False, now=now)
+    assert not tracker.should_defer(essential=True, now=now)
+
+
+def test_should_defer_waits_for_soft_threshold():
+    start = datetime(2026, 4, 1, tzinfo=timezone.utc)
+    now = datetime(2026, 4, 3, tzinfo=timezone.utc)
+    # projeção estoura o orçamento, mas o uso ainda está longe do limite
+    tracker = _tracker_with(300, start, budget=1000)
+
+    assert tracker.projected(now) > 1000
+    assert not tracker.should_defer(essential=False, now=now)
+
+
+def test_should_defer_drops_everything_non_essential_at_hard_threshold():
+    start = datetime(2026, 4, 1, tzinfo=timezone.utc)
+    now = datetime(2026, 4, 29, tzinfo=timezone.utc)
+    tracker = _tracker_with(960, start, budget=1000)
+
+    assert tracker.projected(now) <= 1100
+    assert tracker.should_defer(essential=False, now=now)
+
+
+def test_no_budget_never_defers():
+    tracker = _tracker_with(10**6, datetime(2026, 4, 1, tzinfo=timezone.utc), budget=0)
+
+    assert not tracker.should_defer(essential=False)
+
+
+class _FakeLoop:
+    """Guarda os ``call_later`` para o teste disparar quando quiser."""
+
+    def __init__(self):
+        self.timers = []
+
+    def call_later(self, delay, callback):
+        handle = MagicMock()
+        self.timers.append((delay, callback, handle))
+        return handle
+
+    def fire(self):
+        delay, callback, handle = self.timers.pop(0)
+        callback()
+        return delay
+
+
+def test_listener_updates_are_coalesced_within_interval(monkeypatch):
+    usage = load_imou_module("usage")
+    now = [100.0]
+    loop = _FakeLoop()
+    monkeypatch.setattr(usage, "time", SimpleNamespace(monotonic=lambda: now[0]))
+    monkeypatch.setattr(
+        usage, "asyncio", SimpleNamespace(get_running_loop=lambda: loop)
+    )
+    tracker = usage.ApiUsageTracker(MagicMock(), notify_interval=5.0)
+    calls = []
+    tracker.async_add_listener(lambda: calls.append(tracker.count))
+
+    for _ in range(5):
+        now[0] += 1.0
+        tracker.note_call()
+    # a primeira chamada notifica na hora; as demais ficam para o fim do intervalo
+    assert calls == [1]
+    assert len(loop.timers) == 1
+    assert loop.timers[0][0] == 4.0
+
+    now[0] = 106.0
+    loop.fire()
+    assert calls == [1, 5]
+
+    now[0] += 1.0
+    tracker.note_call()
+    tracker.note_call()
+    assert calls == [1, 5]
+    _, _, handle = loop.timers[0]
+    tracker.async_flush()
+    handle.cancel.assert_called_once()
+    assert calls == [1, 5, 7]
+    tracker.async_flush()
+    assert calls == [1, 5, 7]
+
+    # após um período sem chamadas a notificação volta a ser imediata
+    now[0] += 10.0
+    tracker.note_call()
+    assert calls == [1, 5, 7, 8]
+
+
+def test_date_header_parse_is_cached_per_value(monkeypatch):
+    usage = load_imou_module("usage")
+    tracker = usage.ApiUsageTracker(MagicMock(), notify_interval=0)
+    parse = MagicMock(wraps=usage.ApiUsageTracker._parse_date_header)
+    monkeypatch.setattr(tracker, "_parse_date_header", parse)
+
+    header = "Tue, 14 Apr 2026 12:00:00 GMT"
+    for _ in range(3):
+        tracker.note_call(header)
+    tracker.note_call("Tue, 14 Apr 2026 12:00:01 GMT")
+
+    assert parse.call_count == 2
+    assert tracker.count == 4
+    assert tracker.last_call == datetime(2026, 4, 14, 12, 0, 1, tzinfo=timezone.utc)
+
+
+def test_skipped_calls_notify_and_reset_with_the_period():
+    usage = load_imou_module("usage")
+    tracker = usage.ApiUsageTracker(MagicMock(), notify_interval=0)
+    calls = []
+    tracker.async_add_listener(lambda: calls.append(tracker.skipped))
+
+    tracker.note_skipped()
+    tracker.note_skipped()
+    assert calls == [1, 2]
+    assert tracker.count == 0
+
+    # novo mês: o contador de chamadas evitadas recomeça junto com o de uso
+    tracker.note_call("Tue, 14 Apr 2099 12:00:00 GMT")
+    assert tracker.skipped == 0
+    assert tracker._as_dict()["skipped"] == 0
+
+
+def test_note_call_breaks_usage_down_by_endpoint_device_and_hour():
+    usage = load_imou_module("usage")
+    tracker = usage.ApiUsageTracker(MagicMock(), notify_interval=0)
+
+    tracker.note_call("Tue, 14 Apr 2026 10:05:00 GMT", "/openapi/accessToken")
+    tracker.note_call("Tue, 14 Apr 2026 12:00:00 GMT", "/openapi/controlLocationPTZ", "cam1")
+    tracker.note_call("Tue, 14 Apr 2026 12:59:59 GMT", "/openapi/controlLocationPTZ", "cam1")
+    tracker.note_call("Tue, 14 Apr 2026 12:30:00 GMT", "/openapi/controlLocationPTZ", "cam2")
+
+    assert tracker.by_endpoint == {
+        "/openapi/accessToken": 1,
+        "/openapi/controlLocationPTZ": 3,
+    }
+    assert tracker.by_device == {"cam1": 2, "cam2": 1}
+    now = datetime(2026, 4, 14, 12, 45, tzinfo=timezone.utc)
+    assert [calls for _, calls in tracker.hourly(4, now)] == [0, 1, 0, 3]
+    assert tracker.hourly(1, now)[0][0] == datetime(2026, 4, 14, 12, tzinfo=timezone.utc)
+
+
+def test_hourly_ring_buffer_forgets_hours_older_than_its_window():
+    usage = load_imou_module("usage")
+    tracker = usage.ApiUsageTracker(MagicMock(), notify_interval=0)
+    start = datetime(2026, 4, 1, tzinfo=timezone.utc)
+
+    tracker.note_call("Wed, 01 Apr 2026 00:10:00 GMT")
+    assert len(tracker._hourly) == usage.HOURLY_SLOTS
+    # 30 dias depois o slot da primeira hora é reutilizado e zerado
+    tracker.note_call("Fri, 01 May 2026 00:10:00 GMT")
+    later = datetime(2026, 5, 1, 0, 30, tzinfo=timezone.utc)
+    series = tracker.hourly(usage.HOURLY_SLOTS, later)
+
+    assert sum(calls for _, calls in series) == 1
+    assert series[-1] == (datetime(2026, 5, 1, tzinfo=timezone.utc), 1)
+    assert tracker.hourly(1, start)[0][1] == 0
+    # chamadas mais antigas que a janela não são contadas na série
+    tracker.note_call("Wed, 01 Apr 2026 00:10:00 GMT")
+    assert sum(calls for _, calls in tracker.hourly(usage.HOURLY_SLOTS, later)) == 1
+
+
+@pytest.mark.asyncio
+async def test_breakdown_survives_a_reload():
+    usage = load_imou_module("usage")
+    store = MagicMock()
+    tracker = usage.ApiUsageTracker(store, notify_interval=0)
+    tracker.note_call("Tue, 14 Apr 2026 12:00:00 GMT", "/openapi/controlLocationPTZ", "cam1")
+    saved = store.async_delay_save.call_args[0][0]()
+
+    store.async_load = AsyncMock(return_value=saved)
+    restored = usage.ApiUsageTracker(store, notify_interval=0)
+    await restored.async_load()
+
+    now = datetime(2026, 4, 14, 12, 30, tzinfo=timezone.utc)
+    assert restored.by_device == {"cam1": 1}
+    assert restored.by_endpoint == {"/openapi/controlLocationPTZ": 1}
+    assert restored.hourly(1, now)[0][1] == 1
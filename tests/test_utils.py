@@ -0,0 +1,36 @@
+import hashlib
+
+from tests.helpers import load_imou_module
+
+utils = load_imou_module("utils")
+codec = load_imou_module("codec")
+
+
+def test_system_signer_matches_imou_signature():
+    system, ts, nonce = utils.SystemSigner("app", "secret")()
+
+    expected = hashlib.md5(
+        f"time:{ts},nonce:{nonce},appSecret:secret".encode("utf-8")
+    ).hexdigest()
+    assert system == {
+        "ver": "1.0",
+        "appId": "app",
+        "sign": expected,
+        "time": ts,
+        "nonce": nonce,
+    }
+
+
+def test_signer_generates_fresh_nonce_per_call():
+    signer = utils.SystemSigner("app", "secret")
+
+    assert signer()[2] != signer()[2]
+
+
+def test_codecs_round_trip_bytes():
+    payload = {"system": {"time": 1}, "id": "x", "params": {"h": 0.25, "token": "t"}}
+
+    for json_codec in filter(None, (codec.STDLIB_CODEC, codec.ORJSON_CODEC)):
+        body = json_codec.dumps(payload)
+        assert isinstance(body, bytes)
+        assert json_codec.loads(body) == payload